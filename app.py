@@ -1,81 +1,155 @@
+import logging
 import os
 from datetime import timedelta
-from dotenv import load_dotenv
 
+import click
 from flask import Flask
-from flask_migrate import Migrate
-from flask_restful import Api
-from flask_cors import CORS
-from flask_bcrypt import Bcrypt
-from flask_jwt_extended import JWTManager
 
 from models import db
-# ==== Import and Register Resources
-from resources.auth import AuthResource
-from resources.employee import EmployeeListResource, EmployeeDetailResource,TotalEmployeesResource
-from resources.review import ReviewListResource, ReviewDetailResource
-from resources.department import DepartmentListResource, DepartmentDetailResource
-from resources.user_type import UserTypeListResource, UserTypeDetailResource
-from resources.job_title import JobTitleListResource, JobTitleDetailResource
-
-
-
-# ==== Load environment variables 
-load_dotenv()
-
-# Initialize Flask App 
-app = Flask(__name__)
-
-# ==== Configurations ====
-app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URI") 
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-app.config["JWT_SECRET_KEY"] = os.environ.get("JWT_SECRET")
-app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=24)
-
-#Debug print to check if .env was loaded correctly
-print("JWT SECRET:", app.config["JWT_SECRET_KEY"]) 
-
-# ==== Extensions Initialization ====
-bcrypt = Bcrypt(app)
-jwt = JWTManager(app)
-migrate = Migrate(app, db)
-db.init_app(app)
-CORS(app)
-api = Api(app)
-
-# ==== JWT Unauthorized Handling 
-@jwt.unauthorized_loader
-def missing_token(error):
-    return {
-        "message": "Authorization required",
-        "success": False,
-        "errors": ["Authorization token is required"],
-    }, 401
-@jwt.invalid_token_loader
-def invalid_token_callback(reason):
-    return {"message": "Invalid token", "reason": reason}, 422
-
-@jwt.expired_token_loader
-def expired_token_callback(jwt_header, jwt_payload):
-    return {"message": "Token expired"}, 401
-
-
-
-api.add_resource(AuthResource, '/auth/<string:action>') 
-api.add_resource(EmployeeListResource, "/employees")
-api.add_resource(EmployeeDetailResource, "/employees/<int:id>")
-api.add_resource(TotalEmployeesResource, '/total-employees')
-api.add_resource(ReviewListResource, "/reviews")
-api.add_resource(ReviewDetailResource, "/reviews/<int:id>")
-api.add_resource(DepartmentListResource, "/departments")
-api.add_resource(DepartmentDetailResource, "/departments/<int:id>")
-api.add_resource(UserTypeListResource, "/user-types")
-api.add_resource(UserTypeDetailResource, "/user-types/<int:id>")
-api.add_resource(JobTitleListResource, "/job-titles")
-api.add_resource(JobTitleDetailResource, "/job-titles/<int:id>")
-
+from database import configure as configure_database, route_reads
+from compression import init_compression
+from hashing import HashingBusy
+from metrics import init_metrics
+from punches import init_punch_writer
+from refcache import init_refcache
+from routes import Api, register_resources
+
+logger = logging.getLogger(__name__)
+
+# ===========================
+# Application factory
+# ===========================
+# create_app() builds a configured app without importing any resource module:
+# routes are registered by name and each resource is imported by the first
+# request that reaches it (routes.py). Migrations load Flask-Migrate / Alembic
+# only when a `flask db` command runs. Scripts that only need the database
+# (seed.py) build an app and use db inside app.app_context().
+#
+# Logging goes to stderr at LOG_LEVEL (default INFO) unless the host process
+# has already configured it.
+#
+# `app` is still importable from this module (`from app import app`,
+# `flask --app app ...`); it is created by the first access.
+
+
+def create_app(config=None):
+    """Build the API app; config (a mapping) overrides the environment."""
+    # ==== Load environment variables
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+                        format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+
+    app = Flask(__name__)
+
+    # ==== Configurations ====
+    app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URI")
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["JWT_SECRET_KEY"] = os.environ.get("JWT_SECRET")
+    app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=24)
+    # bcrypt cost factor; existing hashes are upgraded on the next successful login
+    app.config["BCRYPT_LOG_ROUNDS"] = int(os.environ.get("BCRYPT_LOG_ROUNDS", 12))
+    app.config.update(config or {})
+    # Pool sizing, timeouts and the optional read replica (DB_*, DATABASE_REPLICA_URI; see database.py)
+    configure_database(app)
+
+    # Check that .env was loaded (never log the secret itself)
+    if not app.config["JWT_SECRET_KEY"]:
+        logger.warning("JWT_SECRET is not set; tokens cannot be issued or verified")
+
+    # ==== Extensions Initialization ====
+    db.init_app(app)
+    # Reference data / payload cache (see refcache.py)
+    init_refcache(app)
+    # Group commit of attendance punches (see punches.py)
+    init_punch_writer(app)
+    app.cli.add_command(migrate_commands(app))
+    init_jwt(app)
+
+    from flask_cors import CORS
+    CORS(app)
+
+    # ==== Per-request latency / SQL metrics and GET /metrics (see metrics.py)
+    init_metrics(app)
+    # ==== gzip / brotli response bodies (see compression.py); registered after
+    # the metrics hook so it runs first and metrics see the bytes actually sent
+    init_compression(app)
+
+    # ==== GET/HEAD requests read from the replica when one is configured
+    app.before_request(route_reads)
+
+    # ==== Password hashing pool saturated (see hashing.py)
+    @app.errorhandler(HashingBusy)
+    def hashing_busy(error):
+        return {"message": "Server busy, please retry", "reason": str(error)}, 503, {"Retry-After": "1"}
+
+    # ==== Resources (routes.Api leaves JWT / HashingBusy errors to the handlers above)
+    api = Api(app)
+    register_resources(app, api)
+    return app
+
+# ==== JWT Unauthorized Handling
+def init_jwt(app):
+    from flask_jwt_extended import JWTManager
+    from identity import claims_are_current
+
+    jwt = JWTManager(app)
+    app.extensions["checked_claims"] = {}
+
+    @jwt.unauthorized_loader
+    def missing_token(error):
+        return {
+            "message": "Authorization required",
+            "success": False,
+            "errors": ["Authorization token is required"],
+        }, 401
+    @jwt.invalid_token_loader
+    def invalid_token_callback(reason):
+        return {"message": "Invalid token", "reason": reason}, 422
+
+    @jwt.expired_token_loader
+    def expired_token_callback(jwt_header, jwt_payload):
+        return {"message": "Token expired"}, 401
+
+    # Role / department claims are re-checked periodically (see identity.py)
+    jwt.token_verification_loader(claims_are_current)
+
+    @jwt.token_verification_failed_loader
+    def stale_claims_callback(jwt_header, jwt_payload):
+        return {"message": "Token claims are out of date, please log in again"}, 401
+
+# ==== `flask db ...`: Flask-Migrate (and Alembic) are imported on first use
+def migrate_commands(app):
+    def commands():
+        if "migrate" not in app.extensions:
+            from flask_migrate import Migrate
+            Migrate(app, db)
+        from flask_migrate.cli import db as group
+        return group
+
+    # Stands in for flask_migrate's group in `flask --help`; running it hands
+    # the whole command line to the real group
+    class MigrateGroup(click.Group):
+        def make_context(self, info_name, args, parent=None, **extra):
+            return commands().make_context(info_name, args, parent=parent, **extra)
+
+    return MigrateGroup("db", help="Perform database migrations.")
+
+
+_app = None
+
+
+def __getattr__(name):
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ==== Entry Point ====
+# Development server only; in production run gunicorn -c gunicorn.conf.py wsgi:app
 if __name__ == "__main__":
-    app.run(port=5555, debug=True)
+    create_app().run(port=5555, debug=True)
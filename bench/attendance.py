@@ -0,0 +1,138 @@
+"""Attendance ingestion throughput: single punches, concurrent punches, batches.
+
+    python bench/attendance.py [--employees 2000] [--concurrency 1,8,32] [--batch 500]
+
+Simulates shift start: every employee badges in once and out once. The same
+punches are ingested three ways into a scratch SQLite database:
+
+  single     one POST /attendance/punches per punch, from N client threads
+             (concurrent requests share upserts through the group commit)
+  batch      arrays of --batch punches per request
+  replay     the batch run again, which must leave the table unchanged
+
+Every run must end with the same attendances rows, and the incrementally
+maintained rollups must match a full rebuild. Reports punches/second and the
+number of write transactions issued.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+_db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URI"] = f"sqlite:///{_db.name}"
+os.environ.setdefault("JWT_SECRET", "bench-secret-key-that-is-long-enough-for-hs256")
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+
+from app import app  # noqa: E402
+from models import db, Attendance, AttendanceDepartmentDay, AttendanceMonth, rebuild_attendance_rollups  # noqa: E402
+import seed as seeder  # noqa: E402
+
+SHIFT_DAY = date(2025, 6, 2)
+
+
+def setup(employees):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        for _ in seeder.generate(5, employees, 0, 0, 42, SHIFT_DAY, 5000):
+            pass
+        db.session.commit()
+    client = app.test_client()
+    token = client.post("/auth/login", json={"email": "faith.mugo@company.com", "password": "password123"}).get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def clear():
+    with app.app_context():
+        for model in (Attendance, AttendanceMonth, AttendanceDepartmentDay):
+            db.session.query(model).delete()
+        db.session.commit()
+
+
+def make_punches(employees):
+    start = datetime.combine(SHIFT_DAY, datetime.min.time()) + timedelta(hours=7)
+    punches = []
+    for employee_id in range(1, employees + 1):
+        punches.append({"employee_id": employee_id, "type": "in",
+                        "timestamp": (start + timedelta(seconds=employee_id % 3600)).isoformat()})
+    for employee_id in range(1, employees + 1):
+        punches.append({"employee_id": employee_id, "type": "out",
+                        "timestamp": (start + timedelta(hours=9, seconds=employee_id % 3600)).isoformat()})
+    return punches
+
+
+def snapshot():
+    with app.app_context():
+        return [
+            db.session.query(Attendance.employee_id, Attendance.date, Attendance.check_in_time,
+                             Attendance.check_out_time).order_by(Attendance.employee_id, Attendance.date).all(),
+            *(db.session.query(*model.__table__.columns).order_by(*model.__table__.primary_key).all()
+              for model in (AttendanceMonth, AttendanceDepartmentDay)),
+        ]
+
+
+def rebuilt():
+    with app.app_context():
+        rebuild_attendance_rollups(db.session.connection())
+        db.session.commit()
+    return snapshot()
+
+
+def run(headers, bodies, concurrency):
+    def post(body):
+        return app.test_client().post("/attendance/punches", json=body, headers=headers).status_code
+
+    commits[0] = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        statuses = list(clients.map(post, bodies))
+    elapsed = time.perf_counter() - start
+    assert all(status == 200 for status in statuses), set(statuses)
+    return elapsed, commits[0]
+
+
+commits = [0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    headers = setup(args.employees)
+    with app.app_context():
+        event.listen(db.engine, "commit", lambda conn: commits.__setitem__(0, commits[0] + 1))
+    punches = make_punches(args.employees)
+
+    print(f"{len(punches)} punches for {args.employees} employees")
+    print(f"{'mode':<8}{'clients':>8}{'requests':>10}{'commits':>9}{'seconds':>9}{'punches/s':>11}")
+    expected = None
+    for concurrency in [int(c) for c in args.concurrency.split(",")]:
+        clear()
+        elapsed, n = run(headers, punches, concurrency)
+        print(f"{'single':<8}{concurrency:>8}{len(punches):>10}{n:>9}{elapsed:>9.2f}{len(punches) / elapsed:>11.0f}")
+        expected = expected or snapshot()
+        assert snapshot() == expected
+
+    clear()
+    batches = [punches[i:i + args.batch] for i in range(0, len(punches), args.batch)]
+    for mode in ("batch", "replay"):
+        elapsed, n = run(headers, batches, 1)
+        print(f"{mode:<8}{1:>8}{len(batches):>10}{n:>9}{elapsed:>9.2f}{len(punches) / elapsed:>11.0f}")
+        assert snapshot() == expected
+    assert rebuilt() == expected
+
+    os.unlink(_db.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Response compression: bytes on the wire and CPU per request, by payload size.
+
+    python bench/compression.py [--employees 5000] [--limits 10,100,1000,all] [--runs 20]
+
+Seeds a scratch SQLite database (seed.py's generator, 3 reviews per
+employee), then fetches GET /employees?limit=N and GET /reviews?limit=N as
+HR through the test client ("all" leaves out ?limit=). For every encoding
+the app offers (gzip, plus br when the brotli package is installed) it
+checks that the response really is encoded, then reports, as medians
+over --runs:
+
+  bytes      body size on the wire, and ratio = identity bytes / bytes
+  request    CPU time of the whole uncompressed request, for scale
+  compress   CPU time to compress the body (a request missing the cache)
+  cached     CPU time to serve it from the compressed body cache instead
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+_db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URI"] = f"sqlite:///{_db.name}"
+os.environ.setdefault("JWT_SECRET", "bench-secret-key-that-is-long-enough-for-hs256")
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app  # noqa: E402
+from compression import ENCODINGS, compress  # noqa: E402
+from models import db  # noqa: E402
+import seed as seeder  # noqa: E402
+
+# Full-table requests are slow by design here; keep the slow-request log quiet
+logging.getLogger("metrics").setLevel(logging.ERROR)
+
+
+def populate(employees):
+    with app.app_context():
+        db.create_all()
+        for _ in seeder.generate(max(5, employees // 500), employees, 3, 10, 42, date(2025, 1, 31), 5000):
+            pass
+        db.session.commit()
+
+
+def cpu_ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.process_time()
+        fn()
+        samples.append(time.process_time() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--limits", default="10,100,1000,all")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        populate(args.employees)
+        client = app.test_client()
+        token = client.post("/auth/login", json={"email": "faith.mugo@company.com",
+                                                 "password": "password123"}).json["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        compressed_bodies = app.extensions["compressed_bodies"]
+
+        print(f"{'path':<24}{'encoding':<10}{'bytes':>10}{'ratio':>8}{'request ms':>12}{'compress ms':>13}"
+              f"{'cached ms':>11}")
+        for route in ("/employees", "/reviews"):
+            for limit in args.limits.split(","):
+                path = route if limit == "all" else f"{route}?limit={limit}"
+                client.get(path, headers=headers)  # warm the payload / statement caches
+                data = client.get(path, headers=headers).data
+                request_ms = cpu_ms(lambda: client.get(path, headers=headers), args.runs)
+                print(f"{path:<24}{'identity':<10}{len(data):>10}{1:>8.1f}{request_ms:>12.2f}")
+
+                for encoding in reversed(ENCODINGS):
+                    response = client.get(path, headers={**headers, "Accept-Encoding": encoding})
+                    assert response.headers.get("Content-Encoding") == encoding, (path, encoding)
+                    body = compress(data, encoding)
+                    compress_ms = cpu_ms(lambda: compress(data, encoding), args.runs)
+                    compressed_bodies.put(("bench", encoding), data, body)
+                    cached_ms = cpu_ms(lambda: compressed_bodies.get(("bench", encoding), data), args.runs)
+                    print(f"{'':<24}{encoding:<10}{len(body):>10}{len(data) / len(body):>8.1f}{'':>12}"
+                          f"{compress_ms:>13.2f}{cached_ms:>11.3f}")
+    finally:
+        os.unlink(_db.name)
+
+
+if __name__ == "__main__":
+    main()
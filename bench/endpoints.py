@@ -0,0 +1,311 @@
+"""End-to-end benchmark: every registered route, as HR, Manager and Employee.
+
+    python bench/endpoints.py [--scales 100,1000,10000] [--requests 20] [--out bench.json]
+    python bench/endpoints.py --compare old.json new.json [--max-slowdown 1.25]
+
+For each scale (number of employees) a scratch SQLite database is filled with
+seed.py's generator (3 reviews per employee, fixed --seed), then every route
+in the app's URL map is driven through the test client with each role's
+token. Reads run first, then writes: writes use fresh payloads each time and
+their targets are created before timing.
+
+Reported per (scale, role, method, route): status codes, p50/p95/p99 latency,
+requests/second, SQL statements per request and peak Python memory of one
+request (tracemalloc, measured separately so it does not skew timings).
+Results are written as JSON with stable ordering so two runs diff cleanly;
+--compare prints the rows that got slower or issue more SQL and exits 1.
+
+Password hashing runs at BCRYPT_LOG_ROUNDS=4 here; see bench/login.py for
+bcrypt cost.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+_db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URI"] = f"sqlite:///{_db.name}"
+os.environ.setdefault("JWT_SECRET", "bench-secret-key-that-is-long-enough-for-hs256")
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sqlalchemy import event, insert  # noqa: E402
+
+from app import app  # noqa: E402
+from models import db, Employee, PerformanceReview, refresh_review_projection  # noqa: E402
+import seed as seeder  # noqa: E402
+
+ROLES = {
+    "HR": "faith.mugo@company.com",
+    "Manager": "alice.ngugi@company.com",
+    "Employee": "brian.mutua@company.com",
+}
+WARMUP = 2
+
+
+# ===========================
+# Scenarios
+# ===========================
+# (rule, method) -> (request(ctx, i) -> (path, kwargs), prepare(ctx, n) or None)
+# Routes without an entry are driven with GET, filling <int:...> via ctx.id_for.
+class Context:
+    def __init__(self):
+        with app.app_context():
+            self.ids = {
+                "employee": Employee.query.filter_by(email=ROLES["Employee"]).one().id,
+                "review": db.session.query(PerformanceReview.id).order_by(PerformanceReview.id).first()[0],
+            }
+        self.run = 0  # makes write payloads unique across roles
+
+    def unique(self, i):
+        return f"{self.run}x{i}"
+
+    def id_for(self, rule):
+        # A row every role can at least ask for: Brian and one of his reviews
+        if rule.startswith("/reviews"):
+            return self.ids["review"]
+        if rule.startswith("/employees"):
+            return self.ids["employee"]
+        return 1
+
+
+def new_employee(ctx, i):
+    return {
+        "first_name": "Bench", "last_name": "Hire", "email": f"bench.{ctx.unique(i)}@company.com",
+        "password": "password123", "user_type_name": "Employee", "job_title_name": "Software Engineer",
+        "department_id": 1,
+    }
+
+
+def new_review(ctx, i):
+    return {"employee_id": ctx.ids["employee"], "rating": i % 5 + 1, "notes": "Bench review"}
+
+
+def make_reviews(ctx, n):
+    with app.app_context():
+        ids = db.session.scalars(
+            insert(PerformanceReview).returning(PerformanceReview.id, sort_by_parameter_order=True),
+            [{"employee_id": ctx.ids["employee"], "reviewer": "Bench", "rating": 3, "review_date": datetime.now()}] * n,
+        ).all()
+        refresh_review_projection(db.session.connection(), PerformanceReview.__table__.c.id.in_(ids))
+        db.session.commit()
+    ctx.targets = ids
+
+
+SCENARIOS = {
+    ("/auth/<string:action>", "POST"): (
+        lambda ctx, i: ("/auth/login", {"json": {"email": ctx.email, "password": "password123"}}), None),
+    ("/employees", "POST"): (lambda ctx, i: ("/employees", {"json": new_employee(ctx, i)}), None),
+    ("/employees/search", "GET"): (lambda ctx, i: ("/employees/search?q=ali ngu", {}), None),
+    ("/employees/bulk", "POST"): (
+        lambda ctx, i: ("/employees/bulk", {"json": [new_employee(ctx, f"{i}b{k}") for k in range(10)]}), None),
+    ("/reviews", "POST"): (lambda ctx, i: ("/reviews", {"json": new_review(ctx, i)}), None),
+    ("/reviews/batch", "POST"): (
+        lambda ctx, i: ("/reviews/batch", {"json": [new_review(ctx, i + k) for k in range(10)]}), None),
+    ("/reviews/<int:id>", "PUT"): (
+        lambda ctx, i: (f"/reviews/{ctx.ids['review']}", {"json": {"rating": i % 5 + 1}}), None),
+    ("/reviews/<int:id>", "DELETE"): (lambda ctx, i: (f"/reviews/{ctx.targets[i]}", {}), make_reviews),
+    ("/attendance/punches", "POST"): (
+        lambda ctx, i: ("/attendance/punches", {"json": {
+            "employee_id": ctx.ids["employee"], "type": "in", "timestamp": f"2025-01-01T08:{i % 60:02d}:00"}}), None),
+    ("/departments", "POST"): (
+        lambda ctx, i: ("/departments", {"json": {"name": f"Bench {ctx.unique(i)}", "description": "Bench"}}), None),
+}
+
+
+def default_get(rule):
+    def request(ctx, i):
+        path = rule.rule
+        for argument in rule.arguments:
+            path = path.replace(f"<int:{argument}>", str(ctx.id_for(rule.rule)))
+        return path, {}
+    return request, None
+
+
+def routes():
+    """[(rule, method, request, prepare)], reads before writes, in URL-map order."""
+    reads, writes = [], []
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint == "static":
+            continue
+        for method in sorted(rule.methods - {"HEAD", "OPTIONS"}):
+            request, prepare = SCENARIOS.get((rule.rule, method)) or (
+                default_get(rule) if method == "GET" else (None, None))
+            if request is None:
+                print(f"  no scenario for {method} {rule.rule}, skipped", file=sys.stderr)
+                continue
+            (reads if method == "GET" else writes).append((rule.rule, method, request, prepare))
+    return reads + writes
+
+
+# ===========================
+# Measurement
+# ===========================
+statements = [0]
+
+
+def count_statement(*args):
+    statements[0] += 1
+
+
+def percentile(values, p):
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def drive(client, headers, method, request, ctx, n):
+    status, timings = {}, []
+    statements[0] = 0
+    for i in range(WARMUP + n):
+        path, kwargs = request(ctx, i)
+        if i == WARMUP:
+            statements[0] = 0
+        start = time.perf_counter()
+        response = client.open(path, method=method, headers=headers, **kwargs)
+        elapsed = time.perf_counter() - start
+        if i >= WARMUP:
+            timings.append(elapsed)
+            status[str(response.status_code)] = status.get(str(response.status_code), 0) + 1
+    sql = statements[0] / n
+
+    # One more request under tracemalloc for peak memory
+    path, kwargs = request(ctx, WARMUP + n)
+    tracemalloc.start()
+    client.open(path, method=method, headers=headers, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "requests": n,
+        "status": status,
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "p99_ms": round(percentile(timings, 99) * 1000, 3),
+        "rps": round(n / sum(timings), 1),
+        "sql_per_request": round(sql, 2),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def populate(scale, seed):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        for _ in seeder.generate(max(5, scale // 2000), scale, 3, 0, seed, date(2025, 1, 1), 5000):
+            pass
+        db.session.commit()
+    # A new database reuses table version numbers; drop anything cached
+    app.extensions["refcache"].clear()
+    app.extensions["checked_claims"].clear()
+
+
+def run_scale(scale, n, seed):
+    populate(scale, seed)
+    client = app.test_client()
+    ctx = Context()
+
+    tokens = {}
+    for role, email in ROLES.items():
+        tokens[role] = client.post("/auth/login", json={"email": email, "password": "password123"}).get_json()["access_token"]
+
+    results = []
+    for rule, method, request, prepare in routes():
+        for role, email in ROLES.items():
+            ctx.email = email
+            ctx.run += 1
+            if prepare:
+                prepare(ctx, WARMUP + n + 1)
+            headers = {"Authorization": f"Bearer {tokens[role]}"}
+            row = drive(client, headers, method, request, ctx, n)
+            results.append({"scale": scale, "role": role, "method": method, "route": rule, **row})
+            print(f"{scale:>8} {role:<9}{method:<7}{rule:<26}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}"
+                  f"{row['p99_ms']:>9.2f}{row['rps']:>9.0f}{row['sql_per_request']:>7.1f}{row['peak_kb']:>10.0f}"
+                  f"  {' '.join(f'{k}x{v}' for k, v in sorted(row['status'].items()))}")
+    return results
+
+
+def metadata(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "requests": args.requests,
+        "seed": args.seed,
+    }
+
+
+# ===========================
+# Comparison
+# ===========================
+def compare(old_path, new_path, max_slowdown):
+    def load(path):
+        with open(path) as f:
+            return {(r["scale"], r["role"], r["method"], r["route"]): r for r in json.load(f)["results"]}
+
+    old, new = load(old_path), load(new_path)
+    regressions = 0
+    for key in sorted(old.keys() & new.keys(), key=str):
+        before, after = old[key], new[key]
+        slower = after["p95_ms"] > before["p95_ms"] * max_slowdown and after["p95_ms"] - before["p95_ms"] > 1
+        more_sql = after["sql_per_request"] > before["sql_per_request"]
+        if slower or more_sql or before["status"] != after["status"]:
+            regressions += slower or more_sql
+            print(f"{'REGRESSION' if slower or more_sql else 'changed':<11}{key[0]:>8} {key[1]:<9}{key[2]:<7}{key[3]:<26}"
+                  f" p95 {before['p95_ms']:.2f} -> {after['p95_ms']:.2f} ms,"
+                  f" sql {before['sql_per_request']} -> {after['sql_per_request']},"
+                  f" status {before['status']} -> {after['status']}")
+    for key in sorted(old.keys() - new.keys(), key=str):
+        print(f"{'removed':<11}{key}")
+    for key in sorted(new.keys() - old.keys(), key=str):
+        print(f"{'added':<11}{key}")
+    print(f"{regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="100,1000,10000")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="bench.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--max-slowdown", type=float, default=1.25)
+    args = parser.parse_args()
+
+    if args.compare:
+        os.unlink(_db.name)
+        sys.exit(compare(*args.compare, args.max_slowdown))
+
+    print(f"{'scale':>8} {'role':<9}{'method':<7}{'route':<26}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'req/s':>9}{'sql':>7}{'peak KB':>10}  status")
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", count_statement)
+    results = []
+    for scale in [int(s) for s in args.scales.split(",")]:
+        results.extend(run_scale(scale, args.requests, args.seed))
+
+    with open(args.out, "w") as f:
+        json.dump({"meta": metadata(args), "results": results}, f, indent=1, sort_keys=True)
+        f.write("\n")
+    print(f"wrote {args.out}")
+    os.unlink(_db.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Login throughput at several bcrypt cost factors.
+
+    python bench/login.py [--costs 4,8,10,12] [--concurrency 8] [--logins 64]
+
+For each cost factor, stores one user hashed at that cost in a scratch SQLite
+database and fires concurrent POST /auth/login requests from N client threads.
+Reports logins/second and p50/p95 latency. Hashing runs on the pool configured
+by BCRYPT_POOL_WORKERS / BCRYPT_POOL_MAX_QUEUE (see hashing.py); 503s from a
+saturated pool are counted separately.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+_db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URI"] = f"sqlite:///{_db.name}"
+os.environ.setdefault("JWT_SECRET", "bench-secret-key-that-is-long-enough-for-hs256")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app  # noqa: E402
+from models import db, Department, Employee, UserType  # noqa: E402
+import hashing  # noqa: E402
+
+PASSWORD = "password123"
+
+
+def setup(cost):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        department = Department(name="Bench")
+        user_type = UserType(name="Employee")
+        user = Employee(first_name="Bench", last_name="User", email="bench.user@company.com",
+                        department=department, user_type=user_type)
+        user.password_hash = hashing.hash_password(PASSWORD, cost)
+        db.session.add(user)
+        db.session.commit()
+    app.config["BCRYPT_LOG_ROUNDS"] = cost  # no rehash-on-login during the run
+
+
+def login(_):
+    client = app.test_client()
+    start = time.perf_counter()
+    response = client.post("/auth/login", json={"email": "bench.user@company.com", "password": PASSWORD})
+    return response.status_code, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--costs", default="4,8,10,12")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"pool workers={hashing.POOL_WORKERS} queue={hashing.POOL_MAX_QUEUE} "
+          f"client threads={args.concurrency}")
+    print(f"{'cost':>4}{'logins':>8}{'ok':>6}{'503':>6}{'logins/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for cost in [int(c) for c in args.costs.split(",")]:
+        setup(cost)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as clients:
+            results = list(clients.map(login, range(args.logins)))
+        elapsed = time.perf_counter() - start
+
+        latencies = sorted(t for status, t in results if status == 200)
+        ok = len(latencies)
+        busy = sum(1 for status, _ in results if status == 503)
+        p50 = statistics.median(latencies) * 1000 if latencies else float("nan")
+        p95 = latencies[int(0.95 * (ok - 1))] * 1000 if latencies else float("nan")
+        print(f"{cost:>4}{args.logins:>8}{ok:>6}{busy:>6}{ok / elapsed:>10.1f}{p50:>10.1f}{p95:>10.1f}")
+
+    os.unlink(_db.name)
+
+
+if __name__ == "__main__":
+    main()
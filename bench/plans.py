@@ -0,0 +1,161 @@
+"""Query-plan regression check: no full scans of large tables behind a filter.
+
+    python bench/plans.py [--employees 5000] [--min-rows 1000] [--out plans.json] [--verbose]
+
+Seeds a scratch SQLite database (seed.py's generator, 3 reviews per employee,
+10 attendance days), then requests every GET route as HR, Manager and
+Employee, plus the filter variants in QUERIES. Every SELECT the app issues is
+captured and run through EXPLAIN QUERY PLAN.
+
+A plan step "SCAN <table>" on a table with at least --min-rows rows fails the
+check when the statement has a WHERE clause: a filtered query that reads the
+whole table is missing an index. Unfiltered statements (HR listing everything,
+COUNT(*)) are expected to scan. Known, accepted scans go in ALLOWED.
+
+Plans are written to --out as JSON (route -> statements -> plan lines) so
+they can be diffed between commits. Exits 1 when any check fails.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+from datetime import date
+
+_db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URI"] = f"sqlite:///{_db.name}"
+os.environ.setdefault("JWT_SECRET", "bench-secret-key-that-is-long-enough-for-hs256")
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, inspect, text  # noqa: E402
+
+from app import app  # noqa: E402
+from models import db, Employee  # noqa: E402
+import seed as seeder  # noqa: E402
+
+ROLES = {
+    "HR": "faith.mugo@company.com",
+    "Manager": "alice.ngugi@company.com",
+    "Employee": "brian.mutua@company.com",
+}
+UNTIL = date(2025, 1, 31)
+
+# Extra query strings per route, to exercise the server-side filters
+QUERIES = {
+    "/employees": ["?department_id=2", "?job_title_id=3", "?user_type_id=1", "?limit=50",
+                   "?fields=id,department_name&department_id=2"],
+    "/employees/search": ["?q=alice", "?q=eng ngu", "?q=software&department_id=1"],
+    "/reviews": ["?employee_id=2", "?department_id=2", "?job_title_id=3",
+                 "?from_date=2024-01-01&to_date=2024-12-31", "?limit=50", "?fields=id,rating,review_date"],
+    "/attendance": ["?employee_id=2", "?from_date=2025-01-20&to_date=2025-01-24", "?limit=50"],
+    "/attendance/calendar": ["?month=2025-01", "?month=2025-01&department_id=2", "?month=2025-01&employee_id=2"],
+    "/attendance/summary": ["?month=2025-01", "?month=2025-01&department_id=2"],
+    "/reviews/analytics": ["?group_by=job_title&department_id=2", "?group_by=year&employee_id=2"],
+    "/reviews/analytics/trend": ["?department_id=2"],
+}
+
+# (role, route, table) scans that are expected despite a WHERE clause
+ALLOWED = set()
+
+SCAN = re.compile(r"^SCAN (\w+)")
+
+
+def populate(employees):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        for _ in seeder.generate(max(5, employees // 500), employees, 3, 10, 42, UNTIL, 5000):
+            pass
+        db.session.commit()
+        counts = {
+            table: db.session.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            for table in inspect(db.engine).get_table_names()
+        }
+    app.extensions["refcache"].clear()
+    return counts
+
+
+def paths(rule, employee_id):
+    path = rule.rule.replace("<int:id>", str(employee_id if rule.rule.startswith("/employees") else 1))
+    return [path] + [path + query for query in QUERIES.get(rule.rule, [])]
+
+
+def explain(statement, parameters):
+    with app.app_context():
+        rows = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[-1] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--min-rows", type=int, default=1000)
+    parser.add_argument("--out", default="plans.json")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    counts = populate(args.employees)
+    large = {table for table, count in counts.items() if count >= args.min_rows}
+    print("large tables: " + ", ".join(f"{t} ({counts[t]})" for t in sorted(large)))
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", capture)
+        employee_id = Employee.query.filter_by(email=ROLES["Employee"]).one().id
+
+    client = app.test_client()
+    tokens = {
+        role: client.post("/auth/login", json={"email": email, "password": "password123"}).get_json()["access_token"]
+        for role, email in ROLES.items()
+    }
+
+    plans, failures = {}, []
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint == "static" or "GET" not in rule.methods:
+            continue
+        for path in paths(rule, employee_id):
+            for role, token in tokens.items():
+                captured.clear()
+                status = client.get(path, headers={"Authorization": f"Bearer {token}"}).status_code
+                statements = list(captured)
+                entry = plans.setdefault(f"{role} GET {path}", {"status": status, "statements": []})
+                for statement, parameters in statements:
+                    plan = explain(statement, parameters)
+                    entry["statements"].append({"sql": " ".join(statement.split()), "plan": plan})
+                    if " WHERE " not in f" {statement.upper()} ".replace("\n", " "):
+                        continue
+                    for step in plan:
+                        match = SCAN.match(step)
+                        table = match and match.group(1)
+                        if table in large and (role, rule.rule, table) not in ALLOWED:
+                            failures.append((role, path, step, " ".join(statement.split())))
+
+    with open(args.out, "w") as f:
+        json.dump(plans, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+    if args.verbose:
+        for key, entry in sorted(plans.items()):
+            print(f"\n{key} -> {entry['status']}")
+            for statement in entry["statements"]:
+                print(f"  {statement['sql'][:160]}")
+                for step in statement["plan"]:
+                    print(f"    {step}")
+
+    for role, path, step, statement in failures:
+        print(f"FULL SCAN  {role:<9}GET {path:<50}{step}\n    {statement[:200]}")
+    print(f"{len(plans)} requests, {sum(len(e['statements']) for e in plans.values())} statements, "
+          f"{len(failures)} full scan(s) of large tables; plans written to {args.out}")
+    os.unlink(_db.name)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
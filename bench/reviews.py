@@ -0,0 +1,96 @@
+"""Review submission: N single POST /reviews vs. one POST /reviews/batch.
+
+    python bench/reviews.py [--sizes 10,100,1000] [--repeat 3]
+
+For each batch size, a manager with that many reports in a scratch SQLite
+database files one review per report, first with N single requests and then
+with one batch request. Reports best-of-R wall time and reviews/second.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+_db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URI"] = f"sqlite:///{_db.name}"
+os.environ.setdefault("JWT_SECRET", "bench-secret-key-that-is-long-enough-for-hs256")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app import app  # noqa: E402
+from models import db, Department, Employee, PerformanceReview, ReviewProjection, UserType  # noqa: E402
+import hashing  # noqa: E402
+
+PASSWORD = "password123"
+
+
+def setup(reports):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.execute(insert(Department), [{"id": 1, "name": "Bench"}])
+        db.session.execute(insert(UserType), [{"id": 1, "name": "Manager"}, {"id": 2, "name": "Employee"}])
+        db.session.execute(insert(Employee), [
+            {
+                "id": i, "first_name": f"First{i}", "last_name": f"Last{i}", "email": f"user{i}@company.com",
+                "password_hash": hashing.hash_password(PASSWORD, 4) if i == 1 else "x",
+                "department_id": 1, "user_type_id": 1 if i == 1 else 2,
+            }
+            for i in range(1, reports + 2)
+        ])
+        db.session.commit()
+    app.config["BCRYPT_LOG_ROUNDS"] = 4
+    client = app.test_client()
+    token = client.post("/auth/login", json={"email": "user1@company.com", "password": PASSWORD}).get_json()["access_token"]
+    return client, {"Authorization": f"Bearer {token}"}
+
+
+def clear_reviews():
+    with app.app_context():
+        db.session.query(ReviewProjection).delete()
+        db.session.query(PerformanceReview).delete()
+        db.session.commit()
+
+
+def singles(client, headers, items):
+    for item in items:
+        assert client.post("/reviews", json=item, headers=headers).status_code == 201
+
+
+def batch(client, headers, items):
+    response = client.post("/reviews/batch", json=items, headers=headers)
+    assert response.status_code == 201 and response.get_json()["created"] == len(items)
+
+
+def best_of(repeat, fn, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        clear_reviews()
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'reviews':>8}{'single s':>10}{'batch s':>10}{'single/s':>10}{'batch/s':>10}{'speedup':>9}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        client, headers = setup(size)
+        items = [{"employee_id": i, "rating": i % 5 + 1, "notes": "Bench review"} for i in range(2, size + 2)]
+        single = best_of(args.repeat, singles, client, headers, items)
+        batched = best_of(args.repeat, batch, client, headers, items)
+        print(f"{size:>8}{single:>10.3f}{batched:>10.3f}{size / single:>10.0f}{size / batched:>10.0f}"
+              f"{single / batched:>8.1f}x")
+
+    os.unlink(_db.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Micro-benchmark: SerializerMixin.to_dict() vs. compiled serializers.
+
+    python bench/serializers.py [--rows 10000] [--repeat 5]
+
+Builds an in-memory SQLite database with N employees and N performance
+reviews, checks that both serializers produce identical JSON, then reports the
+best-of-R wall time for each.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+os.environ["DATABASE_URI"] = "sqlite://"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app import app  # noqa: E402
+from models import (  # noqa: E402
+    db, Department, Employee, JobTitle, PerformanceReview, ReviewProjection, UserType,
+    refresh_review_projection,
+)
+from serializers import serializer_for  # noqa: E402
+
+
+def populate(rows):
+    db.create_all()
+    db.session.execute(insert(Department), [{"id": i, "name": f"Dept {i}"} for i in range(1, 11)])
+    db.session.execute(insert(UserType), [{"id": 1, "name": "Employee"}, {"id": 2, "name": "Manager"}])
+    db.session.execute(insert(JobTitle), [{"id": i, "title": f"Title {i}"} for i in range(1, 21)])
+    db.session.execute(insert(Employee), [
+        {
+            "id": i, "first_name": f"First{i}", "last_name": f"Last{i}", "email": f"user{i}@company.com",
+            "phone": f"07{i:08d}", "password_hash": "x", "department_id": i % 10 + 1,
+            "user_type_id": 1 + (i % 25 == 0), "job_title_id": i % 20 + 1,
+        }
+        for i in range(1, rows + 1)
+    ])
+    db.session.execute(insert(PerformanceReview), [
+        {
+            "id": i, "employee_id": i, "reviewer": "Some Manager", "notes": f"Review notes {i}",
+            "rating": i % 5 + 1, "review_date": datetime(2024, 1 + i % 12, 1 + i % 28, 9, 30),
+        }
+        for i in range(1, rows + 1)
+    ])
+    refresh_review_projection(db.session.connection())
+    db.session.commit()
+
+
+def best_of(repeat, fn, items):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with app.app_context():
+        populate(args.rows)
+        cases = [
+            ("Employee", Employee.with_related(selectinload).all()),
+            ("PerformanceReview", PerformanceReview.query.options(
+                selectinload(PerformanceReview.employee).options(*Employee.related_options(selectinload))
+            ).all()),
+            ("ReviewProjection", ReviewProjection.query.all()),
+        ]
+
+        print(f"{'model':<20}{'rows':>8}{'to_dict (s)':>14}{'compiled (s)':>14}{'speedup':>10}")
+        for name, items in cases:
+            compiled = serializer_for(type(items[0]))
+            for item in items:
+                if json.dumps(item.to_dict(), sort_keys=True) != json.dumps(compiled(item), sort_keys=True):
+                    sys.exit(f"{name} id={item.id}: compiled output differs from to_dict()")
+
+            slow = best_of(args.repeat, lambda obj: obj.to_dict(), items)
+            fast = best_of(args.repeat, compiled, items)
+            print(f"{name:<20}{len(items):>8}{slow:>14.4f}{fast:>14.4f}{slow / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
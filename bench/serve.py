@@ -0,0 +1,172 @@
+"""HTTP throughput of a running server: dev server vs gunicorn.
+
+    python bench/serve.py [--mode dev,prod] [--employees 5000] [--clients 16] [--seconds 20]
+
+Seeds a scratch SQLite database (seed.py's generator), then for each mode
+starts the server as a subprocess on a free port and drives it over real
+HTTP/1.1 keep-alive connections from --clients threads for --seconds:
+
+  dev     python app.py (Flask development server, debugger and reloader on)
+  prod    gunicorn -c gunicorn.conf.py wsgi:app (WEB_CONCURRENCY, GUNICORN_THREADS
+          and the DB_* / SQLITE_* variables are passed through)
+
+Each client logs in as HR, Manager or Employee and cycles through PATHS,
+a mixed read load over lists, details, search and analytics. Reports
+requests/second, p50/p99 latency and non-2xx/3xx responses.
+"""
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URI"] = f"sqlite:///{_db.name}"
+os.environ.setdefault("JWT_SECRET", "bench-secret-key-that-is-long-enough-for-hs256")
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
+sys.path.insert(0, ROOT)
+
+ROLES = ["faith.mugo@company.com", "alice.ngugi@company.com", "brian.mutua@company.com"]
+PATHS = [
+    "/employees?limit=50",
+    "/employees/2",
+    "/employees/search?q=ali",
+    "/reviews?limit=50",
+    "/reviews/analytics?group_by=job_title",
+    "/attendance?limit=50",
+    "/attendance/calendar?month=2025-01&limit=50",
+    "/departments",
+    "/job-titles",
+]
+
+
+def populate(employees):
+    from app import app
+    from models import db
+    import seed as seeder
+
+    with app.app_context():
+        db.create_all()
+        for _ in seeder.generate(max(5, employees // 500), employees, 3, 10, 42, date(2025, 1, 31), 5000):
+            pass
+        db.session.commit()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start(mode, port):
+    env = dict(os.environ)
+    if mode == "dev":
+        # app.py runs on 5555; patch the port in through the same entry point
+        command = [sys.executable, "-c", f"import app; app.app.run(port={port}, debug=True)"]
+    else:
+        env["BIND"] = f"127.0.0.1:{port}"
+        command = ["gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"]
+    process = subprocess.Popen(command, cwd=ROOT, env=env, start_new_session=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/departments")
+            conn.getresponse().read()
+            conn.close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    stop(process)
+    raise RuntimeError(f"{mode} server did not start")
+
+
+def stop(process):
+    # SIGINT: quick shutdown for both servers (gunicorn's SIGTERM waits for keep-alive clients)
+    os.killpg(process.pid, signal.SIGINT)
+    process.wait(timeout=30)
+
+
+def login(port, email):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request("POST", "/auth/login", json.dumps({"email": email, "password": "password123"}),
+                 {"Content-Type": "application/json"})
+    return json.loads(conn.getresponse().read())["access_token"]
+
+
+def drive(port, tokens, clients, seconds):
+    timings, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + seconds
+
+    def client(n):
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        headers = {"Authorization": f"Bearer {tokens[n % len(tokens)]}"}
+        mine, failed, i = [], 0, n
+        while time.monotonic() < stop_at:
+            path = PATHS[i % len(PATHS)]
+            i += 1
+            start = time.perf_counter()
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            mine.append(time.perf_counter() - start)
+            failed += response.status >= 400 and response.status != 403
+        conn.close()
+        with lock:
+            timings.extend(mine)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    return {
+        "requests": len(timings),
+        "rps": round(len(timings) / elapsed, 1),
+        "p50_ms": round(timings[len(timings) // 2] * 1000, 1),
+        "p99_ms": round(timings[int(len(timings) * 0.99)] * 1000, 1),
+        "errors": errors[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", default="dev,prod")
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=20)
+    args = parser.parse_args()
+
+    populate(args.employees)
+    print(f"{'mode':<6}{'requests':>10}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    try:
+        for mode in args.mode.split(","):
+            port = free_port()
+            process = start(mode, port)
+            try:
+                tokens = [login(port, email) for email in ROLES]
+                result = drive(port, tokens, args.clients, args.seconds)
+            finally:
+                stop(process)
+            print(f"{mode:<6}{result['requests']:>10}{result['rps']:>9}{result['p50_ms']:>9}"
+                  f"{result['p99_ms']:>9}{result['errors']:>8}")
+    finally:
+        os.unlink(_db.name)
+
+
+if __name__ == "__main__":
+    main()
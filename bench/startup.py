@@ -0,0 +1,82 @@
+"""Cold-start cost: import time, app construction, first request, CLI start-up.
+
+    python bench/startup.py [--root .] [--runs 5]
+
+Every measurement runs in a fresh interpreter (nothing cached in-process)
+against DATABASE_URI, which must already be migrated and seeded (python
+seed.py). --root points at the tree to measure, so an older checkout
+(git worktree add /tmp/before <commit>) can be compared with this one.
+
+  import       import app
+  create       build the Flask app (create_app(), or app.app on trees without it)
+  first GET    the first authenticated GET /employees/<id>, then a second one
+  flask db     `flask --app app db current`, wall time
+  seed --help  `python seed.py --help`, wall time
+
+Reports the median over --runs, in milliseconds.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app as module
+t1 = time.perf_counter()
+app = module.create_app() if hasattr(module, "create_app") else module.app
+t2 = time.perf_counter()
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import text
+from models import db
+with app.app_context():
+    id, role, department_id = db.session.execute(text(
+        "SELECT e.id, u.name, e.department_id FROM employees e JOIN user_types u ON u.id = e.user_type_id "
+        "WHERE e.email = 'faith.mugo@company.com'")).one()
+    token = create_access_token(identity=id, additional_claims={"role": role, "department_id": department_id})
+client = app.test_client()
+headers = {"Authorization": f"Bearer {token}"}
+t3 = time.perf_counter()
+assert client.get(f"/employees/{id}", headers=headers).status_code == 200
+t4 = time.perf_counter()
+client.get(f"/employees/{id}", headers=headers)
+t5 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "create": t2 - t1, "first GET": t4 - t3, "second GET": t5 - t4}))
+"""
+
+
+def wall(command, root):
+    start = time.perf_counter()
+    subprocess.run(command, cwd=root, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    if not os.environ.get("DATABASE_URI"):
+        parser.error("set DATABASE_URI to a migrated, seeded database")
+
+    samples = {}
+    for _ in range(args.runs):
+        probe = subprocess.run([sys.executable, "-c", PROBE], cwd=args.root, check=True,
+                               capture_output=True, text=True)
+        for name, seconds in json.loads(probe.stdout.strip().splitlines()[-1]).items():
+            samples.setdefault(name, []).append(seconds)
+        samples.setdefault("flask db", []).append(
+            wall([sys.executable, "-m", "flask", "--app", "app", "db", "current"], args.root))
+        samples.setdefault("seed --help", []).append(wall([sys.executable, "seed.py", "--help"], args.root))
+
+    for name, values in samples.items():
+        print(f"{name:<12}{statistics.median(values) * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
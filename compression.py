@@ -0,0 +1,173 @@
+import gzip
+import os
+import threading
+import zlib
+from collections import OrderedDict
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+# ===========================
+# Response compression
+# ===========================
+# Bodies are compressed with the best encoding the client accepts, brotli
+# first (when the brotli package is installed), then gzip. Bodies under
+# COMPRESS_MIN_BYTES go out as they are, because at that size the headers
+# cost more than compression saves. NDJSON streams are compressed chunk by
+# chunk and flushed after each one, so the client still gets rows as they
+# are produced.
+#
+# A compressed body has its own ETag, the identity ETag plus "-gzip" / "-br",
+# so caches do not mix up representations. conditional.py strips the suffix
+# before comparing (base_etag).
+#
+#   COMPRESS_ENABLED          default 1; 0 leaves compression to a proxy
+#   COMPRESS_MIN_BYTES        default 1024
+#   COMPRESS_GZIP_LEVEL       default 6
+#   COMPRESS_BROTLI_QUALITY   default 5 (11 is far too slow for per-request use)
+#   COMPRESS_CACHE_MB         compressed bodies kept per process, default 32
+COMPRESS_ENABLED = os.environ.get("COMPRESS_ENABLED", "1").lower() not in ("0", "false", "no", "off")
+COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", 1024))
+GZIP_LEVEL = int(os.environ.get("COMPRESS_GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.environ.get("COMPRESS_BROTLI_QUALITY", 5))
+CACHE_BYTES = int(float(os.environ.get("COMPRESS_CACHE_MB", 32)) * 1024 * 1024)
+
+COMPRESSIBLE = {"application/json", "application/x-ndjson", "text/csv", "text/plain", "text/html"}
+# Server preference when the client weights encodings equally
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _compress_stream(chunks, encoding):
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        step = lambda data: compressor.process(data) + compressor.flush()
+        finish = compressor.finish
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+        step = lambda data: compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        finish = compressor.flush
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            yield step(chunk)
+        yield finish()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def base_etag(etag):
+    """The identity ETag a (possibly compressed) representation's ETag came from."""
+    for encoding in ("gzip", "br"):
+        if etag.endswith("-" + encoding):
+            return etag[: -len(encoding) - 1]
+    return etag
+
+# ===========================
+# Compressed body cache
+# ===========================
+# A response with an ETag is described by it (conditional.py derives it from
+# the URL, the caller's scope and the table versions), so its compressed bytes
+# are kept under (ETag, encoding): a repeated request still builds the JSON but
+# skips compressing it. Entries also hold a CRC of the uncompressed body, which
+# catches a body that changed under the same ETag (reference payloads are
+# cached for a few seconds, see refcache.py). Least recently used bodies are
+# dropped beyond COMPRESS_CACHE_MB. Each app has its own (init_compression).
+class CompressedBodies:
+    def __init__(self, max_bytes=CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, data):
+        checksum = zlib.crc32(data)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != checksum:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, data, body):
+        if len(body) > self.max_bytes:
+            return
+        checksum = zlib.crc32(data)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            self._entries[key] = (checksum, body)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self.size -= len(dropped)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+# ===========================
+# after_request hook
+# ===========================
+def _negotiate():
+    encoding = request.accept_encodings.best_match(ENCODINGS)
+    return encoding if encoding in ENCODINGS else None
+
+
+def compress_response(response):
+    etag, weak = response.get_etag()
+    if response.status_code == 304:
+        # Answer with the ETag of the representation the client holds
+        encoding = _negotiate()
+        response.vary.add("Accept-Encoding")
+        if etag and encoding and request.if_none_match.contains(f"{etag}-{encoding}"):
+            response.set_etag(f"{etag}-{encoding}", weak)
+        return response
+
+    if response.mimetype not in COMPRESSIBLE or "Content-Encoding" in response.headers:
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = _negotiate()
+    if (encoding is None or response.status_code != 200 or response.direct_passthrough
+            or "no-transform" in response.headers.get("Cache-Control", "")):
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        bodies = current_app.extensions["compressed_bodies"]
+        body = bodies.get((etag, encoding), data) if etag else None
+        if body is None:
+            body = compress(data, encoding)
+            if etag:
+                bodies.put((etag, encoding), data, body)
+        response.set_data(body)
+
+    response.headers["Content-Encoding"] = encoding
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
+
+
+def init_compression(app):
+    if COMPRESS_ENABLED:
+        app.extensions["compressed_bodies"] = CompressedBodies()
+        app.after_request(compress_response)
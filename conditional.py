@@ -0,0 +1,92 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import Response, after_this_request, request
+
+from compression import base_etag
+from identity import current_user
+from models import db, TableVersion
+from refcache import cache
+from streaming import NDJSON, wants_stream
+
+# ===========================
+# Conditional GET (ETag / Last-Modified)
+# ===========================
+# A read endpoint's validator is derived from the table_versions counters of the
+# tables its body is built from, plus the caller's role scope, the request URL
+# and the negotiated media type (JSON or NDJSON, see streaming.py). Checking
+# it costs one primary-key lookup on table_versions; when the client's copy is
+# current we answer 304 without loading or serializing rows.
+# The versions read here are passed on to the reference cache (refcache.py), so
+# a cached body is rebuilt rather than sent under a newer ETag.
+
+
+def _scope(user):
+    # HR, Manager and Employee views of the same URL differ, so the validator
+    # is per caller
+    return (user.user_type_name, user.department_id, user.id)
+
+
+def _validators(tables):
+    rows = (
+        db.session.query(TableVersion.name, TableVersion.version, TableVersion.updated_at)
+        .filter(TableVersion.name.in_(tables))
+        .all()
+    )
+    versions = sorted((name, version) for name, version, _ in rows)
+    cache.observe(dict(versions))
+    media_type = NDJSON if wants_stream() else "application/json"
+    seed = repr((request.full_path, media_type, _scope(current_user()), versions)).encode()
+    etag = hashlib.sha1(seed).hexdigest()
+
+    # HTTP dates have whole seconds, so while the newest write's second is
+    # still running a later write could share its date: Last-Modified is only
+    # sent (and If-Modified-Since only honored) once that second is over
+    stamps = [updated_at for _, _, updated_at in rows if updated_at is not None]
+    last_modified = max(stamps).astimezone(timezone.utc).replace(microsecond=0) if stamps else None
+    if last_modified is not None and last_modified >= datetime.now(timezone.utc).replace(microsecond=0):
+        last_modified = None
+    return etag, last_modified
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        # A compressed response's ETag carries an encoding suffix (compression.py)
+        return request.if_none_match.star_tag or any(base_etag(tag) == etag for tag in request.if_none_match)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def _set_validators(response, etag, last_modified):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.vary.add("Authorization")
+    response.vary.add("Accept")
+    return response
+
+
+def conditional(*tables):
+    """Decorate a resource GET whose body depends only on the given tables.
+
+    Place it under @jwt_required() so the caller's identity is known.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            etag, last_modified = _validators(tables)
+            if _not_modified(etag, last_modified):
+                return _set_validators(Response(status=304), etag, last_modified)
+
+            @after_this_request
+            def add_validators(response):
+                if response.status_code == 200:
+                    _set_validators(response, etag, last_modified)
+                return response
+
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,137 @@
+import os
+import sqlite3
+
+from flask import g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.engine import Engine, make_url
+
+# ===========================
+# Engine configuration
+# ===========================
+# Everything comes from the environment so one build runs on a laptop SQLite
+# file and a pooled PostgreSQL primary + replica alike. Unset variables keep
+# SQLAlchemy's defaults.
+#
+#   DB_POOL_SIZE, DB_MAX_OVERFLOW      connections kept / allowed on top
+#   DB_POOL_TIMEOUT                    seconds to wait for a free connection
+#   DB_POOL_RECYCLE                    seconds before a connection is replaced
+#   DB_POOL_PRE_PING                   1 to test connections on checkout
+#   DB_STATEMENT_TIMEOUT_MS            per-statement limit (PostgreSQL)
+#   DB_ECHO                            1 to log every statement
+#
+# SQLite connections get the pragmas below instead (see sqlite_pragmas).
+REPLICA_BIND = "replica"
+
+
+def _env_int(name):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else None
+
+
+def _env_flag(name):
+    return os.environ.get(name, "").lower() in ("1", "true", "yes", "on")
+
+
+def engine_options(uri):
+    """SQLALCHEMY_ENGINE_OPTIONS for uri from the DB_* environment variables."""
+    url = make_url(uri)
+    options = {}
+    if _env_flag("DB_POOL_PRE_PING"):
+        options["pool_pre_ping"] = True
+    if _env_flag("DB_ECHO"):
+        options["echo"] = True
+
+    # In-memory SQLite uses a single shared connection; pool sizing does not apply
+    if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+        for option, name in (("pool_size", "DB_POOL_SIZE"), ("max_overflow", "DB_MAX_OVERFLOW"),
+                             ("pool_timeout", "DB_POOL_TIMEOUT"), ("pool_recycle", "DB_POOL_RECYCLE")):
+            value = _env_int(name)
+            if value is not None:
+                options[option] = value
+
+    timeout = _env_int("DB_STATEMENT_TIMEOUT_MS")
+    if timeout is not None and url.get_backend_name() == "postgresql":
+        options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def configure(app):
+    """Fill in engine options and the optional replica bind from the environment."""
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    if uri:
+        app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(uri))
+    replica = os.environ.get("DATABASE_REPLICA_URI")
+    if replica:
+        app.config.setdefault("SQLALCHEMY_BINDS", {})[REPLICA_BIND] = {"url": replica, **engine_options(replica)}
+
+# ===========================
+# SQLite pragmas
+# ===========================
+# Applied to every new SQLite connection. WAL lets readers run alongside the
+# single writer, synchronous=NORMAL is durable in WAL mode at a fraction of the
+# fsyncs, and the page cache / mmap keep hot indexes in memory.
+#
+#   SQLITE_JOURNAL_MODE      default WAL
+#   SQLITE_SYNCHRONOUS       default NORMAL
+#   SQLITE_CACHE_SIZE_KB     default 65536 (per connection)
+#   SQLITE_MMAP_SIZE_MB      default 256
+#   SQLITE_BUSY_TIMEOUT_MS   default 5000, how long a writer waits for the lock
+def sqlite_pragmas():
+    return [
+        ("journal_mode", os.environ.get("SQLITE_JOURNAL_MODE", "WAL")),
+        ("synchronous", os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")),
+        ("cache_size", -(_env_int("SQLITE_CACHE_SIZE_KB") or 65536)),
+        ("mmap_size", (_env_int("SQLITE_MMAP_SIZE_MB") or 256) * 1024 * 1024),
+        ("busy_timeout", _env_int("SQLITE_BUSY_TIMEOUT_MS") or 5000),
+        ("temp_store", "MEMORY"),
+    ]
+
+
+@event.listens_for(Engine, "connect")
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma, value in sqlite_pragmas():
+        try:
+            cursor.execute(f"PRAGMA {pragma}={value}")
+        except sqlite3.OperationalError:
+            pass  # e.g. journal_mode on a read-only replica file
+    cursor.close()
+
+# ===========================
+# Read replica routing
+# ===========================
+# With DATABASE_REPLICA_URI set, reads made while handling a GET or HEAD go to
+# the replica; everything else, and every flush, goes to the primary. A local
+# stand-in replica is the primary's own file opened read-only:
+#   DATABASE_REPLICA_URI=sqlite:///file:/path/app.db?mode=ro&uri=true
+# (or a copy of it, to see replica lag). Views read on the replica, so a GET
+# may briefly trail a write made by a previous request. Within a request, the
+# first write pins the rest of it to the primary, so it reads its own writes.
+READ_METHODS = ("GET", "HEAD")
+
+
+def reads_from_replica():
+    return has_app_context() and g.get("read_replica", False)
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and reads_from_replica():
+            # A flush, an INSERT/UPDATE/DELETE, or a bare session.connection()
+            # (only ever taken to write) is a write
+            if self._flushing or isinstance(clause, UpdateBase) or (mapper is None and clause is None):
+                g.read_replica = False
+            else:
+                replica = self._db.engines.get(REPLICA_BIND)
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def route_reads():
+    """before_request hook: send this request's reads to the replica if it only reads."""
+    g.read_replica = request.method in READ_METHODS
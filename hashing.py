@@ -0,0 +1,99 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import bcrypt
+
+# ===========================
+# Password hashing pool
+# ===========================
+# bcrypt is deliberately CPU-heavy. Running it on the request thread lets a
+# login spike pin every worker, so hashing and verification run on a small
+# dedicated thread pool instead (bcrypt releases the GIL, so threads hash in
+# parallel). The pool has a bounded queue: when it is full, or a job does not
+# finish within the timeout, callers get HashingBusy and the API answers 503
+# rather than piling up more work.
+POOL_WORKERS = int(os.environ.get("BCRYPT_POOL_WORKERS", os.cpu_count() or 2))
+POOL_MAX_QUEUE = int(os.environ.get("BCRYPT_POOL_MAX_QUEUE", 64))
+POOL_TIMEOUT = float(os.environ.get("BCRYPT_POOL_TIMEOUT_SECONDS", 10))
+
+DEFAULT_LOG_ROUNDS = 12
+
+
+class HashingBusy(Exception):
+    """The hashing pool is saturated or a job timed out."""
+
+
+_pool = None
+_slots = threading.BoundedSemaphore(POOL_WORKERS + POOL_MAX_QUEUE)
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=POOL_WORKERS, thread_name_prefix="bcrypt")
+    return _pool
+
+
+def _submit(fn, *args):
+    if not _slots.acquire(blocking=False):
+        raise HashingBusy("Password hashing queue is full")
+    try:
+        future = _get_pool().submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+
+def _result(future):
+    try:
+        return future.result(timeout=POOL_TIMEOUT)
+    except FutureTimeout:
+        raise HashingBusy("Password hashing timed out")
+
+
+def _hash(raw_password, rounds):
+    return bcrypt.hashpw(raw_password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _check(password_hash, raw_password):
+    return bcrypt.checkpw(raw_password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+def hash_password(raw_password, rounds=DEFAULT_LOG_ROUNDS):
+    return _result(_submit(_hash, raw_password, rounds))
+
+
+def check_password(password_hash, raw_password):
+    try:
+        return _result(_submit(_check, password_hash, raw_password))
+    except ValueError:  # not a bcrypt hash
+        return False
+
+
+def hash_many(raw_passwords, rounds=DEFAULT_LOG_ROUNDS):
+    """Hash a batch of passwords in parallel, never holding more queue slots
+    than the pool has workers."""
+    results = []
+    for start in range(0, len(raw_passwords), POOL_WORKERS):
+        chunk = raw_passwords[start:start + POOL_WORKERS]
+        futures = [_submit(_hash, raw, rounds) for raw in chunk]
+        results.extend(_result(f) for f in futures)
+    return results
+
+
+def hash_rounds(password_hash):
+    # "$2b$12$<salt+hash>" -> 12
+    try:
+        return int(password_hash.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def needs_rehash(password_hash, rounds=DEFAULT_LOG_ROUNDS):
+    return hash_rounds(password_hash) != rounds
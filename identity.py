@@ -0,0 +1,99 @@
+import os
+import time
+
+from flask import current_app, g, has_app_context
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy import event
+
+from models import db, Employee, UserType
+
+# ===========================
+# Request identity
+# ===========================
+# Access tokens carry the user's role and department_id as claims (see
+# AuthResource.post), so authorization checks need no database round trip.
+# The full Employee row is only loaded when a handler reads something the token
+# does not carry (email, names, department object...), once per request.
+
+
+def make_claims(user):
+    return {"role": user.user_type_name, "department_id": user.department_id}
+
+
+class Identity:
+    def __init__(self, id, user_type_name, department_id, user=None):
+        self.id = id
+        self.user_type_name = user_type_name
+        self.department_id = department_id
+        self._user = user
+
+    @property
+    def user(self):
+        if self._user is None:
+            self._user = Employee.with_related().filter_by(id=self.id).first()
+        return self._user
+
+    def __getattr__(self, name):
+        # Anything not carried in the token comes from the employee row
+        return getattr(self.user, name)
+
+
+def current_user():
+    identity = g.get("identity")
+    if identity is None:
+        claims = get_jwt()
+        if "role" in claims:
+            identity = Identity(get_jwt_identity(), claims["role"], claims.get("department_id"))
+        else:
+            # Token issued before role claims existed: fall back to the database
+            user = Employee.with_related().filter_by(id=get_jwt_identity()).first()
+            identity = Identity(user.id, user.user_type_name, user.department_id, user=user)
+        g.identity = identity
+    return identity
+
+
+# ===========================
+# Claim freshness
+# ===========================
+# A token's role/department can go stale when HR changes a user's role. Claims
+# are re-checked against the database at most once per JWT_CLAIMS_RECHECK_SECONDS
+# per user per process; a token whose claims no longer match is rejected and
+# the client has to log in again. Changes made through this process drop the
+# cached entry immediately, other workers notice within the recheck window.
+CLAIMS_RECHECK_SECONDS = float(os.environ.get("JWT_CLAIMS_RECHECK_SECONDS", 300))
+
+
+def _checked():
+    """user id -> (role, department_id, checked_at), kept per app (see init_jwt)."""
+    return current_app.extensions["checked_claims"]
+
+
+def claims_are_current(jwt_header, jwt_data):
+    """flask_jwt_extended token_verification_loader."""
+    if "role" not in jwt_data:
+        return True  # legacy token, current_user() reads the database anyway
+
+    user_id = jwt_data["sub"]
+    checked = _checked()
+    cached = checked.get(user_id)
+    if cached is None or time.monotonic() - cached[2] > CLAIMS_RECHECK_SECONDS:
+        row = (
+            db.session.query(UserType.name, Employee.department_id)
+            .select_from(Employee)
+            .outerjoin(UserType, Employee.user_type_id == UserType.id)
+            .filter(Employee.id == user_id)
+            .first()
+        )
+        if row is None:
+            checked.pop(user_id, None)
+            return False
+        cached = checked[user_id] = (row[0], row[1], time.monotonic())
+
+    return (jwt_data["role"], jwt_data.get("department_id")) == cached[:2]
+
+
+@event.listens_for(Employee, "after_update")
+@event.listens_for(Employee, "after_delete")
+def _forget_checked_claims(mapper, connection, target):
+    if has_app_context():
+        _checked().pop(target.id, None)
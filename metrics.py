@@ -0,0 +1,334 @@
+import glob
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from flask import Response, abort, current_app, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# ===========================
+# Request metrics
+# ===========================
+# Every request records its latency, status, response size, and the number and
+# total time of the SQL statements it ran (SQLAlchemy cursor events). Routes
+# are labelled by URL rule (/employees/<int:id>), never by raw path, so the
+# number of series stays fixed. Scraped as Prometheus text from GET /metrics.
+#
+# Recording is a few dictionary updates under a lock per request and two
+# perf_counter() calls per statement, cheap enough to leave on.
+#
+#   METRICS_ENABLED     default 1; 0 drops the request hooks and /metrics (the
+#                       slow-query log stays on)
+#   METRICS_TOKEN       if set, /metrics requires "Authorization: Bearer <token>"
+#   METRICS_DIR         share metrics between worker processes (see snapshots
+#                       below); gunicorn.conf.py sets one up
+#   SLOW_QUERY_MS       log statements slower than this, default 100
+#   SLOW_REQUEST_MS     log requests slower than this with the statements they
+#                       ran, default 500
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1").lower() not in ("0", "false", "no", "off")
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+SLOW_QUERY_SECONDS = float(os.environ.get("SLOW_QUERY_MS", 100)) / 1000
+SLOW_REQUEST_SECONDS = float(os.environ.get("SLOW_REQUEST_MS", 500)) / 1000
+# Statements listed in a slow request's log entry, slowest first
+SLOW_REQUEST_STATEMENTS = 5
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+ROUTE = ("method", "route")
+
+# name -> (type, help, buckets, label names)
+METRICS = {
+    "http_requests_total": (
+        "counter", "Requests handled.", None, ROUTE + ("status",)),
+    "http_request_duration_seconds": (
+        "histogram", "Time from the start of the request to the end of the response body.",
+        LATENCY_BUCKETS, ROUTE),
+    "http_request_db_statements": (
+        "histogram", "SQL statements executed per request.", STATEMENT_BUCKETS, ROUTE),
+    "http_request_db_seconds": (
+        "histogram", "Time spent executing SQL per request.", LATENCY_BUCKETS, ROUTE),
+    "http_response_size_bytes": (
+        "histogram", "Response body size.", SIZE_BUCKETS, ROUTE),
+    "db_slow_queries_total": (
+        "counter", f"Statements slower than SLOW_QUERY_MS ({SLOW_QUERY_SECONDS * 1000:g} ms).", None, ROUTE),
+}
+
+
+class Registry:
+    """Counters and histograms keyed by (metric name, label values).
+
+    A histogram series is a list: one count per bucket (not cumulative), one
+    for values above the last bucket, then the sum of observed values.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    def inc(self, name, labels, amount=1):
+        key = (name, labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+            self.dirty = True
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, labels)
+        with self._lock:
+            series = self.values.get(key)
+            if series is None:
+                series = self.values[key] = [0] * (len(buckets) + 2)
+            series[bisect_left(buckets, value)] += 1
+            series[-1] += value
+            self.dirty = True
+
+    def snapshot(self):
+        with self._lock:
+            self.dirty = False
+            return [[name, list(labels), value[:] if isinstance(value, list) else value]
+                    for (name, labels), value in self.values.items()]
+
+
+def merge(snapshots):
+    values = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot:
+            if name not in METRICS:
+                continue  # written by an older build
+            key = (name, tuple(labels))
+            if isinstance(value, list):
+                total = values.setdefault(key, [0] * len(value))
+                for i, v in enumerate(value):
+                    total[i] += v
+            else:
+                values[key] = values.get(key, 0) + value
+    return values
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render(values):
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for name, (kind, help, buckets, label_names) in METRICS.items():
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (series_name, labels), value in sorted(values.items(), key=lambda item: item[0]):
+            if series_name != name:
+                continue
+            if kind == "counter":
+                lines.append(f"{name}{_labels(label_names, labels)} {value:g}")
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets + ("+Inf",), value):
+                cumulative += count
+                le = 'le="%s"' % bound
+                lines.append(f"{name}_bucket{_labels(label_names, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(label_names, labels)} {value[-1]:g}")
+            lines.append(f"{name}_count{_labels(label_names, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+# ===========================
+# Worker snapshots
+# ===========================
+# gunicorn runs several worker processes and a scrape reaches whichever one
+# accepts it. With METRICS_DIR set, each process writes its app's registry to
+# METRICS_DIR/<pid>-<registry id>.json about once a second (only after it
+# changed) and /metrics adds up every file, so a scrape sees the whole server.
+# Files of exited workers are kept so counters never go backwards; the
+# directory is emptied when the server starts (clear_snapshots).
+METRICS_DIR = os.environ.get("METRICS_DIR")
+SNAPSHOT_INTERVAL_SECONDS = 1.0
+# id(registry) -> pid of the process flushing it
+_flushers = {}
+_snapshot_lock = threading.Lock()
+
+
+def write_snapshot(registry):
+    path = os.path.join(METRICS_DIR, f"{os.getpid()}-{id(registry):x}.json")
+    with _snapshot_lock:
+        with open(path + ".tmp", "w") as f:
+            json.dump(registry.snapshot(), f)
+        os.replace(path + ".tmp", path)
+
+
+def _flush_periodically(registry):
+    while True:
+        time.sleep(SNAPSHOT_INTERVAL_SECONDS)
+        if registry.dirty:
+            try:
+                write_snapshot(registry)
+            except OSError:
+                logger.exception("Could not write metrics snapshot to %s", METRICS_DIR)
+
+
+def _start_flusher(registry):
+    # One thread per registry and process; a forked worker starts its own
+    if _flushers.get(id(registry)) != os.getpid():
+        _flushers[id(registry)] = os.getpid()
+        threading.Thread(target=_flush_periodically, args=(registry,), name="metrics-snapshots",
+                         daemon=True).start()
+
+
+def clear_snapshots():
+    if METRICS_DIR:
+        for path in glob.glob(os.path.join(METRICS_DIR, "*.json")):
+            os.unlink(path)
+
+
+def collect(registry):
+    if not METRICS_DIR:
+        return merge([registry.snapshot()])
+    write_snapshot(registry)
+    snapshots = []
+    for path in glob.glob(os.path.join(METRICS_DIR, "*.json")):
+        try:
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            pass  # replaced or removed mid-read
+    return merge(snapshots)
+
+# ===========================
+# Per-request recording
+# ===========================
+class RequestStats:
+    __slots__ = ("registry", "started", "statements", "db_seconds", "status", "size")
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.started = time.perf_counter()
+        self.statements = []  # (seconds, SQL)
+        self.db_seconds = 0.0
+        self.status = None
+        self.size = None
+
+
+_current = ContextVar("request_stats", default=None)
+
+
+def _route():
+    return (request.method, request.url_rule.rule if request.url_rule is not None else "<unmatched>")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _statement_started(conn, cursor, statement, parameters, context, executemany):
+    conn.info["statement_started"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _statement_finished(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("statement_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = _current.get()
+    if stats is not None:
+        stats.statements.append((elapsed, statement))
+        stats.db_seconds += elapsed
+    if elapsed >= SLOW_QUERY_SECONDS:
+        # Parameters are left out: they can hold personal data and password hashes
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, " ".join(statement.split()))
+        if stats is not None:
+            stats.registry.inc("db_slow_queries_total", _route())
+
+
+def _count_bytes(body, stats):
+    try:
+        for chunk in body:
+            stats.size += len(chunk)
+            yield chunk
+    finally:
+        if hasattr(body, "close"):
+            body.close()
+
+
+def start_request():
+    _current.set(RequestStats(current_app.extensions["metrics"]))
+
+
+def finish_response(response):
+    stats = _current.get()
+    if stats is not None:
+        stats.status = response.status_code
+        if response.content_length is not None:
+            stats.size = response.content_length
+        elif response.is_streamed:
+            # Counted as it is sent; with stream_with_context (streaming.py) the
+            # request is recorded once the stream ends
+            stats.size = 0
+            response.response = _count_bytes(response.response, stats)
+        else:
+            stats.size = len(response.get_data())
+    return response
+
+
+def record_request(exc=None):
+    """teardown_request hook; for streamed responses it runs once the body is sent."""
+    stats = _current.get()
+    if stats is None:
+        return
+    _current.set(None)
+    elapsed = time.perf_counter() - stats.started
+    route = _route()
+    status = stats.status if stats.status is not None else 500
+    registry = stats.registry
+
+    registry.inc("http_requests_total", route + (str(status),))
+    registry.observe("http_request_duration_seconds", route, elapsed)
+    registry.observe("http_request_db_statements", route, len(stats.statements))
+    registry.observe("http_request_db_seconds", route, stats.db_seconds)
+    if stats.size is not None:
+        registry.observe("http_response_size_bytes", route, stats.size)
+
+    if elapsed >= SLOW_REQUEST_SECONDS:
+        slowest = sorted(stats.statements, key=lambda s: s[0], reverse=True)[:SLOW_REQUEST_STATEMENTS]
+        logger.warning(
+            "Slow request (%.1f ms): %s %s -> %s, %d statements in %.1f ms%s",
+            elapsed * 1000, request.method, request.full_path.rstrip("?"), status,
+            len(stats.statements), stats.db_seconds * 1000,
+            "".join(f"\n  %.1f ms  %s" % (seconds * 1000, " ".join(sql.split())) for seconds, sql in slowest),
+        )
+
+    if METRICS_DIR:
+        _start_flusher(registry)
+
+# ===========================
+# GET /metrics
+# ===========================
+def metrics_view():
+    if METRICS_TOKEN:
+        _, _, supplied = request.headers.get("Authorization", "").partition(" ")
+        if not hmac.compare_digest(supplied.encode(), METRICS_TOKEN.encode()):
+            abort(401)
+    return Response(render(collect(current_app.extensions["metrics"])), mimetype="text/plain; version=0.0.4")
+
+
+def init_metrics(app):
+    if not METRICS_ENABLED:
+        return
+    # Each app counts its own requests
+    app.extensions["metrics"] = Registry()
+    app.before_request(start_request)
+    app.after_request(finish_response)
+    app.teardown_request(record_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view, methods=["GET"])
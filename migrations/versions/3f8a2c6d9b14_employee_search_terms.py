@@ -0,0 +1,60 @@
+"""employee search terms
+
+Revision ID: 3f8a2c6d9b14
+Revises: 9d4b6e1a7c52
+Create Date: 2026-10-18 22:05:13.384106
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8a2c6d9b14'
+down_revision = '9d4b6e1a7c52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    employee_search_terms = op.create_table('employee_search_terms',
+    sa.Column('term', sa.String(length=64), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('weight', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('term', 'employee_id', name=op.f('pk_employee_search_terms')),
+    sqlite_with_rowid=False
+    )
+    op.create_index(op.f('ix_employee_search_terms_employee_id'), 'employee_search_terms', ['employee_id'], unique=False)
+
+    # Backfill; same terms and weights as models.refresh_employee_search
+    employees = sa.table('employees',
+        sa.column('id', sa.Integer), sa.column('first_name', sa.String), sa.column('last_name', sa.String),
+        sa.column('email', sa.String), sa.column('department_id', sa.Integer), sa.column('job_title_id', sa.Integer))
+    job_titles = sa.table('job_titles', sa.column('id', sa.Integer), sa.column('title', sa.String))
+    departments = sa.table('departments', sa.column('id', sa.Integer), sa.column('name', sa.String))
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(employees.c.id, employees.c.first_name, employees.c.last_name, employees.c.email,
+                  job_titles.c.title, departments.c.name)
+        .select_from(employees)
+        .outerjoin(job_titles, employees.c.job_title_id == job_titles.c.id)
+        .outerjoin(departments, employees.c.department_id == departments.c.id)
+    ).all()
+    terms = []
+    for employee_id, first_name, last_name, email, title, department in rows:
+        weights = {}
+        for text, weight in ((first_name, 3), (last_name, 3), ((email or '').split('@')[0], 2),
+                             (title, 1), (department, 1)):
+            for term in re.findall(r'\w+', (text or '').lower()):
+                weights[term[:64]] = max(weights.get(term[:64], 0), weight)
+        terms.extend({'term': term, 'employee_id': employee_id, 'weight': weight} for term, weight in weights.items())
+    if terms:
+        op.bulk_insert(employee_search_terms, terms)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_employee_search_terms_employee_id'), table_name='employee_search_terms')
+    op.drop_table('employee_search_terms')
@@ -0,0 +1,43 @@
+"""attendance indexes
+
+Revision ID: 5b9e0d7c3a61
+Revises: a4d3f2c8e915
+Create Date: 2026-10-18 18:21:04.652310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9e0d7c3a61'
+down_revision = 'a4d3f2c8e915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fold duplicate (employee_id, date) rows into the lowest id before the
+    # unique index goes on: earliest check-in, latest check-out
+    op.execute(sa.text("""
+        UPDATE attendances SET
+            check_in_time = (SELECT MIN(a.check_in_time) FROM attendances a
+                             WHERE a.employee_id = attendances.employee_id AND a.date = attendances.date),
+            check_out_time = (SELECT MAX(a.check_out_time) FROM attendances a
+                              WHERE a.employee_id = attendances.employee_id AND a.date = attendances.date)
+        WHERE id IN (SELECT MIN(id) FROM attendances WHERE employee_id IS NOT NULL
+                     GROUP BY employee_id, date HAVING COUNT(*) > 1)
+    """))
+    op.execute(sa.text("""
+        DELETE FROM attendances
+        WHERE employee_id IS NOT NULL
+          AND id NOT IN (SELECT MIN(id) FROM attendances WHERE employee_id IS NOT NULL
+                         GROUP BY employee_id, date)
+    """))
+    op.create_index('ix_attendances_employee_id_date', 'attendances', ['employee_id', 'date'], unique=True)
+    op.create_index('ix_attendances_date', 'attendances', ['date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_attendances_date', table_name='attendances')
+    op.drop_index('ix_attendances_employee_id_date', table_name='attendances')
@@ -0,0 +1,60 @@
+"""review projections
+
+Revision ID: 7c1e4a9b2f30
+Revises: 32d892271291
+Create Date: 2026-10-18 13:40:12.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4a9b2f30'
+down_revision = '32d892271291'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('review_projections',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=True),
+    sa.Column('department_id', sa.Integer(), nullable=True),
+    sa.Column('job_title_id', sa.Integer(), nullable=True),
+    sa.Column('review_date', sa.DateTime(), nullable=True),
+    sa.Column('reviewer', sa.String(length=50), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('rating', sa.Integer(), nullable=True),
+    sa.Column('employee_name', sa.String(), nullable=True),
+    sa.Column('employee_job_title', sa.String(length=50), nullable=True),
+    sa.Column('employee_department', sa.String(length=50), nullable=True),
+    sa.ForeignKeyConstraint(['id'], ['performance_reviews.id'], name=op.f('fk_review_projections_id_performance_reviews'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_review_projections'))
+    )
+    with op.batch_alter_table('review_projections', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_review_projections_department_id'), ['department_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_review_projections_employee_id'), ['employee_id'], unique=False)
+
+    # Backfill from existing reviews
+    op.execute(
+        "INSERT INTO review_projections "
+        "(id, employee_id, department_id, job_title_id, review_date, reviewer, notes, rating, "
+        "employee_name, employee_job_title, employee_department) "
+        "SELECT performance_reviews.id, performance_reviews.employee_id, employees.department_id, "
+        "employees.job_title_id, performance_reviews.review_date, performance_reviews.reviewer, "
+        "performance_reviews.notes, performance_reviews.rating, "
+        "employees.first_name || ' ' || employees.last_name, job_titles.title, departments.name "
+        "FROM performance_reviews "
+        "LEFT OUTER JOIN employees ON performance_reviews.employee_id = employees.id "
+        "LEFT OUTER JOIN job_titles ON employees.job_title_id = job_titles.id "
+        "LEFT OUTER JOIN departments ON employees.department_id = departments.id"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('review_projections', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_review_projections_employee_id'))
+        batch_op.drop_index(batch_op.f('ix_review_projections_department_id'))
+
+    op.drop_table('review_projections')
@@ -0,0 +1,40 @@
+"""query indexes
+
+Revision ID: 9d4b6e1a7c52
+Revises: e2c7a5f1b804
+Create Date: 2026-10-18 21:12:40.517893
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4b6e1a7c52'
+down_revision = 'e2c7a5f1b804'
+branch_labels = None
+depends_on = None
+
+
+# Indexes behind the filters and foreign-key lookups the resources issue;
+# bench/plans.py fails when one of these queries falls back to a full scan
+INDEXES = [
+    ('employees', 'ix_employees_department_id', ['department_id']),
+    ('employees', 'ix_employees_user_type_id', ['user_type_id']),
+    ('employees', 'ix_employees_job_title_id', ['job_title_id']),
+    ('performance_reviews', 'ix_performance_reviews_employee_id', ['employee_id']),
+    ('review_projections', 'ix_review_projections_job_title_id', ['job_title_id']),
+    ('review_projections', 'ix_review_projections_review_date', ['review_date']),
+    ('attendance_months', 'ix_attendance_months_month_employee_id', ['month', 'employee_id']),
+    ('attendance_department_days', 'ix_attendance_department_days_date', ['date']),
+]
+
+
+def upgrade():
+    for table, name, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for table, name, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
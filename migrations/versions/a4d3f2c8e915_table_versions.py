@@ -0,0 +1,40 @@
+"""table versions
+
+Revision ID: a4d3f2c8e915
+Revises: 7c1e4a9b2f30
+Create Date: 2026-10-18 15:02:47.530118
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d3f2c8e915'
+down_revision = '7c1e4a9b2f30'
+branch_labels = None
+depends_on = None
+
+TRACKED_TABLES = [
+    'attendances', 'departments', 'employees', 'job_titles',
+    'performance_reviews', 'user_types',
+]
+
+
+def upgrade():
+    table_versions = op.create_table('table_versions',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name', name=op.f('pk_table_versions'))
+    )
+    now = datetime.now()
+    op.bulk_insert(table_versions, [
+        {'name': name, 'version': 1, 'updated_at': now} for name in TRACKED_TABLES
+    ])
+
+
+def downgrade():
+    op.drop_table('table_versions')
@@ -0,0 +1,74 @@
+"""attendance rollups
+
+Revision ID: e2c7a5f1b804
+Revises: 5b9e0d7c3a61
+Create Date: 2026-10-18 19:47:31.208415
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c7a5f1b804'
+down_revision = '5b9e0d7c3a61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    attendance_months = op.create_table('attendance_months',
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('department_id', sa.Integer(), nullable=True),
+    sa.Column('presence', sa.Integer(), nullable=False),
+    sa.Column('days_present', sa.Integer(), nullable=False),
+    sa.Column('minutes', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('employee_id', 'month', name=op.f('pk_attendance_months'))
+    )
+    op.create_index('ix_attendance_months_department_id_month', 'attendance_months', ['department_id', 'month'], unique=False)
+    attendance_department_days = op.create_table('attendance_department_days',
+    sa.Column('department_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('present', sa.Integer(), nullable=False),
+    sa.Column('minutes', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('department_id', 'date', name=op.f('pk_attendance_department_days'))
+    )
+
+    # Backfill from existing attendance
+    attendances = sa.table('attendances',
+        sa.column('employee_id', sa.Integer), sa.column('date', sa.Date),
+        sa.column('check_in_time', sa.Time), sa.column('check_out_time', sa.Time))
+    employees = sa.table('employees', sa.column('id', sa.Integer), sa.column('department_id', sa.Integer))
+
+    bind = op.get_bind()
+    departments = dict(bind.execute(sa.select(employees.c.id, employees.c.department_id)).all())
+    months, days = {}, {}
+    for employee_id, day, check_in, check_out in bind.execute(sa.select(attendances)):
+        if employee_id is None or (check_in is None and check_out is None):
+            continue
+        minutes = 0
+        if check_in is not None and check_out is not None:
+            minutes = max(0, (check_out.hour * 60 + check_out.minute) - (check_in.hour * 60 + check_in.minute))
+        department_id = departments.get(employee_id)
+        month = months.setdefault((employee_id, day.replace(day=1)), {
+            'employee_id': employee_id, 'month': day.replace(day=1), 'department_id': department_id,
+            'presence': 0, 'days_present': 0, 'minutes': 0})
+        month['presence'] |= 1 << (day.day - 1)
+        month['days_present'] += 1
+        month['minutes'] += minutes
+        if department_id is not None:
+            total = days.setdefault((department_id, day), {
+                'department_id': department_id, 'date': day, 'present': 0, 'minutes': 0})
+            total['present'] += 1
+            total['minutes'] += minutes
+    if months:
+        op.bulk_insert(attendance_months, list(months.values()))
+    if days:
+        op.bulk_insert(attendance_department_days, list(days.values()))
+
+
+def downgrade():
+    op.drop_table('attendance_department_days')
+    op.drop_index('ix_attendance_months_department_id_month', table_name='attendance_months')
+    op.drop_table('attendance_months')
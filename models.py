@@ -1,9 +1,15 @@
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import MetaData
-from sqlalchemy.orm import validates
+from sqlalchemy import MetaData, event, func, select, insert, update, delete, inspect, bindparam
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.orm import validates, joinedload, column_property
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy_serializer import SerializerMixin
 from datetime import datetime
+from flask import current_app
+from database import RoutingSession
+from hashing import DEFAULT_LOG_ROUNDS, hash_password, hash_many, check_password, needs_rehash
 import re
 
 # ===========================
@@ -18,7 +24,10 @@ convention = {
 }
 
 metadata = MetaData(naming_convention=convention)
-db = SQLAlchemy(metadata=metadata)
+db = SQLAlchemy(metadata=metadata, session_options={"class_": RoutingSession})
+
+def _log_rounds():
+    return current_app.config.get("BCRYPT_LOG_ROUNDS", DEFAULT_LOG_ROUNDS)
 
 # ===========================
 # Department
@@ -32,13 +41,7 @@ class Department(db.Model, SerializerMixin):
 
     employees = db.relationship('Employee', back_populates='department', cascade='all, delete-orphan')
 
-
-    @property
-    def manager_name(self):
-        manager = next((emp for emp in self.employees if emp.user_type_name == "Manager"), None)
-        if manager:
-            return f"{manager.first_name} {manager.last_name}"
-        return "N/A"
+    # manager_name is a column_property defined below Employee/UserType
 
     serialize_only = (
         "id",
@@ -91,9 +94,9 @@ class Employee(db.Model, SerializerMixin):
 
     password_hash = db.Column(db.String(128), nullable=False)
 
-    department_id = db.Column(db.Integer, db.ForeignKey('departments.id'))
-    user_type_id = db.Column(db.Integer, db.ForeignKey('user_types.id'))
-    job_title_id = db.Column(db.Integer, db.ForeignKey('job_titles.id'))
+    department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), index=True)
+    user_type_id = db.Column(db.Integer, db.ForeignKey('user_types.id'), index=True)
+    job_title_id = db.Column(db.Integer, db.ForeignKey('job_titles.id'), index=True)
 
     department = db.relationship('Department', back_populates='employees')
     user_type = db.relationship('UserType', back_populates='employees')
@@ -126,13 +129,32 @@ class Employee(db.Model, SerializerMixin):
         "-reviews.employee"
     )
 
+    # ==== Query building
+    # department_name / user_type_name / job_title_name are association proxies,
+    # so serializing an employee touches all three relationships. Load them up
+    # front: joinedload for single rows, selectinload for lists.
+    @classmethod
+    def related_options(cls, strategy=joinedload):
+        return [strategy(cls.department), strategy(cls.user_type), strategy(cls.job_title)]
+
+    @classmethod
+    def with_related(cls, strategy=joinedload):
+        return cls.query.options(*cls.related_options(strategy))
+
+    # bcrypt work runs on the hashing pool, see hashing.py
     def set_password(self, raw_password):
-        from flask_bcrypt import generate_password_hash
-        self.password_hash = generate_password_hash(raw_password).decode('utf-8')
+        self.password_hash = hash_password(raw_password, _log_rounds())
 
     def verify_password(self, raw_password):
-        from flask_bcrypt import check_password_hash
-        return check_password_hash(self.password_hash, raw_password)
+        return check_password(self.password_hash, raw_password)
+
+    def password_needs_rehash(self):
+        return needs_rehash(self.password_hash, _log_rounds())
+
+    @staticmethod
+    def hash_passwords(raw_passwords):
+        """Hash many passwords in parallel on the hashing pool (bulk imports)."""
+        return hash_many(raw_passwords, _log_rounds())
 
     @validates("email")
     def validate_email(self, key, value):
@@ -147,6 +169,11 @@ class Employee(db.Model, SerializerMixin):
 # ===========================
 class Attendance(db.Model, SerializerMixin):
     __tablename__ = 'attendances'
+    # One row per employee per day: punches are upserted on (employee_id, date)
+    __table_args__ = (
+        db.Index("ix_attendances_employee_id_date", "employee_id", "date", unique=True),
+        db.Index("ix_attendances_date", "date"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False)
@@ -156,6 +183,7 @@ class Attendance(db.Model, SerializerMixin):
     employee_id = db.Column(db.Integer, db.ForeignKey('employees.id'))
     employee = db.relationship('Employee', back_populates='attendances')
 
+    serialize_only = ("id", "employee_id", "date", "check_in_time", "check_out_time")
     serialize_rules = ("-employee.attendances",)
 
 # ===========================
@@ -170,7 +198,7 @@ class PerformanceReview(db.Model, SerializerMixin):
     notes = db.Column(db.Text)
     rating = db.Column(db.Integer)
 
-    employee_id = db.Column(db.Integer, db.ForeignKey('employees.id'))
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.id'), index=True)
     employee = db.relationship('Employee', back_populates='reviews')
 
     @property
@@ -198,3 +226,503 @@ class PerformanceReview(db.Model, SerializerMixin):
     )
 
     serialize_rules = ("-employee.reviews",)
+
+# ===========================
+# Review Projection (read model)
+# ===========================
+# One flattened row per performance review with the employee's name, job title
+# and department copied in, so review listings are a single scan with no joins.
+# Rows are written by the event hooks at the bottom of this module; never edit
+# them directly.
+class ReviewProjection(db.Model, SerializerMixin):
+    __tablename__ = 'review_projections'
+
+    id = db.Column(db.Integer, db.ForeignKey('performance_reviews.id', ondelete='CASCADE'), primary_key=True)
+    employee_id = db.Column(db.Integer, index=True)
+    department_id = db.Column(db.Integer, index=True)
+    job_title_id = db.Column(db.Integer, index=True)
+
+    review_date = db.Column(db.DateTime, index=True)
+    reviewer = db.Column(db.String(50))
+    notes = db.Column(db.Text)
+    rating = db.Column(db.Integer)
+
+    employee_name = db.Column(db.String)
+    employee_job_title = db.Column(db.String(50))
+    employee_department = db.Column(db.String(50))
+
+    serialize_only = PerformanceReview.serialize_only
+
+# ===========================
+# Attendance rollups (read models)
+# ===========================
+# attendance_months holds one row per employee per month: a presence bitmap
+# (bit 0 is the 1st of the month), days present and minutes worked.
+# attendance_department_days holds head count and minutes per department per
+# day; a department's month is the sum of its days. Both are adjusted by deltas
+# whenever an attendances row changes (see apply_attendance_changes); never
+# edit them directly.
+class AttendanceMonth(db.Model, SerializerMixin):
+    __tablename__ = 'attendance_months'
+    __table_args__ = (
+        db.Index("ix_attendance_months_department_id_month", "department_id", "month"),
+        db.Index("ix_attendance_months_month_employee_id", "month", "employee_id"),
+    )
+
+    employee_id = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Date, primary_key=True)  # first day of the month
+    department_id = db.Column(db.Integer)
+
+    presence = db.Column(db.Integer, nullable=False, default=0)
+    days_present = db.Column(db.Integer, nullable=False, default=0)
+    minutes = db.Column(db.Integer, nullable=False, default=0)
+
+    serialize_only = ("employee_id", "month", "department_id", "presence", "days_present", "minutes")
+
+
+class AttendanceDepartmentDay(db.Model, SerializerMixin):
+    __tablename__ = 'attendance_department_days'
+    __table_args__ = (
+        db.Index("ix_attendance_department_days_date", "date"),
+    )
+
+    department_id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+
+    present = db.Column(db.Integer, nullable=False, default=0)
+    minutes = db.Column(db.Integer, nullable=False, default=0)
+
+    serialize_only = ("department_id", "date", "present", "minutes")
+
+# ===========================
+# Employee search terms (read model)
+# ===========================
+# One row per distinct word of an employee's name, email (local part), job
+# title and department name, weighted by where it came from. Searches are
+# prefix range scans on term, which a plain B-tree serves on any database.
+# Rows are written by the event hooks further down; never edit them directly.
+class EmployeeSearchTerm(db.Model):
+    __tablename__ = 'employee_search_terms'
+    # Clustered on (term, employee_id) on SQLite, so a prefix scan reads the weights in place
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    term = db.Column(db.String(64), primary_key=True)
+    employee_id = db.Column(db.Integer, primary_key=True, index=True)
+    weight = db.Column(db.Integer, nullable=False)
+
+# ===========================
+# Table Versions (change tracking)
+# ===========================
+# One counter per table, bumped in the same transaction as any ORM write to that
+# table (see the session hooks below). Caches and HTTP validators compare these
+# counters instead of re-reading the data.
+class TableVersion(db.Model):
+    __tablename__ = 'table_versions'
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.now)
+
+# ===========================
+# Department.manager_name
+# ===========================
+# Resolved in SQL as a correlated subquery (first Manager by id), so listing
+# departments is one SELECT instead of loading every employee and user type.
+Department.manager_name = column_property(
+    func.coalesce(
+        select(Employee.first_name + " " + Employee.last_name)
+        .join(UserType, Employee.user_type_id == UserType.id)
+        .where(Employee.department_id == Department.id, UserType.name == "Manager")
+        .order_by(Employee.id)
+        .limit(1)
+        .correlate_except(Employee, UserType)
+        .scalar_subquery(),
+        "N/A",
+    )
+)
+
+# ===========================
+# Review projection sync
+# ===========================
+def _review_projection_source():
+    reviews = PerformanceReview.__table__
+    employees = Employee.__table__
+    job_titles = JobTitle.__table__
+    departments = Department.__table__
+    return (
+        select(
+            reviews.c.id,
+            reviews.c.employee_id,
+            employees.c.department_id,
+            employees.c.job_title_id,
+            reviews.c.review_date,
+            reviews.c.reviewer,
+            reviews.c.notes,
+            reviews.c.rating,
+            (employees.c.first_name + " " + employees.c.last_name).label("employee_name"),
+            job_titles.c.title.label("employee_job_title"),
+            departments.c.name.label("employee_department"),
+        )
+        .select_from(reviews)
+        .outerjoin(employees, reviews.c.employee_id == employees.c.id)
+        .outerjoin(job_titles, employees.c.job_title_id == job_titles.c.id)
+        .outerjoin(departments, employees.c.department_id == departments.c.id)
+    )
+
+
+def refresh_review_projection(connection, *criteria):
+    """Rebuild projection rows for reviews matching criteria (all rows if none).
+
+    criteria may reference performance_reviews, employees, job_titles or departments.
+    """
+    projection = ReviewProjection.__table__
+    source = _review_projection_source().where(*criteria)
+    connection.execute(delete(projection).where(projection.c.id.in_(select(source.subquery().c.id))))
+    connection.execute(insert(projection).from_select([c.name for c in projection.columns], source))
+
+
+def _changed(target, *keys):
+    state = inspect(target)
+    return any(state.attrs[key].history.has_changes() for key in keys)
+
+
+@event.listens_for(PerformanceReview, "after_insert")
+@event.listens_for(PerformanceReview, "after_update")
+def _sync_review(mapper, connection, target):
+    refresh_review_projection(connection, PerformanceReview.__table__.c.id == target.id)
+
+
+@event.listens_for(PerformanceReview, "before_delete")
+def _drop_review(mapper, connection, target):
+    projection = ReviewProjection.__table__
+    connection.execute(delete(projection).where(projection.c.id == target.id))
+
+
+@event.listens_for(Employee, "after_update")
+def _sync_employee_reviews(mapper, connection, target):
+    if _changed(target, "first_name", "last_name", "department_id", "job_title_id", "department", "job_title"):
+        refresh_review_projection(connection, PerformanceReview.__table__.c.employee_id == target.id)
+
+
+@event.listens_for(Department, "after_update")
+def _sync_department_reviews(mapper, connection, target):
+    if _changed(target, "name"):
+        refresh_review_projection(connection, Employee.__table__.c.department_id == target.id)
+
+
+@event.listens_for(JobTitle, "after_update")
+def _sync_job_title_reviews(mapper, connection, target):
+    if _changed(target, "title"):
+        refresh_review_projection(connection, Employee.__table__.c.job_title_id == target.id)
+
+# ===========================
+# Employee search sync
+# ===========================
+# Terms are lowercased runs of letters and digits. Names outrank email words,
+# which outrank job title and department words; an employee keeps the best
+# weight for each distinct term.
+SEARCH_WEIGHTS = {"first_name": 3, "last_name": 3, "email": 2, "job_title": 1, "department": 1}
+SEARCH_TERM_LENGTH = 64
+
+
+def search_terms(text):
+    return [term[:SEARCH_TERM_LENGTH] for term in re.findall(r"\w+", (text or "").lower())]
+
+
+def _employee_search_source():
+    employees = Employee.__table__
+    job_titles = JobTitle.__table__
+    departments = Department.__table__
+    return (
+        select(
+            employees.c.id,
+            employees.c.first_name,
+            employees.c.last_name,
+            employees.c.email,
+            job_titles.c.title.label("job_title"),
+            departments.c.name.label("department"),
+        )
+        .select_from(employees)
+        .outerjoin(job_titles, employees.c.job_title_id == job_titles.c.id)
+        .outerjoin(departments, employees.c.department_id == departments.c.id)
+    )
+
+
+def _employee_terms(row):
+    weights = {}
+    for field, weight in SEARCH_WEIGHTS.items():
+        text = getattr(row, field)
+        if field == "email":
+            text = (text or "").split("@")[0]  # everyone shares the domain
+        for term in search_terms(text):
+            weights[term] = max(weights.get(term, 0), weight)
+    return [{"term": term, "employee_id": row.id, "weight": weight} for term, weight in weights.items()]
+
+
+def refresh_employee_search(connection, *criteria, batch_size=10000):
+    """Rebuild search terms for employees matching criteria (everyone if none).
+
+    criteria may reference employees, job_titles or departments.
+    """
+    terms = EmployeeSearchTerm.__table__
+    source = _employee_search_source().where(*criteria)
+    if criteria:
+        connection.execute(delete(terms).where(terms.c.employee_id.in_(select(source.subquery().c.id))))
+    else:
+        connection.execute(delete(terms))
+    rows = connection.execution_options(yield_per=batch_size).execute(source)
+    batch = []
+    for row in rows:
+        batch.extend(_employee_terms(row))
+        if len(batch) >= batch_size:
+            connection.execute(insert(terms), batch)
+            batch = []
+    if batch:
+        connection.execute(insert(terms), batch)
+
+
+# New employees are indexed once per flush rather than per row, so bulk
+# imports cost one extra SELECT and INSERT per chunk
+@event.listens_for(Session, "after_flush")
+def _index_new_employees(session, flush_context):
+    ids = [obj.id for obj in session.new if isinstance(obj, Employee)]
+    for chunk in _chunks(ids):
+        refresh_employee_search(session.connection(), Employee.__table__.c.id.in_(chunk))
+
+
+@event.listens_for(Employee, "after_update")
+def _reindex_employee(mapper, connection, target):
+    if _changed(target, "first_name", "last_name", "email", "department_id", "job_title_id", "department", "job_title"):
+        refresh_employee_search(connection, Employee.__table__.c.id == target.id)
+
+
+@event.listens_for(Employee, "after_delete")
+def _unindex_employee(mapper, connection, target):
+    terms = EmployeeSearchTerm.__table__
+    connection.execute(delete(terms).where(terms.c.employee_id == target.id))
+
+
+@event.listens_for(Department, "after_update")
+def _reindex_department(mapper, connection, target):
+    if _changed(target, "name"):
+        refresh_employee_search(connection, Employee.__table__.c.department_id == target.id)
+
+
+@event.listens_for(JobTitle, "after_update")
+def _reindex_job_title(mapper, connection, target):
+    if _changed(target, "title"):
+        refresh_employee_search(connection, Employee.__table__.c.job_title_id == target.id)
+
+# ===========================
+# Attendance rollup maintenance
+# ===========================
+# A change is (employee_id, date, old, new) where old/new are the row's
+# (check_in_time, check_out_time), or None when there is no row. Changes are
+# folded into per-month and per-department-day deltas in Python, then applied
+# as "insert if missing" plus one executemany UPDATE per rollup table.
+_DIALECT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def dialect_insert(connection, table):
+    """An INSERT that supports ON CONFLICT (SQLite and PostgreSQL)."""
+    insert_ = _DIALECT_INSERTS.get(connection.dialect.name)
+    if insert_ is None:
+        raise NotImplementedError(f"ON CONFLICT inserts are not implemented for {connection.dialect.name}")
+    return insert_(table)
+
+
+def attendance_minutes(check_in, check_out):
+    if check_in is None or check_out is None:
+        return 0
+    return max(0, (check_out.hour * 60 + check_out.minute) - (check_in.hour * 60 + check_in.minute))
+
+
+def _attendance_state(times):
+    if times is None:
+        return False, 0
+    return times[0] is not None or times[1] is not None, attendance_minutes(*times)
+
+
+def _chunks(items, size=500):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _rollup_deltas(changes, departments, months=None, days=None):
+    months = {} if months is None else months  # (employee_id, month) -> delta
+    days = {} if days is None else days  # (department_id, date) -> [present, minutes]
+    for employee_id, day, old, new in changes:
+        was_present, old_minutes = _attendance_state(old)
+        is_present, new_minutes = _attendance_state(new)
+        if (was_present, old_minutes) == (is_present, new_minutes):
+            continue
+        department_id = departments.get(employee_id)
+        bit = 1 << (day.day - 1)
+
+        month = months.get((employee_id, day.replace(day=1)))
+        if month is None:
+            month = months[(employee_id, day.replace(day=1))] = {
+                "department_id": department_id, "set": 0, "clear": 0, "days": 0, "minutes": 0}
+        if is_present and not was_present:
+            month["set"], month["clear"] = month["set"] | bit, month["clear"] & ~bit
+        elif was_present and not is_present:
+            month["set"], month["clear"] = month["set"] & ~bit, month["clear"] | bit
+        month["days"] += is_present - was_present
+        month["minutes"] += new_minutes - old_minutes
+
+        if department_id is not None:
+            totals = days.setdefault((department_id, day), [0, 0])
+            totals[0] += is_present - was_present
+            totals[1] += new_minutes - old_minutes
+    return months, days
+
+
+def _write_rollups(connection, months, days):
+    if months:
+        table = AttendanceMonth.__table__
+        for chunk in _chunks(months.items(), 5000):
+            connection.execute(dialect_insert(connection, table).on_conflict_do_nothing(), [
+                {"employee_id": employee_id, "month": month, "department_id": delta["department_id"]}
+                for (employee_id, month), delta in chunk
+            ])
+            # department_id follows the employee: the latest change in the month
+            # files the row under their current department
+            connection.execute(
+                update(table)
+                .where(table.c.employee_id == bindparam("b_employee_id"), table.c.month == bindparam("b_month"))
+                .values(
+                    department_id=bindparam("b_department_id"),
+                    presence=table.c.presence.bitwise_or(bindparam("b_set")).bitwise_and(bindparam("b_keep")),
+                    days_present=table.c.days_present + bindparam("b_days"),
+                    minutes=table.c.minutes + bindparam("b_minutes"),
+                ),
+                [
+                    {"b_employee_id": employee_id, "b_month": month, "b_department_id": delta["department_id"],
+                     "b_set": delta["set"], "b_keep": ~delta["clear"], "b_days": delta["days"],
+                     "b_minutes": delta["minutes"]}
+                    for (employee_id, month), delta in chunk
+                ],
+            )
+    if days:
+        table = AttendanceDepartmentDay.__table__
+        for chunk in _chunks(days.items(), 5000):
+            connection.execute(dialect_insert(connection, table).on_conflict_do_nothing(), [
+                {"department_id": department_id, "date": day} for (department_id, day), _ in chunk
+            ])
+            connection.execute(
+                update(table)
+                .where(table.c.department_id == bindparam("b_department_id"), table.c.date == bindparam("b_date"))
+                .values(present=table.c.present + bindparam("b_present"), minutes=table.c.minutes + bindparam("b_minutes")),
+                [
+                    {"b_department_id": department_id, "b_date": day, "b_present": present, "b_minutes": minutes}
+                    for (department_id, day), (present, minutes) in chunk
+                ],
+            )
+
+
+def apply_attendance_changes(connection, changes):
+    """Adjust the attendance rollups for changed attendances rows."""
+    changes = list(changes)
+    employees = Employee.__table__
+    departments = {}
+    for chunk in _chunks({change[0] for change in changes}):
+        departments.update(connection.execute(
+            select(employees.c.id, employees.c.department_id).where(employees.c.id.in_(chunk))
+        ).all())
+    _write_rollups(connection, *_rollup_deltas(changes, departments))
+
+
+def rebuild_attendance_rollups(connection, batch_size=10000):
+    """Recompute both rollup tables from attendances (after bulk loads)."""
+    connection.execute(delete(AttendanceMonth.__table__))
+    connection.execute(delete(AttendanceDepartmentDay.__table__))
+    employees, attendances = Employee.__table__, Attendance.__table__
+    departments = dict(connection.execute(select(employees.c.id, employees.c.department_id)).all())
+    rows = connection.execution_options(yield_per=batch_size).execute(select(
+        attendances.c.employee_id, attendances.c.date, attendances.c.check_in_time, attendances.c.check_out_time,
+    ))
+    months, days = {}, {}
+    for employee_id, day, check_in, check_out in rows:
+        _rollup_deltas([(employee_id, day, None, (check_in, check_out))], departments, months, days)
+    _write_rollups(connection, months, days)
+
+
+def _previous(target, key):
+    history = inspect(target).attrs[key].history
+    return history.deleted[0] if history.deleted else getattr(target, key)
+
+
+@event.listens_for(Attendance, "after_insert")
+def _roll_up_new_attendance(mapper, connection, target):
+    apply_attendance_changes(connection, [
+        (target.employee_id, target.date, None, (target.check_in_time, target.check_out_time))])
+
+
+@event.listens_for(Attendance, "after_update")
+def _roll_up_corrected_attendance(mapper, connection, target):
+    old_key = (_previous(target, "employee_id"), _previous(target, "date"))
+    old = (_previous(target, "check_in_time"), _previous(target, "check_out_time"))
+    new = (target.check_in_time, target.check_out_time)
+    if old_key == (target.employee_id, target.date):
+        apply_attendance_changes(connection, [(*old_key, old, new)])
+    else:
+        apply_attendance_changes(connection, [(*old_key, old, None), (target.employee_id, target.date, None, new)])
+
+
+@event.listens_for(Attendance, "after_delete")
+def _roll_up_deleted_attendance(mapper, connection, target):
+    old_key = (_previous(target, "employee_id"), _previous(target, "date"))
+    old = (_previous(target, "check_in_time"), _previous(target, "check_out_time"))
+    apply_attendance_changes(connection, [(*old_key, old, None)])
+
+# ===========================
+# Table version tracking
+# ===========================
+def bump_table_versions(connection, tables):
+    versions = TableVersion.__table__
+    now = datetime.now()
+    for name in sorted(tables):
+        result = connection.execute(
+            update(versions)
+            .where(versions.c.name == name)
+            .values(version=versions.c.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(versions).values(name=name, version=1, updated_at=now))
+
+
+def _touch(session, tables):
+    tables = set(tables) - {TableVersion.__tablename__}
+    if tables:
+        bump_table_versions(session.connection(), tables)
+        session.info.setdefault("touched_tables", set()).update(tables)
+
+
+# Columns no payload, ETag or cache reads; an update that changes nothing else
+# (the password rehash on login) leaves the table version alone
+UNVERSIONED_COLUMNS = {"employees": {"password_hash"}}
+
+
+def _versioned_change(session, obj):
+    if not session.is_modified(obj):
+        return False
+    unversioned = UNVERSIONED_COLUMNS.get(obj.__table__.name)
+    if not unversioned:
+        return True
+    return any(attr.history.has_changes() for attr in inspect(obj).attrs if attr.key not in unversioned)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_tables(session, flush_context):
+    objects = set(session.new) | set(session.deleted)
+    objects.update(obj for obj in session.dirty if _versioned_change(session, obj))
+    _touch(session, {obj.__table__.name for obj in objects})
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state):
+    # Query.update()/delete() and ORM bulk inserts bypass the flush
+    if (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert) \
+            and orm_execute_state.bind_mapper is not None:
+        _touch(orm_execute_state.session, {orm_execute_state.bind_mapper.local_table.name})
@@ -0,0 +1,167 @@
+import base64
+import json
+from datetime import date, datetime, timedelta
+from urllib.parse import urlencode
+
+from flask import request
+from flask_restful import abort
+from sqlalchemy import DateTime
+
+# ===========================
+# Keyset (cursor) pagination
+# ===========================
+# Pagination is opt-in: without ?limit= or ?cursor= a list endpoint still returns
+# every row. Pages are ordered by an indexed key and the cursor encodes the last
+# key seen, so page N costs the same as page 1 (no OFFSET scan).
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(value):
+    raw = json.dumps({"k": value}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, key):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode()))["k"]
+    except (ValueError, KeyError, TypeError):
+        abort(400, error="Invalid cursor")
+    # Cursors come back from clients: anything but a value of the key's type
+    # would reach the query
+    if not _matches_key(value, key):
+        abort(400, error="Invalid cursor")
+    return value
+
+
+def _matches_key(value, key):
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return False
+    try:
+        expected = key.type.python_type
+    except NotImplementedError:
+        return True
+    if expected is int:
+        return isinstance(value, int)
+    if expected is float:
+        return isinstance(value, (int, float))
+    if expected is str:
+        return isinstance(value, str)
+    return True
+
+
+def keyset(query, key, default_limit=None):
+    """Order query by key and apply ?cursor= / ?limit=.
+
+    Returns (query, limit). limit is None when the client did not ask for
+    pagination (and there is no default_limit); otherwise the query fetches
+    limit + 1 rows so the caller can tell whether there is a next page.
+    """
+    query = query.order_by(key)
+    cursor = request.args.get("cursor")
+    limit = int_arg("limit")
+    if limit is None and cursor is None and default_limit is None:
+        return query, None
+
+    if limit is None:
+        limit = default_limit or DEFAULT_PAGE_SIZE
+    if limit < 1:
+        abort(400, error="limit must be a positive integer")
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    if cursor is not None:
+        query = query.filter(key > decode_cursor(cursor, key))
+    return query.limit(limit + 1), limit
+
+
+def paginate(query, key, default_limit=None):
+    """Run a keyset-paginated query. Returns (items, headers).
+
+    When there are more rows, headers carry the opaque cursor for the next page
+    in X-Next-Cursor and as a Link rel="next" URL. default_limit makes
+    pagination mandatory (for endpoints that must never return every row).
+    """
+    query, limit = keyset(query, key, default_limit)
+    items = query.all()
+    if limit is None or len(items) <= limit:
+        return items, {}
+
+    items = items[:limit]
+    next_cursor = encode_cursor(getattr(items[-1], key.key))
+    args = request.args.to_dict()
+    args["cursor"] = next_cursor
+    return items, {
+        "X-Next-Cursor": next_cursor,
+        "Link": f'<{request.base_url}?{urlencode(args)}>; rel="next"',
+    }
+
+
+# ===========================
+# Query-string filters
+# ===========================
+def int_arg(name):
+    value = request.args.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        abort(400, error=f"{name} must be an integer")
+
+
+def fields_arg(allowed):
+    """?fields=a,b (sparse fieldset) as a tuple in the order of allowed.
+
+    None when absent; unknown names are a 400 listing what can be asked for.
+    """
+    value = request.args.get("fields")
+    requested = {name.strip() for name in (value or "").split(",") if name.strip()}
+    if not requested:
+        return None
+    unknown = requested.difference(allowed)
+    if unknown:
+        abort(400, error=f"Unknown fields: {', '.join(sorted(unknown))}. Available: {', '.join(allowed)}")
+    return tuple(name for name in allowed if name in requested)
+
+
+def pick_fields(item, fields):
+    """A serialized dict cut down to fields (from fields_arg); all of it for None."""
+    return item if fields is None else {name: item[name] for name in fields}
+
+
+def date_arg(name):
+    value = request.args.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        abort(400, error=f"{name} must be a date (YYYY-MM-DD)")
+
+
+def month_arg(name):
+    """?name=YYYY-MM as the first day of that month."""
+    value = request.args.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return date.fromisoformat(f"{value}-01")
+    except ValueError:
+        abort(400, error=f"{name} must be a month (YYYY-MM)")
+
+
+def date_range(column, start, end):
+    """Criteria for a Date or DateTime column falling on or between two dates."""
+    criteria = []
+    if not isinstance(column.type, DateTime):
+        if start is not None:
+            criteria.append(column >= start)
+        if end is not None:
+            criteria.append(column <= end)
+        return criteria
+    if start is not None:
+        criteria.append(column >= datetime.combine(start, datetime.min.time()))
+    if end is not None:
+        criteria.append(column < datetime.combine(end + timedelta(days=1), datetime.min.time()))
+    return criteria
@@ -0,0 +1,175 @@
+import threading
+from datetime import datetime
+
+from sqlalchemy import case, select, tuple_
+
+from models import db, Attendance, apply_attendance_changes, bump_table_versions, dialect_insert
+
+# ===========================
+# Attendance punch ingestion
+# ===========================
+# A punch is (employee_id, "in" | "out", timestamp). Punches fold into the one
+# attendances row per (employee_id, date): the earliest "in" is the check-in,
+# the latest "out" the check-out. Folding is order-independent and replaying a
+# punch changes nothing, so badge readers can retry freely.
+#
+# Punches are coalesced per (employee_id, date) in memory and written with a
+# single INSERT ... ON CONFLICT DO UPDATE executemany. Concurrent requests in
+# the same process share writes (group commit): whichever request finds no
+# write in progress writes everything queued so far in one transaction while
+# the others wait for it, so a burst of single punches at shift start turns
+# into a few large upserts instead of one transaction per punch. Each write
+# also moves the attendance rollups (models.py) by the before/after difference
+# of the rows it touched. If a shared write fails, each request's punches are
+# retried in a transaction of their own, so one bad request cannot fail the
+# others. Each app has its own writer (init_punch_writer).
+PUNCH_TYPES = ("in", "out")
+
+
+def parse_punch(item):
+    """Return (employee_id, type, timestamp) or raise ValueError."""
+    try:
+        employee_id = int(item["employee_id"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("employee_id must be an integer")
+    punch_type = item.get("type")
+    if punch_type not in PUNCH_TYPES:
+        raise ValueError("type must be 'in' or 'out'")
+    try:
+        timestamp = datetime.fromisoformat(item["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("timestamp must be an ISO 8601 date-time")
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone().replace(tzinfo=None)  # stored as local time
+    return employee_id, punch_type, timestamp
+
+
+def coalesce(punches, rows):
+    """Fold (employee_id, type, timestamp) punches into {(employee_id, date): row}."""
+    for employee_id, punch_type, timestamp in punches:
+        key = (employee_id, timestamp.date())
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = {"employee_id": employee_id, "date": key[1],
+                               "check_in_time": None, "check_out_time": None}
+        value = timestamp.time()
+        if punch_type == "in":
+            if row["check_in_time"] is None or value < row["check_in_time"]:
+                row["check_in_time"] = value
+        elif row["check_out_time"] is None or value > row["check_out_time"]:
+            row["check_out_time"] = value
+    return rows
+
+
+def _earliest(a, b):
+    return b if a is None or (b is not None and b < a) else a
+
+
+def _latest(a, b):
+    return b if a is None or (b is not None and b > a) else a
+
+
+def _existing(connection, keys):
+    table = Attendance.__table__
+    key = tuple_(table.c.employee_id, table.c.date)
+    keys, found = list(keys), {}
+    for start in range(0, len(keys), 500):
+        rows = connection.execute(
+            select(table.c.employee_id, table.c.date, table.c.check_in_time, table.c.check_out_time)
+            .where(key.in_(keys[start:start + 500]))
+        )
+        found.update(((employee_id, day), (check_in, check_out)) for employee_id, day, check_in, check_out in rows)
+    return found
+
+
+def upsert_attendance(connection, rows):
+    """Write coalesced {(employee_id, date): row}, keeping the earliest check-in
+    and latest check-out, and roll the changes up."""
+    # Bump first: on SQLite that takes the write lock, so the rows read below
+    # cannot change before the upsert
+    bump_table_versions(connection, ["attendances"])
+    before = _existing(connection, rows.keys())
+
+    table = Attendance.__table__
+    stmt = dialect_insert(connection, table)
+    current_in, new_in = table.c.check_in_time, stmt.excluded.check_in_time
+    current_out, new_out = table.c.check_out_time, stmt.excluded.check_out_time
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.employee_id, table.c.date],
+        set_={
+            "check_in_time": case((current_in.is_(None) | (new_in < current_in), new_in), else_=current_in),
+            "check_out_time": case((current_out.is_(None) | (new_out > current_out), new_out), else_=current_out),
+        },
+    )
+    connection.execute(stmt, list(rows.values()))
+
+    changes = []
+    for key, row in rows.items():
+        old = before.get(key)
+        new = (row["check_in_time"], row["check_out_time"]) if old is None else (
+            _earliest(old[0], row["check_in_time"]), _latest(old[1], row["check_out_time"]))
+        changes.append((*key, old, new))
+    apply_attendance_changes(connection, changes)
+
+
+class _Job:
+    __slots__ = ("punches", "done", "error")
+
+    def __init__(self, punches):
+        self.punches = punches
+        self.done = False
+        self.error = None
+
+
+class PunchWriter:
+    """Group commit: one writer at a time takes every punch queued so far."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = []
+        self._writing = False
+
+    def write(self, punches):
+        """Durably apply parsed punches; returns once they are committed."""
+        job = _Job(punches)
+        with self._cond:
+            self._pending.append(job)
+            while self._writing and not job.done:
+                self._cond.wait()
+            leader = not job.done
+            if leader:
+                self._writing = True
+                batch, self._pending = self._pending, []
+
+        if leader:
+            error = self._apply(batch)
+            if error is not None and len(batch) > 1:
+                errors = [self._apply([queued]) for queued in batch]
+            else:
+                errors = [error] * len(batch)
+            with self._cond:
+                for queued, error in zip(batch, errors):
+                    queued.done, queued.error = True, error
+                self._writing = False
+                self._cond.notify_all()
+
+        if job.error is not None:
+            raise job.error
+
+    @staticmethod
+    def _apply(jobs):
+        """Write jobs in one transaction; returns the exception if it failed."""
+        try:
+            rows = {}
+            for job in jobs:
+                coalesce(job.punches, rows)
+            upsert_attendance(db.session.connection(), rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return e
+        return None
+
+
+def init_punch_writer(app):
+    app.extensions["punch_writer"] = PunchWriter()
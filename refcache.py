@@ -0,0 +1,153 @@
+import os
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from werkzeug.local import LocalProxy
+
+from models import db, TableVersion, UserType, JobTitle, Department
+
+# ===========================
+# Versioned in-process cache
+# ===========================
+# Entries are tagged with the table_versions counters of the tables they were
+# built from. Hits cost no queries: the counters themselves are re-read at most
+# once every REFDATA_CACHE_TTL_SECONDS, which is how separate worker processes
+# notice each other's writes. Commits made by this process force a re-read on
+# the next lookup, so a worker always sees its own writes immediately.
+#
+# Each app has its own cache (app.extensions["refcache"], see init_refcache):
+# apps built by create_app() may point at different databases.
+CACHE_TTL_SECONDS = float(os.environ.get("REFDATA_CACHE_TTL_SECONDS", 5))
+# Oldest entries are dropped beyond this many (query-dependent keys can pile up)
+CACHE_MAX_ENTRIES = int(os.environ.get("REFDATA_CACHE_MAX_ENTRIES", 1024))
+
+
+class VersionedCache:
+    def __init__(self, ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}  # key -> (versions, value)
+        self._versions = {}  # table name -> version
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def versions(self, tables):
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at > self.ttl:
+            rows = db.session.query(TableVersion.name, TableVersion.version).all()
+            self._versions = dict(rows)
+            self._checked_at = now
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+    def observe(self, versions):
+        """Take table versions read elsewhere (conditional.py's ETag), so a body
+        built for this request is never older than its ETag."""
+        with self._lock:
+            for table, version in versions.items():
+                if version > self._versions.get(table, 0):
+                    self._versions[table] = version
+
+    def get(self, key, tables, build):
+        """Return the cached value for key, rebuilding it if any table changed."""
+        versions = self.versions(tables)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == versions:
+            return entry[1]
+        value = build()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (versions, value)
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        return value
+
+    def expire(self):
+        """Re-read table versions on the next lookup."""
+        self._checked_at = None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self.expire()
+
+
+def init_refcache(app):
+    app.extensions["refcache"] = VersionedCache()
+
+
+# The current app's cache
+cache = LocalProxy(lambda: current_app.extensions["refcache"])
+
+
+@event.listens_for(Session, "after_commit")
+def _expire_after_local_commit(session):
+    if session.info.pop("touched_tables", None) and has_app_context():
+        cache.expire()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_tables(session):
+    session.info.pop("touched_tables", None)
+
+
+# ===========================
+# Reference data lookups
+# ===========================
+# UserType, JobTitle and Department are small and rarely change; keep the whole
+# table in memory keyed by id and by name.
+Ref = namedtuple("Ref", "id name")
+
+_REFERENCE_TABLES = {
+    UserType: UserType.name,
+    JobTitle: JobTitle.title,
+    Department: Department.name,
+}
+
+
+def _reference_table(model):
+    name_column = _REFERENCE_TABLES[model]
+
+    def build():
+        refs = [Ref(id, name) for id, name in db.session.query(model.id, name_column).all()]
+        return {r.id: r for r in refs}, {r.name: r for r in refs}
+
+    return cache.get(("ref", model.__tablename__), (model.__tablename__,), build)
+
+
+# The cache can be REFDATA_CACHE_TTL_SECONDS behind rows other workers added.
+# Reads can live with that; a write that would reject a request or insert a
+# duplicate passes confirm_miss=True to check a miss against the database.
+def _confirm_miss(model, condition):
+    row = db.session.query(model.id, _REFERENCE_TABLES[model]).filter(condition).first()
+    if row is None:
+        return None
+    cache.expire()  # another worker changed the table; re-read versions next time
+    return Ref(*row)
+
+
+def ref_by_id(model, id, confirm_miss=False):
+    try:
+        id = int(id)
+    except (TypeError, ValueError):
+        return None
+    ref = _reference_table(model)[0].get(id)
+    if ref is None and confirm_miss:
+        ref = _confirm_miss(model, model.id == id)
+    return ref
+
+
+def ref_by_name(model, name, confirm_miss=False):
+    ref = _reference_table(model)[1].get(name)
+    if ref is None and confirm_miss:
+        ref = _confirm_miss(model, _REFERENCE_TABLES[model] == name)
+    return ref
+
+
+def warm_reference_data():
+    """Load every reference table (process start-up, before taking traffic)."""
+    for model in _REFERENCE_TABLES:
+        _reference_table(model)
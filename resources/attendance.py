@@ -0,0 +1,205 @@
+import calendar
+from datetime import date
+
+from flask import current_app, make_response, request
+from flask_restful import Resource
+from flask_jwt_extended import jwt_required
+from identity import current_user
+from models import db, Attendance, AttendanceDepartmentDay, AttendanceMonth, Department, Employee
+from pagination import paginate, int_arg, date_arg, date_range, month_arg, fields_arg
+from refcache import ref_by_id
+from streaming import stream, wants_stream
+from serializers import serializer_for, loader_options
+from conditional import conditional
+from punches import parse_punch
+
+serialize_attendance = serializer_for(Attendance)
+
+
+# Tables an attendance listing depends on (department scoping reads employees)
+ATTENDANCE_TABLES = ("attendances", "employees")
+
+# Server-side filters: ?employee_id= &from_date= &to_date= (YYYY-MM-DD, inclusive)
+def filter_attendance(query):
+    employee_id = int_arg("employee_id")
+    if employee_id is not None:
+        query = query.filter(Attendance.employee_id == employee_id)
+    return query.filter(*date_range(Attendance.date, date_arg("from_date"), date_arg("to_date")))
+
+# ========== ATTENDANCE LIST ==========
+class AttendanceListResource(Resource):
+    @jwt_required()
+    @conditional(*ATTENDANCE_TABLES)
+    def get(self):
+        user = current_user()
+        # ?fields= narrows both the payload and the SELECT
+        fields = fields_arg(Attendance.serialize_only) or Attendance.serialize_only
+        serialize = serializer_for(Attendance, fields)
+        query = Attendance.query.options(*loader_options(Attendance, fields))
+
+        # HR sees everyone, Managers their department, Employees themselves
+        if user.user_type_name == "Manager":
+            query = query.join(Employee, Attendance.employee_id == Employee.id) \
+                .filter(Employee.department_id == user.department_id)
+        elif user.user_type_name != "HR":
+            query = query.filter(Attendance.employee_id == user.id)
+
+        if wants_stream():
+            return stream(filter_attendance(query), Attendance.id, serialize)
+
+        records, headers = paginate(filter_attendance(query), Attendance.id)
+        return make_response([serialize(a) for a in records], 200, headers)
+
+# ========== PUNCH INGESTION ==========
+# POST /attendance/punches with one punch {employee_id, type: "in"|"out",
+# timestamp} or an array of them (or {"punches": [...]}). Employees punch for
+# themselves (employee_id may be omitted), Managers for their department, HR
+# for anyone. Punches are idempotent: see punches.py.
+MAX_PUNCHES = 10000
+
+class AttendancePunchResource(Resource):
+    @jwt_required()
+    def post(self):
+        user = current_user()
+        data = request.get_json(silent=True)
+        single = isinstance(data, dict) and "punches" not in data
+        items = [data] if single else (data.get("punches") if isinstance(data, dict) else data)
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return make_response({"error": "Expected a punch or a JSON array of punches"}, 400)
+        if len(items) > MAX_PUNCHES:
+            return make_response({"error": f"At most {MAX_PUNCHES} punches per request"}, 413)
+
+        results = [None] * len(items)
+        def fail(index, message):
+            results[index] = {"row": index, "status": "error", "error": message}
+
+        punches = {}
+        for i, item in enumerate(items):
+            if user.user_type_name not in ["HR", "Manager"]:
+                item.setdefault("employee_id", user.id)
+            try:
+                punches[i] = parse_punch(item)
+            except ValueError as e:
+                fail(i, str(e))
+
+        # Who may punch for whom, in one query
+        requested = {employee_id for employee_id, _, _ in punches.values()}
+        if user.user_type_name == "HR":
+            allowed = {id for (id,) in db.session.query(Employee.id).filter(Employee.id.in_(requested))}
+        elif user.user_type_name == "Manager":
+            allowed = {id for (id,) in db.session.query(Employee.id)
+                       .filter(Employee.id.in_(requested), Employee.department_id == user.department_id)}
+        else:
+            allowed = {user.id}
+
+        for i, punch in list(punches.items()):
+            if punch[0] not in allowed:
+                fail(i, "Forbidden: Employee not found or not yours to record")
+                del punches[i]
+
+        if single and results[0] is not None:
+            code = 403 if results[0]["error"].startswith("Forbidden") else 400
+            return make_response({"error": results[0]["error"]}, code)
+        if not punches:
+            return make_response({"accepted": 0, "rejected": len(items), "results": results}, 400)
+
+        current_app.extensions["punch_writer"].write(list(punches.values()))
+
+        if single:
+            employee_id, _, timestamp = punches[0]
+            record = Attendance.query.filter_by(employee_id=employee_id, date=timestamp.date()).first()
+            return make_response(serialize_attendance(record), 200)
+
+        for i in punches:
+            results[i] = {"row": i, "status": "accepted"}
+        return make_response({"accepted": len(punches), "rejected": len(items) - len(punches), "results": results}, 200)
+
+# ========== MONTHLY CALENDARS ==========
+# GET /attendance/calendar?month=YYYY-MM (default: this month) from the
+# attendance_months rollup: one row per employee with a presence bitmap (bit 0
+# is the 1st), the same as a "1"/"0" string per day, days present and minutes.
+# Employees get their own row, Managers their department, HR any
+# ?department_id= / ?employee_id= (or everyone, paginated).
+def month_bounds(month):
+    return month, month.replace(day=calendar.monthrange(month.year, month.month)[1])
+
+class AttendanceCalendarResource(Resource):
+    @jwt_required()
+    @conditional("attendances", "employees")
+    def get(self):
+        user = current_user()
+        month = month_arg("month") or date.today().replace(day=1)
+
+        query = db.session.query(
+            AttendanceMonth.employee_id,
+            (Employee.first_name + " " + Employee.last_name).label("employee_name"),
+            AttendanceMonth.department_id,
+            AttendanceMonth.presence,
+            AttendanceMonth.days_present,
+            AttendanceMonth.minutes,
+        ).outerjoin(Employee, AttendanceMonth.employee_id == Employee.id).filter(AttendanceMonth.month == month)
+
+        if user.user_type_name == "HR":
+            department_id, employee_id = int_arg("department_id"), int_arg("employee_id")
+            if department_id is not None:
+                query = query.filter(AttendanceMonth.department_id == department_id)
+            if employee_id is not None:
+                query = query.filter(AttendanceMonth.employee_id == employee_id)
+        elif user.user_type_name == "Manager":
+            query = query.filter(AttendanceMonth.department_id == user.department_id)
+        else:
+            query = query.filter(AttendanceMonth.employee_id == user.id)
+
+        rows, headers = paginate(query, AttendanceMonth.employee_id)
+        days = month_bounds(month)[1].day
+        return make_response([{
+            "employee_id": row.employee_id,
+            "employee_name": row.employee_name,
+            "department_id": row.department_id,
+            "month": month.strftime("%Y-%m"),
+            "presence": row.presence,
+            "days": "".join("1" if row.presence >> day & 1 else "0" for day in range(days)),
+            "days_present": row.days_present,
+            "minutes": row.minutes,
+        } for row in rows], 200, headers)
+
+# ========== DEPARTMENT SUMMARY ==========
+# GET /attendance/summary?month=YYYY-MM[&department_id=] from the
+# attendance_department_days rollup: per department, head count and minutes
+# for each day plus the month's totals. HR sees every department, Managers
+# their own.
+class AttendanceSummaryResource(Resource):
+    @jwt_required()
+    @conditional("attendances", "employees", "departments")
+    def get(self):
+        user = current_user()
+        if user.user_type_name not in ["HR", "Manager"]:
+            return make_response({"message": "Forbidden: Only HR or Managers can view attendance summaries."}, 403)
+
+        month = month_arg("month") or date.today().replace(day=1)
+        query = AttendanceDepartmentDay.query.filter(
+            *date_range(AttendanceDepartmentDay.date, *month_bounds(month))
+        ).order_by(AttendanceDepartmentDay.department_id, AttendanceDepartmentDay.date)
+
+        department_id = user.department_id if user.user_type_name == "Manager" else int_arg("department_id")
+        if department_id is not None:
+            query = query.filter(AttendanceDepartmentDay.department_id == department_id)
+
+        summaries = {}
+        for day in query:
+            summary = summaries.get(day.department_id)
+            if summary is None:
+                department = ref_by_id(Department, day.department_id)
+                summary = summaries[day.department_id] = {
+                    "department_id": day.department_id,
+                    "department_name": department.name if department else None,
+                    "month": month.strftime("%Y-%m"),
+                    "present": 0,
+                    "minutes": 0,
+                    "days": [],
+                }
+            summary["present"] += day.present
+            summary["minutes"] += day.minutes
+            summary["days"].append({"date": day.date.isoformat(), "present": day.present, "minutes": day.minutes})
+
+        return make_response(list(summaries.values()), 200)
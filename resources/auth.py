@@ -2,7 +2,11 @@ import re
 from flask import request
 from flask_restful import Resource
 from flask_jwt_extended import create_access_token
-from models import Employee
+from identity import make_claims
+from models import db, Employee
+from serializers import serializer_for
+
+serialize_employee = serializer_for(Employee)
 
 EMAIL_RE = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
 
@@ -23,12 +27,18 @@ class AuthResource(Resource):
             return {"error": "Bad email format"}, 400
 
         # --- Authenticate ------------------------
-        user = Employee.query.filter_by(email=email).first()
+        user = Employee.with_related().filter_by(email=email).first()
         if not user or not user.verify_password(password):
             return {"error": "Invalid credentials"}, 401
 
-        token = create_access_token(identity=user.id)
+        # Upgrade the stored hash when BCRYPT_LOG_ROUNDS has changed
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.session.commit()
+
+        # Role and department travel in the token so requests skip the user lookup
+        token = create_access_token(identity=user.id, additional_claims=make_claims(user))
         return {
-            "user": user.to_dict(),
+            "user": serialize_employee(user),
             "access_token": token
         }, 200
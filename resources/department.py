@@ -1,15 +1,24 @@
 from flask import make_response, request
 from flask_restful import Resource
-from flask_jwt_extended import jwt_required, get_jwt_identity 
+from flask_jwt_extended import jwt_required
+from identity import current_user
 from models import db, Department, Employee
+from pagination import paginate, fields_arg
+from serializers import serializer_for, loader_options
+from conditional import conditional
 
-# Utility: Get the current logged-in user
 
-def current_user():
-    return Employee.query.get(get_jwt_identity())
+# Tables the department payload reads (manager_name comes from employees / user_types)
+DEPARTMENT_TABLES = ("departments", "employees", "user_types")
+
+# ?fields= also leaves out the manager_name subquery when it is not asked for
+def department_fields():
+    fields = fields_arg(Department.serialize_only) or Department.serialize_only
+    return serializer_for(Department, fields), loader_options(Department, fields)
 
 class DepartmentListResource(Resource):
     @jwt_required()
+    @conditional(*DEPARTMENT_TABLES)
     def get(self):
         user = current_user()
 
@@ -17,8 +26,9 @@ class DepartmentListResource(Resource):
         if user.user_type_name not in ["HR", "Manager"]:
             return make_response({"message": "Forbidden: You do not have access to view departments."}, 403)
 
-        departments = Department.query.all()
-        return make_response([{"id": d.id, "name": d.name, "description": d.description, "manager_name": d.manager_name} for d in departments], 200)
+        serialize, options = department_fields()
+        departments, headers = paginate(Department.query.options(*options), Department.id)
+        return make_response([serialize(d) for d in departments], 200, headers)
 
     @jwt_required()
     def post(self):
@@ -55,19 +65,21 @@ class DepartmentListResource(Resource):
 
 class DepartmentDetailResource(Resource):
     @jwt_required()
+    @conditional(*DEPARTMENT_TABLES)
     def get(self, id):
         user = current_user() # Get the logged-in user
 
-        department = Department.query.get(id)
+        serialize, options = department_fields()
+        department = Department.query.options(*options).filter_by(id=id).first()
         if not department:
             return make_response({"error": "Department not found"}, 404)
 
         # Policy: Only HR and Managers can view department details.
         if user.user_type_name in ["HR", "Manager"]:
-            return make_response(department.to_dict(), 200)
+            return make_response(serialize(department), 200)
         # Employees can view their own department details
         elif user.user_type_name == "Employee" and user.department_id == department.id:
-            return make_response(department.to_dict(), 200)
+            return make_response(serialize(department), 200)
         # Otherwise, forbidden
         else:
             return make_response({"message": "Forbidden: You do not have access to view department details."}, 403)
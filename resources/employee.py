@@ -1,29 +1,68 @@
+import csv
+import io
+import logging
+import re
+
 from flask import make_response, request
 from flask_restful import Resource
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import Employee, UserType, JobTitle, Department, db
+from flask_jwt_extended import jwt_required
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import joinedload, selectinload
+from identity import current_user
+from models import Employee, EmployeeSearchTerm, UserType, JobTitle, Department, db, search_terms
+from pagination import paginate, int_arg, fields_arg
+from streaming import stream, wants_stream
+from serializers import serializer_for, loader_options
+from refcache import ref_by_id, ref_by_name
+from conditional import conditional
+
+logger = logging.getLogger(__name__)
+
+serialize_employee = serializer_for(Employee)
+
 
-# Utility: Get the current logged-in user
-def current_user():
-    return Employee.query.get(get_jwt_identity())
+# Tables an employee payload reads (the proxied names live in the lookup tables)
+EMPLOYEE_TABLES = ("employees", "departments", "job_titles", "user_types")
+
+# Sparse fieldsets: ?fields=id,first_name,department_name returns just those
+# fields and loads just the columns / lookup rows they need. Returns the
+# serializer and the query options for the requested fields.
+def employee_fields(strategy=selectinload, extra=()):
+    fields = fields_arg(Employee.serialize_only) or Employee.serialize_only
+    return serializer_for(Employee, fields), loader_options(Employee, fields, strategy, extra)
+
+# Server-side filters: ?department_id= &job_title_id= &user_type_id=
+def filter_employees(query):
+    for field in ("department_id", "job_title_id", "user_type_id"):
+        value = int_arg(field)
+        if value is not None:
+            query = query.filter(getattr(Employee, field) == value)
+    return query
 
 # ========== EMPLOYEE LIST ==========
 class EmployeeListResource(Resource):
     @jwt_required()
+    @conditional(*EMPLOYEE_TABLES)
     def get(self):
         user = current_user()
-        employees = []
+        streaming = wants_stream()
+        # A single joined SELECT streams cleanly; buffered lists use select-in
+        serialize, options = employee_fields(joinedload if streaming else selectinload)
+        query = Employee.query.options(*options)
 
         if user.user_type_name == "HR":
-            employees = Employee.query.all()
-            print(f"HR user '{user.email}' is fetching ALL employees.") # For debugging
+            logger.debug("HR user %s is fetching all employees", user.id)
         elif user.user_type_name == "Manager":
-            employees = Employee.query.filter_by(department_id=user.department_id).all()
-            print(f"Manager user '{user.email}' is fetching employees for department '{user.department.name}'.") # For debugging
+            query = query.filter_by(department_id=user.department_id)
+            logger.debug("Manager user %s is fetching employees for department %s", user.id, user.department_id)
         else:
             return make_response({"error": "Forbidden: You do not have permission to view employee lists."}, 403)
 
-        return make_response([e.to_dict() for e in employees], 200)
+        if streaming:
+            return stream(filter_employees(query), Employee.id, serialize)
+
+        employees, headers = paginate(filter_employees(query), Employee.id)
+        return make_response([serialize(e) for e in employees], 200, headers)
 
     @jwt_required()
     def post(self):
@@ -44,20 +83,20 @@ class EmployeeListResource(Resource):
             return make_response({"error": "Email already exists"}, 400)
 
         # Get user type
-        user_type = UserType.query.filter_by(name=data["user_type_name"]).first()
+        user_type = ref_by_name(UserType, data["user_type_name"], confirm_miss=True)
         if not user_type:
             return make_response({"error": "Invalid user type"}, 400)
 
         # --- FIX: Check if job title exists, if not, create it ---
         job_title_name = data["job_title_name"].strip()
-        job_title = JobTitle.query.filter_by(title=job_title_name).first()
+        job_title = ref_by_name(JobTitle, job_title_name, confirm_miss=True)
         if not job_title:
             try:
                 new_job_title = JobTitle(title=job_title_name)
                 db.session.add(new_job_title)
                 db.session.commit() # Commit new job title to get its ID
                 job_title = new_job_title # Use the newly created job title
-                print(f"Created new job title: {job_title_name}") # For debugging
+                logger.info("Created new job title: %s", job_title_name)
             except Exception as e:
                 db.session.rollback()
                 return make_response({"error": f"Failed to create new job title: {str(e)}"}, 500)
@@ -69,7 +108,7 @@ class EmployeeListResource(Resource):
             department_id = data.get("department_id")
             if not department_id:
                 return make_response({"error": "Department ID is required for HR to add an employee."}, 400)
-            if not Department.query.get(department_id):
+            if not ref_by_id(Department, department_id, confirm_miss=True):
                 return make_response({"error": "Invalid Department ID"}, 400)
         elif user.user_type_name == "Manager":
             department_id = user.department_id
@@ -90,33 +129,265 @@ class EmployeeListResource(Resource):
         try:
             db.session.add(new_employee)
             db.session.commit()
-            return make_response(new_employee.to_dict(), 201)
+            return make_response(serialize_employee(new_employee), 201)
+        except Exception as e:
+            db.session.rollback()
+            return make_response({"error": str(e)}, 500)
+
+
+# ========== EMPLOYEE SEARCH ==========
+# GET /employees/search?q=ali ngu -> employees with a name, email, job title
+# or department word starting with every word of q, best matches first, then
+# by id. Each query word scores the employee's best matching term: its weight
+# (names 3, email 2, job title and department 1) doubled, plus one for an
+# exact word. Always paginated (?limit= / ?cursor=, 20 per page by default);
+# HR searches everyone, Managers their department. The /employees filters
+# apply too.
+SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_WORDS = 5
+
+# Past every character a term can continue with, for prefix range scans
+PREFIX_END = "\U0010ffff"
+
+def search_scores(words):
+    """Subquery of (employee_id, score, rank) for employees matching every word.
+
+    rank orders by score descending, then id, as a single keyset key.
+    """
+    terms = EmployeeSearchTerm.__table__
+    matches = [
+        select(
+            terms.c.employee_id,
+            func.max(terms.c.weight * 2 + case((terms.c.term == word, 1), else_=0)).label("score"),
+        )
+        .where(terms.c.term >= word, terms.c.term < word + PREFIX_END)
+        .group_by(terms.c.employee_id)
+        .subquery()
+        for word in words
+    ]
+    first, score = matches[0], matches[0].c.score
+    joined = first
+    for match in matches[1:]:
+        joined = joined.join(match, match.c.employee_id == first.c.employee_id)
+        score = score + match.c.score
+    return select(
+        first.c.employee_id,
+        score.label("score"),
+        (first.c.employee_id - score * 2**32).label("rank"),
+    ).select_from(joined).subquery()
+
+class EmployeeSearchResource(Resource):
+    @jwt_required()
+    @conditional(*EMPLOYEE_TABLES)
+    def get(self):
+        user = current_user()
+        if user.user_type_name not in ["HR", "Manager"]:
+            return make_response({"error": "Forbidden: You do not have permission to search employees."}, 403)
+
+        # Email domains are not indexed (everyone shares one), so drop them from q too
+        words = search_terms(re.sub(r"@\S*", " ", request.args.get("q") or ""))
+        if not words:
+            return make_response({"error": "q is required"}, 400)
+        if len(words) > MAX_SEARCH_WORDS:
+            return make_response({"error": f"q may have at most {MAX_SEARCH_WORDS} words"}, 400)
+
+        serialize, options = employee_fields()
+        scores = search_scores(words)
+        query = db.session.query(Employee, scores.c.score, scores.c.rank) \
+            .join(scores, Employee.id == scores.c.employee_id) \
+            .options(*options)
+        if user.user_type_name == "Manager":
+            query = query.filter(Employee.department_id == user.department_id)
+
+        rows, headers = paginate(filter_employees(query), scores.c.rank, SEARCH_PAGE_SIZE)
+        return make_response([{**serialize(row.Employee), "score": row.score} for row in rows], 200, headers)
+
+
+# ========== EMPLOYEE BULK IMPORT ==========
+# POST /employees/bulk with a JSON array of employee objects (same fields as
+# POST /employees) or a CSV body (Content-Type: text/csv) with those fields as
+# headers. Lookups and duplicate checks are set-based, passwords are hashed in
+# parallel and every valid row is inserted in one transaction. Invalid rows are
+# reported per row and skipped.
+MAX_BULK_ROWS = 10000
+BULK_CHUNK_SIZE = 500
+TEXT_FIELDS = ["first_name", "last_name", "email", "password", "user_type_name", "job_title_name", "phone"]
+
+def chunked(items, size=BULK_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def existing_values(column, values):
+    found = set()
+    for chunk in chunked(list(values)):
+        found.update(v for (v,) in db.session.query(column).filter(column.in_(chunk)))
+    return found
+
+def read_bulk_rows():
+    if request.mimetype == "text/csv":
+        return list(csv.DictReader(io.StringIO(request.get_data(as_text=True))))
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get("employees")
+    return data
+
+class EmployeeBulkResource(Resource):
+    @jwt_required()
+    def post(self):
+        user = current_user()
+        if user.user_type_name not in ["HR", "Manager"]:
+            return make_response({"error": "Forbidden: Only HR or Managers can add employees."}, 403)
+
+        rows = read_bulk_rows()
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            return make_response({"error": "Expected a JSON array of employees or a CSV body"}, 400)
+        if len(rows) > MAX_BULK_ROWS:
+            return make_response({"error": f"At most {MAX_BULK_ROWS} employees per request"}, 413)
+
+        required_fields = ["first_name", "last_name", "email", "password", "user_type_name", "job_title_name"]
+        if user.user_type_name == "HR":
+            required_fields.append("department_id")
+
+        results = [None] * len(rows)
+        def fail(index, message):
+            results[index] = {"row": index, "status": "error", "error": message}
+
+        # --- Per-row validation that needs no database ---
+        for i, row in enumerate(rows):
+            missing = [field for field in required_fields if not row.get(field)]
+            if missing:
+                fail(i, f"Missing fields: {', '.join(missing)}")
+                continue
+            not_text = [field for field in TEXT_FIELDS
+                        if row.get(field) is not None and not isinstance(row[field], str)]
+            if not_text:
+                fail(i, f"Expected text for: {', '.join(not_text)}")
+                continue
+            department_id = row.get("department_id")
+            if department_id is not None and (isinstance(department_id, bool)
+                                              or not isinstance(department_id, (int, str))):
+                fail(i, "Invalid Department ID")
+                continue
+            row["email"] = row["email"].strip().lower()
+            row["job_title_name"] = row["job_title_name"].strip()
+            row["phone"] = row.get("phone") or None
+
+        # --- Duplicates within the batch and against the table, one query each ---
+        pending = [i for i in range(len(rows)) if results[i] is None]
+        for field, column in (("email", Employee.email), ("phone", Employee.phone)):
+            taken = existing_values(column, {rows[i][field] for i in pending if rows[i][field]})
+            seen = set()
+            for i in pending:
+                value = rows[i][field]
+                if value is None or results[i] is not None:
+                    continue
+                if value in taken or value in seen:
+                    fail(i, f"{field.capitalize()} already exists")
+                seen.add(value)
+
+        # --- Lookups from the reference cache; build (and validate) the rows ---
+        # A miss is checked against the database, once per distinct value
+        confirmed = {}
+        def lookup(find, model, value):
+            if (model, value) not in confirmed:
+                confirmed[model, value] = find(model, value, confirm_miss=True)
+            return confirmed[model, value]
+
+        employees = {}
+        for i in range(len(rows)):
+            if results[i] is not None:
+                continue
+            row = rows[i]
+            user_type = lookup(ref_by_name, UserType, row["user_type_name"])
+            if not user_type:
+                fail(i, "Invalid user type")
+                continue
+
+            if user.user_type_name == "HR":
+                department = lookup(ref_by_id, Department, row["department_id"])
+                if not department:
+                    fail(i, "Invalid Department ID")
+                    continue
+                department_id = department.id
+            else:
+                department_id = user.department_id
+
+            try:
+                employees[i] = Employee(
+                    first_name=row["first_name"],
+                    last_name=row["last_name"],
+                    email=row["email"],
+                    phone=row["phone"],
+                    department_id=department_id,
+                    user_type_id=user_type.id,
+                )
+            except ValueError as e:  # email format
+                fail(i, str(e))
+
+        if not employees:
+            return make_response({"created": 0, "failed": len(rows), "results": results}, 400)
+
+        # Hash before writing anything: the write lock is held from the first
+        # flush to the commit, and bcrypt is the slow part of an import
+        hashes = Employee.hash_passwords([rows[i]["password"] for i in employees])
+        for employee, password_hash in zip(employees.values(), hashes):
+            employee.password_hash = password_hash
+
+        try:
+            # --- Missing job titles are created together, in the same transaction ---
+            titles = {rows[i]["job_title_name"] for i in employees}
+            title_ids = {name: ref.id for name in titles if (ref := ref_by_name(JobTitle, name))}
+            # Titles another worker added since the cache was filled
+            for chunk in chunked(sorted(titles - set(title_ids))):
+                title_ids.update(db.session.query(JobTitle.title, JobTitle.id).filter(JobTitle.title.in_(chunk)))
+            new_titles = [JobTitle(title=name) for name in sorted(titles - set(title_ids))]
+            if new_titles:
+                db.session.add_all(new_titles)
+                db.session.flush()
+                title_ids.update((jt.title, jt.id) for jt in new_titles)
+
+            for i, employee in employees.items():
+                employee.job_title_id = title_ids[rows[i]["job_title_name"]]
+
+            for chunk in chunked(list(employees.values())):
+                db.session.add_all(chunk)
+                db.session.flush()
+            # Read the ids now: after the commit each one would be reloaded
+            for i, employee in employees.items():
+                results[i] = {"row": i, "status": "created", "id": employee.id}
+            db.session.commit()
         except Exception as e:
             db.session.rollback()
             return make_response({"error": str(e)}, 500)
 
+        return make_response({"created": len(employees), "failed": len(rows) - len(employees), "results": results}, 201)
+
 
 # ========== EMPLOYEE DETAIL ==========
 class EmployeeDetailResource(Resource):
     @jwt_required()
+    @conditional(*EMPLOYEE_TABLES)
     def get(self, id):
         user = current_user()
-        target_employee = Employee.query.get(id)
+        # department_id is read below for the Manager check
+        serialize, options = employee_fields(joinedload, extra=(Employee.department_id,))
+        target_employee = Employee.query.options(*options).filter_by(id=id).first()
         if not target_employee:
             return make_response({"error": "Employee not found"}, 404)
 
         if user.user_type_name == "HR":
-            return make_response(target_employee.to_dict(), 200)
+            return make_response(serialize(target_employee), 200)
         elif user.user_type_name == "Manager" and user.department_id == target_employee.department_id:
-            return make_response(target_employee.to_dict(), 200)
+            return make_response(serialize(target_employee), 200)
         elif user.id == id:
-            return make_response(target_employee.to_dict(), 200)
+            return make_response(serialize(target_employee), 200)
         else:
             return make_response({"error": "Forbidden: You do not have permission to view this employee's details."}, 403)
 
 
 class TotalEmployeesResource(Resource):
     @jwt_required()
+    @conditional("employees")
     def get(self):
         user = current_user()
         if user.user_type_name != "HR":
@@ -1,14 +1,50 @@
+from flask import abort, request
 from flask_restful import Resource
 from flask_jwt_extended import jwt_required
-from models import JobTitle
+from sqlalchemy.orm import selectinload
+from models import JobTitle, Employee
+from pagination import paginate, fields_arg, pick_fields
+from refcache import cache
+from conditional import conditional
+
+# Nested employees are serialized with their proxied names, so load them in bulk
+def job_title_query():
+    return JobTitle.query.options(selectinload(JobTitle.employees).options(*Employee.related_options(selectinload)))
+
+# The payload embeds employees with their department / job title / user type names
+PAYLOAD_TABLES = ("employees", "departments", "job_titles", "user_types")
+# What ?fields= can pick from an item
+FIELDS = ("id", "title", "employees")
+
+# The full list is cached until any table it draws from changes
+def job_title_payload():
+    def build():
+        items = [jt.to_dict() for jt in job_title_query().order_by(JobTitle.id).all()]
+        return items, {item["id"]: item for item in items}
+    return cache.get(("payload", "job_titles"), PAYLOAD_TABLES, build)
 
 class JobTitleListResource(Resource):
     @jwt_required()
+    @conditional(*PAYLOAD_TABLES)
     def get(self):
-        return [jt.to_dict() for jt in JobTitle.query.all()], 200
+        fields = fields_arg(FIELDS)
+        if not set(request.args) - {"fields"}:
+            return [pick_fields(item, fields) for item in job_title_payload()[0]], 200
+
+        if fields is None or "employees" in fields:
+            items, headers = paginate(job_title_query(), JobTitle.id)
+            return [pick_fields(jt.to_dict(), fields) for jt in items], 200, headers
+        # Without their employees the rows are a single small query
+        items, headers = paginate(JobTitle.query, JobTitle.id)
+        return [pick_fields(jt.to_dict(rules=("-employees",)), fields) for jt in items], 200, headers
 
 
 class JobTitleDetailResource(Resource):
     @jwt_required()
+    @conditional(*PAYLOAD_TABLES)
     def get(self, id):
-        return JobTitle.query.get_or_404(id).to_dict(), 200
+        fields = fields_arg(FIELDS)
+        item = job_title_payload()[1].get(id)
+        if item is None:
+            abort(404)
+        return pick_fields(item, fields), 200
@@ -1,39 +1,80 @@
+import logging
+
 from flask import request, make_response
 from flask_restful import Resource
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, Employee, PerformanceReview
+from flask_jwt_extended import jwt_required
+from identity import current_user
+from sqlalchemy import insert
+from models import db, Employee, PerformanceReview, ReviewProjection, refresh_review_projection
 from datetime import datetime
+from pagination import paginate, int_arg, date_arg, date_range, fields_arg
+from streaming import stream, wants_stream
+from serializers import serializer_for, loader_options
+from conditional import conditional
+
+logger = logging.getLogger(__name__)
+
+serialize_review = serializer_for(ReviewProjection)
+
+
+# Tables the review projection is derived from
+REVIEW_TABLES = ("performance_reviews", "employees", "departments", "job_titles")
+
+# Server-side filters: ?department_id= &job_title_id= &employee_id=
+# &min_rating= &max_rating= &from_date= &to_date= (dates are YYYY-MM-DD, inclusive)
+def review_filters():
+    """The filters above, parsed (None where absent)."""
+    filters = {field: int_arg(field)
+               for field in ("department_id", "job_title_id", "employee_id", "min_rating", "max_rating")}
+    filters.update(from_date=date_arg("from_date"), to_date=date_arg("to_date"))
+    return filters
 
-# Helper function to get the current logged-in user
-def current_user():
-    return Employee.query.get(get_jwt_identity())
+def filter_reviews(query, filters=None):
+    filters = review_filters() if filters is None else filters
+    for field in ("department_id", "job_title_id", "employee_id"):
+        if filters[field] is not None:
+            query = query.filter(getattr(ReviewProjection, field) == filters[field])
+
+    if filters["min_rating"] is not None:
+        query = query.filter(ReviewProjection.rating >= filters["min_rating"])
+    if filters["max_rating"] is not None:
+        query = query.filter(ReviewProjection.rating <= filters["max_rating"])
+
+    return query.filter(*date_range(ReviewProjection.review_date, filters["from_date"], filters["to_date"]))
 
 class ReviewListResource(Resource):
     @jwt_required()
+    @conditional(*REVIEW_TABLES)
     def get(self):
         user = current_user()
 
-        reviews = []
+        # Served from the flattened projection: one scan, no per-row joins.
+        # ?fields=id,rating,review_date narrows both the payload and the SELECT
+        fields = fields_arg(ReviewProjection.serialize_only) or ReviewProjection.serialize_only
+        serialize = serializer_for(ReviewProjection, fields)
+        query = ReviewProjection.query.options(*loader_options(ReviewProjection, fields))
 
         # HR can fetch all reviews
         if user.user_type_name == "HR":
-            reviews = PerformanceReview.query.all()
-            print(f"HR user '{user.email}' is fetching ALL reviews.") # For debugging
+            logger.debug("HR user %s is fetching all reviews", user.id)
 
         # Managers fetch reviews for employees in their department
         elif user.user_type_name == "Manager":
-            reviews = PerformanceReview.query.join(Employee).filter(
-                Employee.department_id == user.department_id
-            ).all()
-            print(f"Manager user '{user.email}' is fetching reviews for department '{user.department.name}'.") # For debugging
+            query = query.filter_by(department_id=user.department_id)
+            logger.debug("Manager user %s is fetching reviews for department %s", user.id, user.department_id)
 
         # Employees fetch only their own reviews
         else: # Covers 'Employee' user type and any other unhandled types
-            reviews = PerformanceReview.query.filter_by(employee_id=user.id).all()
-            print(f"Employee user '{user.email}' is fetching their own reviews.") # For debugging
+            query = query.filter_by(employee_id=user.id)
+            logger.debug("Employee user %s is fetching their own reviews", user.id)
+
+        if wants_stream():
+            return stream(filter_reviews(query), ReviewProjection.id, serialize)
+
+        reviews, headers = paginate(filter_reviews(query), ReviewProjection.id)
 
-        # Return all retrieved reviews as JSON
-        return make_response([r.to_dict() for r in reviews], 200)
+        # Return the retrieved reviews as JSON
+        return make_response([serialize(r) for r in reviews], 200, headers)
 
     @jwt_required()
     def post(self):
@@ -72,7 +113,92 @@ class ReviewListResource(Resource):
         db.session.commit()
 
         # Return the created review
-        return make_response(review.to_dict(), 201)
+        return make_response(serialize_review(ReviewProjection.query.get(review.id)), 201)
+
+
+# ========== BATCH REVIEW SUBMISSION ==========
+# POST /reviews/batch with a JSON array of {employee_id, notes, rating} (or
+# {"reviews": [...]}). Department membership for every target is checked with
+# one query, the reviews go in as one multi-row INSERT and the projection is
+# refreshed once for the whole batch. Invalid items are reported and skipped.
+MAX_BATCH_REVIEWS = 1000
+
+class ReviewBatchResource(Resource):
+    @jwt_required()
+    def post(self):
+        user = current_user()
+        if user.user_type_name != "Manager":
+            return make_response({"error": "Forbidden: Only managers can add reviews for employees in their department."}, 403)
+
+        items = request.get_json(silent=True)
+        if isinstance(items, dict):
+            items = items.get("reviews")
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return make_response({"error": "Expected a JSON array of reviews"}, 400)
+        if len(items) > MAX_BATCH_REVIEWS:
+            return make_response({"error": f"At most {MAX_BATCH_REVIEWS} reviews per request"}, 413)
+
+        results = [None] * len(items)
+        def fail(index, message):
+            results[index] = {"row": index, "status": "error", "error": message}
+
+        def is_int(value):
+            return isinstance(value, int) and not isinstance(value, bool)
+
+        for i, item in enumerate(items):
+            if item.get("employee_id") is None:
+                fail(i, "Employee ID is required")
+            elif not is_int(item["employee_id"]):
+                fail(i, "Employee ID must be an integer")
+            elif item.get("rating") is not None and not is_int(item["rating"]):
+                fail(i, "Rating must be an integer")
+            elif item.get("notes") is not None and not isinstance(item["notes"], str):
+                fail(i, "Notes must be a string")
+
+        # Which of the requested employees are in the manager's department, in one query
+        requested = {item["employee_id"] for i, item in enumerate(items) if results[i] is None}
+        in_department = {
+            id for (id,) in db.session.query(Employee.id)
+            .filter(Employee.id.in_(requested), Employee.department_id == user.department_id)
+        } if requested else set()
+
+        now = datetime.now()
+        reviewer = f"{user.first_name} {user.last_name}"
+        pending, values = [], []
+        for i, item in enumerate(items):
+            if results[i] is not None:
+                continue
+            if item["employee_id"] not in in_department:
+                fail(i, "Forbidden: Employee not found in your department")
+                continue
+            pending.append(i)
+            values.append({
+                "employee_id": item["employee_id"],
+                "reviewer": reviewer,
+                "notes": item.get("notes"),
+                "rating": item.get("rating"),
+                "review_date": now,
+            })
+
+        if not values:
+            return make_response({"created": 0, "failed": len(items), "results": results}, 400)
+
+        try:
+            # A bulk INSERT skips the per-row projection hook; refresh the batch in one statement
+            ids = db.session.scalars(
+                insert(PerformanceReview).returning(PerformanceReview.id, sort_by_parameter_order=True),
+                values,
+            ).all()
+            refresh_review_projection(db.session.connection(), PerformanceReview.__table__.c.id.in_(ids))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return make_response({"error": str(e)}, 500)
+
+        for i, id in zip(pending, ids):
+            results[i] = {"row": i, "status": "created", "id": id}
+
+        return make_response({"created": len(ids), "failed": len(items) - len(ids), "results": results}, 201)
 
 
 class ReviewDetailResource(Resource):
@@ -97,7 +223,7 @@ class ReviewDetailResource(Resource):
                     setattr(review, field, None)
 
         db.session.commit()
-        return make_response(review.to_dict(), 200)
+        return make_response(serialize_review(ReviewProjection.query.get(review.id)), 200)
 
     @jwt_required()
     def delete(self, id):
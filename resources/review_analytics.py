@@ -0,0 +1,152 @@
+from flask import make_response, request
+from flask_restful import Resource
+from flask_jwt_extended import jwt_required
+from sqlalchemy import case, func, literal
+from identity import current_user
+from models import db, ReviewProjection
+from refcache import cache
+from conditional import conditional
+from resources.review import REVIEW_TABLES, filter_reviews, review_filters
+
+# ===========================
+# Review analytics
+# ===========================
+# Grouped aggregates over the review projection (one row per review with the
+# employee's department and job title already joined in), computed by the
+# database. Results are cached per (grouping, filters, caller scope) and tagged
+# with REVIEW_TABLES' versions, so any review, employee, department or job
+# title change invalidates them. Scoping matches GET /reviews: HR sees every
+# review, Managers their department's, Employees their own. The /reviews
+# filters (?department_id= &job_title_id= &employee_id= &min_rating=
+# &max_rating= &from_date= &to_date=) apply before grouping.
+RATINGS = range(1, 6)
+
+review_year = func.extract("year", ReviewProjection.review_date)
+
+# ?group_by= -> (key column, display name column). "overall" is one ungrouped
+# aggregate: PostgreSQL rejects GROUP BY a constant
+GROUPINGS = {
+    "department": (ReviewProjection.department_id, ReviewProjection.employee_department),
+    "job_title": (ReviewProjection.job_title_id, ReviewProjection.employee_job_title),
+    "year": (review_year, review_year),
+    "overall": (literal(None), literal("All reviews")),
+}
+
+
+def group_columns(group_by):
+    return () if group_by == "overall" else GROUPINGS[group_by]
+
+
+def grouping_arg(allowed):
+    group_by = request.args.get("group_by", "department")
+    if group_by not in allowed:
+        return None, make_response({"error": f"group_by must be one of: {', '.join(allowed)}"}, 400)
+    return group_by, None
+
+
+def scoped_reviews(user, *columns):
+    query = db.session.query(*columns)
+    if user.user_type_name == "HR":
+        return query
+    if user.user_type_name == "Manager":
+        return query.filter(ReviewProjection.department_id == user.department_id)
+    return query.filter(ReviewProjection.employee_id == user.id)
+
+
+def scope_key(user):
+    if user.user_type_name == "HR":
+        return ("all",)
+    if user.user_type_name == "Manager":
+        return ("department", user.department_id)
+    return ("employee", user.id)
+
+
+def cached(kind, user, filters, build):
+    # Keyed on the parsed arguments only: anything else in the query string
+    # (e.g. a cache-buster) must not add entries
+    key = ("review-analytics", kind, scope_key(user), tuple(sorted(filters.items())))
+    return cache.get(key, REVIEW_TABLES, build)
+
+
+def mean(value):
+    return round(float(value), 2) if value is not None else None
+
+# ========== GROUPED SUMMARY ==========
+# GET /reviews/analytics?group_by=department|job_title|year|overall
+# -> [{key, name, count, mean, distribution: {"1": n, ... "5": n}}]
+class ReviewAnalyticsResource(Resource):
+    @jwt_required()
+    @conditional(*REVIEW_TABLES)
+    def get(self):
+        user = current_user()
+        group_by, error = grouping_arg(GROUPINGS)
+        if error:
+            return error
+        filters = review_filters()
+
+        def build():
+            key, name = GROUPINGS[group_by]
+            query = scoped_reviews(
+                user,
+                key.label("key"),
+                name.label("name"),
+                func.count(ReviewProjection.id).label("count"),
+                func.avg(ReviewProjection.rating).label("mean"),
+                *(func.sum(case((ReviewProjection.rating == r, 1), else_=0)).label(f"r{r}") for r in RATINGS),
+            )
+            columns = group_columns(group_by)
+            rows = filter_reviews(query, filters).group_by(*columns).order_by(*columns).all()
+            return [{
+                "key": row.key,
+                "name": row.name,
+                "count": row.count,
+                "mean": mean(row.mean),
+                "distribution": {str(r): getattr(row, f"r{r}") or 0 for r in RATINGS},
+            } for row in rows if row.count]
+
+        return make_response(cached(("summary", group_by), user, filters, build), 200)
+
+# ========== YEAR-OVER-YEAR TREND ==========
+# GET /reviews/analytics/trend?group_by=department|job_title|overall
+# -> [{key, name, years: [{year, count, mean, change}]}], change being the
+# difference in mean rating from the group's previous year with reviews
+class ReviewTrendResource(Resource):
+    @jwt_required()
+    @conditional(*REVIEW_TABLES)
+    def get(self):
+        user = current_user()
+        group_by, error = grouping_arg([g for g in GROUPINGS if g != "year"])
+        if error:
+            return error
+        filters = review_filters()
+
+        def build():
+            key, name = GROUPINGS[group_by]
+            query = scoped_reviews(
+                user,
+                key.label("key"),
+                name.label("name"),
+                review_year.label("year"),
+                func.count(ReviewProjection.id).label("count"),
+                func.avg(ReviewProjection.rating).label("mean"),
+            )
+            columns = group_columns(group_by)
+            rows = filter_reviews(query, filters).group_by(*columns, review_year) \
+                .order_by(*columns, review_year).all()
+
+            groups = {}
+            for row in rows:
+                group = groups.get(row.key)
+                if group is None:
+                    group = groups[row.key] = {"key": row.key, "name": row.name, "years": []}
+                previous = group["years"][-1]["mean"] if group["years"] else None
+                current = mean(row.mean)
+                group["years"].append({
+                    "year": int(row.year),
+                    "count": row.count,
+                    "mean": current,
+                    "change": round(current - previous, 2) if None not in (current, previous) else None,
+                })
+            return list(groups.values())
+
+        return make_response(cached(("trend", group_by), user, filters, build), 200)
@@ -1,14 +1,50 @@
+from flask import abort, request
 from flask_restful import Resource
 from flask_jwt_extended import jwt_required
-from models import UserType
+from sqlalchemy.orm import selectinload
+from models import UserType, Employee
+from pagination import paginate, fields_arg, pick_fields
+from refcache import cache
+from conditional import conditional
+
+# Nested employees are serialized with their proxied names, so load them in bulk
+def user_type_query():
+    return UserType.query.options(selectinload(UserType.employees).options(*Employee.related_options(selectinload)))
+
+# The payload embeds employees with their department / job title / user type names
+PAYLOAD_TABLES = ("employees", "departments", "job_titles", "user_types")
+# What ?fields= can pick from an item
+FIELDS = ("id", "name", "description", "employees")
+
+# The full list is cached until any table it draws from changes
+def user_type_payload():
+    def build():
+        items = [ut.to_dict() for ut in user_type_query().order_by(UserType.id).all()]
+        return items, {item["id"]: item for item in items}
+    return cache.get(("payload", "user_types"), PAYLOAD_TABLES, build)
 
 class UserTypeListResource(Resource):
     @jwt_required()
+    @conditional(*PAYLOAD_TABLES)
     def get(self):
-        return [ut.to_dict() for ut in UserType.query.all()], 200
+        fields = fields_arg(FIELDS)
+        if not set(request.args) - {"fields"}:
+            return [pick_fields(item, fields) for item in user_type_payload()[0]], 200
+
+        if fields is None or "employees" in fields:
+            items, headers = paginate(user_type_query(), UserType.id)
+            return [pick_fields(ut.to_dict(), fields) for ut in items], 200, headers
+        # Without their employees the rows are a single small query
+        items, headers = paginate(UserType.query, UserType.id)
+        return [pick_fields(ut.to_dict(rules=("-employees",)), fields) for ut in items], 200, headers
 
 
 class UserTypeDetailResource(Resource):
     @jwt_required()
+    @conditional(*PAYLOAD_TABLES)
     def get(self, id):
-        return UserType.query.get_or_404(id).to_dict(), 200
+        fields = fields_arg(FIELDS)
+        item = user_type_payload()[1].get(id)
+        if item is None:
+            abort(404)
+        return pick_fields(item, fields), 200
@@ -0,0 +1,108 @@
+import threading
+from importlib import import_module
+
+import flask_restful
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import PyJWTError
+
+from hashing import HashingBusy
+
+# ===========================
+# Route table
+# ===========================
+# (URL rule, "module:Resource", methods). Resources are registered by name and
+# imported on the first request that reaches them, so building the app does
+# not import every module under resources/ (see LazyResource). Methods are
+# listed here because the URL map needs them before the class is loaded; keep
+# them in step with the Resource's get/post/put/delete methods.
+ROUTES = [
+    ("/auth/<string:action>", "resources.auth:AuthResource", ("POST",)),
+    ("/employees", "resources.employee:EmployeeListResource", ("GET", "POST")),
+    ("/employees/search", "resources.employee:EmployeeSearchResource", ("GET",)),
+    ("/employees/bulk", "resources.employee:EmployeeBulkResource", ("POST",)),
+    ("/employees/<int:id>", "resources.employee:EmployeeDetailResource", ("GET",)),
+    ("/total-employees", "resources.employee:TotalEmployeesResource", ("GET",)),
+    ("/reviews", "resources.review:ReviewListResource", ("GET", "POST")),
+    ("/reviews/batch", "resources.review:ReviewBatchResource", ("POST",)),
+    ("/reviews/<int:id>", "resources.review:ReviewDetailResource", ("PUT", "DELETE")),
+    ("/reviews/analytics", "resources.review_analytics:ReviewAnalyticsResource", ("GET",)),
+    ("/reviews/analytics/trend", "resources.review_analytics:ReviewTrendResource", ("GET",)),
+    ("/attendance", "resources.attendance:AttendanceListResource", ("GET",)),
+    ("/attendance/punches", "resources.attendance:AttendancePunchResource", ("POST",)),
+    ("/attendance/calendar", "resources.attendance:AttendanceCalendarResource", ("GET",)),
+    ("/attendance/summary", "resources.attendance:AttendanceSummaryResource", ("GET",)),
+    ("/departments", "resources.department:DepartmentListResource", ("GET", "POST")),
+    ("/departments/<int:id>", "resources.department:DepartmentDetailResource", ("GET",)),
+    ("/user-types", "resources.user_type:UserTypeListResource", ("GET",)),
+    ("/user-types/<int:id>", "resources.user_type:UserTypeDetailResource", ("GET",)),
+    ("/job-titles", "resources.job_title:JobTitleListResource", ("GET",)),
+    ("/job-titles/<int:id>", "resources.job_title:JobTitleDetailResource", ("GET",)),
+]
+
+
+class LazyResource:
+    """View function that imports its Resource on first use.
+
+    Loading does what Api.add_resource would have done at registration, so
+    the resource behaves exactly as if it had been added eagerly.
+    """
+
+    def __init__(self, api, endpoint, target, methods):
+        self.api = api
+        self.endpoint = endpoint
+        self.target = target
+        self.methods = methods
+        self._view = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._view is None:
+            with self._lock:
+                if self._view is None:
+                    module, name = self.target.split(":")
+                    resource = getattr(import_module(module), name)
+                    missing = set(self.methods) - set(resource.methods)
+                    if missing:
+                        raise RuntimeError(f"{self.target} does not implement {', '.join(sorted(missing))}")
+                    resource.mediatypes = self.api.mediatypes_method()
+                    resource.endpoint = self.endpoint
+                    view = self.api.output(resource.as_view(self.endpoint))
+                    for decorator in self.api.decorators:
+                        view = decorator(view)
+                    self._view = view
+        return self._view
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+
+# ===========================
+# Api
+# ===========================
+# Flask-RESTful turns every exception raised in a resource into a generic 500,
+# which would hide the app's own error handlers: flask_jwt_extended's token
+# errors (401 / 422) and HashingBusy (503, see app.py). Those are handed back to
+# Flask; everything else keeps Flask-RESTful's handling.
+APP_HANDLED_ERRORS = (JWTExtendedException, PyJWTError, HashingBusy)
+
+
+class Api(flask_restful.Api):
+    def handle_error(self, e):
+        if isinstance(e, APP_HANDLED_ERRORS):
+            raise e  # error_router falls back to the app's handler
+        return super().handle_error(e)
+
+
+def register_resources(app, api):
+    for rule, target, methods in ROUTES:
+        endpoint = target.split(":")[1].lower()
+        app.add_url_rule(rule, endpoint=endpoint, view_func=LazyResource(api, endpoint, target, methods),
+                         methods=methods)
+        api.endpoints.add(endpoint)
+
+
+def load_resources(app):
+    """Import every registered resource now (pre-fork servers, warm-up)."""
+    for view in app.view_functions.values():
+        if isinstance(view, LazyResource):
+            view.load()
@@ -1,178 +1,275 @@
-from app import app
-from models import db, Department, UserType, JobTitle, Employee, PerformanceReview
-from datetime import datetime
-
-
-with app.app_context():
-    print("Seeding manually...")
-
-    # Clear existing data to ensure a clean slate
-    PerformanceReview.query.delete()
-    Employee.query.delete()
-    Department.query.delete()
-    UserType.query.delete()
-    JobTitle.query.delete()
-    db.session.commit()
-
-    # User types
-    manager_type = UserType(name="Manager", description="Oversees department")
-    employee_type = UserType(name="Employee", description="General staff")
-    hr_type = UserType(name="HR", description="Manages human resources")
-    db.session.add_all([manager_type, employee_type, hr_type])
-    db.session.commit()
-
-    # Job titles - Expanded for more variety within departments
-    titles_data = {
-        "Engineering Manager": "Engineering Manager",
-        "Software Engineer": "Software Engineer",
-        "QA Engineer": "QA Engineer",
-        "DevOps Engineer": "DevOps Engineer",
-        "Product Manager": "Product Manager",
-
-        "Marketing Manager": "Marketing Manager",
-        "Marketing Specialist": "Marketing Specialist",
-        "Content Creator": "Content Creator",
-        "SEO Analyst": "SEO Analyst",
-        "Social Media Coordinator": "Social Media Coordinator",
-
-        "HR Officer": "HR Officer", # Manager for HR department
-        "HR Assistant": "HR Assistant",
-        "Recruitment Specialist": "Recruitment Specialist",
-        "Payroll Administrator": "Payroll Administrator",
-
-        "Finance Manager": "Finance Manager",
-        "Accountant": "Accountant",
-        "Financial Analyst": "Financial Analyst",
-        "Auditor": "Auditor",
-
-        "Support Manager": "Support Manager",
-        "Support Agent": "Support Agent",
-        "Customer Success Rep": "Customer Success Rep",
-        "Technical Support": "Technical Support",
-    }
-    # Create JobTitle objects and store them in a dictionary for easy lookup by their key
-    titles = {}
-    for key, title_name in titles_data.items():
-        job_title_obj = JobTitle(title=title_name)
-        db.session.add(job_title_obj)
-        titles[key] = job_title_obj
-    db.session.commit()
-
-
-    # Departments
-    departments = {
-        "Engineering": Department(name="Engineering", description="Builds software"),
-        "Marketing": Department(name="Marketing", description="Promotes products"),
-        "HR": Department(name="HR", description="Manages people"),
-        "Finance": Department(name="Finance", description="Handles money"),
-        "Support": Department(name="Support", description="Helps customers"),
-    }
-    db.session.add_all(departments.values())
-    db.session.commit()
-
-    # Unique phone number generator
-    # Starting with a base number and incrementing for each new employee
-    phone_counter = 700000000
-
-    # Define the structure of departments, managers, and employees with their specific job title keys
-    structure = {
-        "Engineering": {
-            "manager": {"first": "Alice", "last": "Ngugi", "email": "alice.ngugi@company.com", "job_title_key": "Engineering Manager"},
-            "employees": [
-                {"first": "Brian", "last": "Mutua", "email": "brian.mutua@company.com", "job_title_keys": ["Software Engineer", "QA Engineer", "DevOps Engineer"]},
-                {"first": "Carol", "last": "Wambui", "email": "carol.wambui@company.com", "job_title_keys": ["QA Engineer", "Software Engineer", "Product Manager"]},
-                {"first": "David", "last": "Otieno", "email": "david.otieno@company.com", "job_title_keys": ["DevOps Engineer", "Software Engineer", "QA Engineer"]},
-            ],
-        },
-        "Marketing": {
-            "manager": {"first": "Grace", "last": "Kariuki", "email": "grace.kariuki@company.com", "job_title_key": "Marketing Manager"},
-            "employees": [
-                {"first": "Helen", "last": "Njeri", "email": "helen.njeri@company.com", "job_title_keys": ["Marketing Specialist", "Content Creator", "SEO Analyst"]},
-                {"first": "Ian", "last": "Kimani", "email": "ian.kimani@company.com", "job_title_keys": ["Content Creator", "Social Media Coordinator", "Marketing Specialist"]},
-                {"first": "Joy", "last": "Mwangi", "email": "joy.mwangi@company.com", "job_title_keys": ["SEO Analyst", "Marketing Specialist", "Content Creator"]},
-            ],
-        },
-        "HR": {
-            "manager": {"first": "Faith", "last": "Mugo", "email": "faith.mugo@company.com", "job_title_key": "HR Officer"},
-            "employees": [
-                {"first": "Kevin", "last": "Odhiambo", "email": "kevin.odhiambo@company.com", "job_title_keys": ["HR Assistant", "Recruitment Specialist", "Payroll Administrator"]},
-                {"first": "Linda", "last": "Omondi", "email": "linda.omondi@company.com", "job_title_keys": ["Recruitment Specialist", "HR Assistant", "Recruitment Specialist"]},
-                {"first": "Martin", "last": "Chege", "email": "martin.chege@company.com", "job_title_keys": ["Payroll Administrator", "HR Assistant", "Recruitment Specialist"]},
-            ],
-        },
-        "Finance": {
-            "manager": {"first": "Peter", "last": "Koech", "email": "peter.koech@company.com", "job_title_key": "Finance Manager"},
-            "employees": [
-                {"first": "Nancy", "last": "Muthoni", "email": "nancy.muthoni@company.com", "job_title_keys": ["Accountant", "Financial Analyst", "Auditor"]},
-                {"first": "Oscar", "last": "Ochieng", "email": "oscar.ochieng@company.com", "job_title_keys": ["Financial Analyst", "Accountant", "Financial Analyst"]},
-                {"first": "Paula", "last": "Nyambura", "email": "paula.nyambura@company.com", "job_title_keys": ["Auditor", "Accountant", "Financial Analyst"]},
-            ],
-        },
-        "Support": {
-            "manager": {"first": "Quincy", "last": "Njiru", "email": "quincy.njiru@company.com", "job_title_key": "Support Manager"},
-            "employees": [
-                {"first": "Rachel", "last": "Wafula", "email": "rachel.wafula@company.com", "job_title_keys": ["Support Agent", "Customer Success Rep", "Technical Support"]},
-                {"first": "Steve", "last": "Musyoka", "email": "steve.musyoka@company.com", "job_title_keys": ["Customer Success Rep", "Support Agent", "Customer Success Rep"]},
-                {"first": "Tina", "last": "Kiplagat", "email": "tina.kiplagat@company.com", "job_title_keys": ["Technical Support", "Support Agent", "Customer Success Rep"]},
-            ],
-        },
-    }
-
-    for dept_name, team in structure.items():
-        dept = departments[dept_name]
-
-        # Manager creation
-        m_data = team["manager"]
-        current_manager_job_title = titles[m_data["job_title_key"]] # Get the specific job title for the manager
-        user_role_for_manager = hr_type if dept_name == "HR" else manager_type # Assign HR user type to HR manager
-
-        manager = Employee(
-            first_name=m_data["first"],
-            last_name=m_data["last"],
-            email=m_data["email"],
-            phone=f"07{phone_counter:08d}", # Assign unique phone number
-            department=dept,
-            user_type=user_role_for_manager,
-            job_title=current_manager_job_title,
-        )
-        manager.set_password("password123")
-        db.session.add(manager)
+"""Seed the database with the named staff plus as much synthetic data as asked for.
+
+    python seed.py [--departments 5] [--employees 20] [--reviews-per-employee 3]
+                   [--attendance-days 0] [--seed 42] [--until YYYY-MM-DD]
+
+The five original departments and their 20 named people (faith.mugo is HR,
+alice.ngugi a Manager, brian.mutua an Employee...; every password is
+password123) are always created, so the defaults reproduce the hand-written
+seed. --departments and --employees are totals: anything above the named set
+is generated with Faker. Each generated department gets a Manager; reviews are
+annual, attendance covers the last N weekdays up to --until (default today).
+
+Rows go in with executemany inserts in one transaction, every account shares
+one precomputed password hash, and the same --seed always produces the same
+data, so a 100k-employee / million-review database takes seconds, not hours.
+Search terms, review projections and attendance rollups are rebuilt once
+from the inserted rows.
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, time as clock, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, insert
+
+from app import create_app
+from models import (
+    db, Department, UserType, JobTitle, Employee, PerformanceReview, ReviewProjection, Attendance,
+    AttendanceMonth, AttendanceDepartmentDay, EmployeeSearchTerm, refresh_review_projection,
+    refresh_employee_search, rebuild_attendance_rollups, bump_table_versions,
+)
+from hashing import hash_password
+
+PASSWORD = "password123"
+
+# ===========================
+# Named staff
+# ===========================
+# department: (description, job titles, [(first, last, job title), ...]);
+# the first person is the department's manager (HR's is the HR user)
+STAFF = {
+    "Engineering": ("Builds software",
+        ["Engineering Manager", "Software Engineer", "QA Engineer", "DevOps Engineer", "Product Manager"],
+        [("Alice", "Ngugi", "Engineering Manager"), ("Brian", "Mutua", "Software Engineer"),
+         ("Carol", "Wambui", "Software Engineer"), ("David", "Otieno", "QA Engineer")]),
+    "Marketing": ("Promotes products",
+        ["Marketing Manager", "Marketing Specialist", "Content Creator", "SEO Analyst", "Social Media Coordinator"],
+        [("Grace", "Kariuki", "Marketing Manager"), ("Helen", "Njeri", "Marketing Specialist"),
+         ("Ian", "Kimani", "Social Media Coordinator"), ("Joy", "Mwangi", "Content Creator")]),
+    "HR": ("Manages people",
+        ["HR Officer", "HR Assistant", "Recruitment Specialist", "Payroll Administrator"],
+        [("Faith", "Mugo", "HR Officer"), ("Kevin", "Odhiambo", "HR Assistant"),
+         ("Linda", "Omondi", "HR Assistant"), ("Martin", "Chege", "Recruitment Specialist")]),
+    "Finance": ("Handles money",
+        ["Finance Manager", "Accountant", "Financial Analyst", "Auditor"],
+        [("Peter", "Koech", "Finance Manager"), ("Nancy", "Muthoni", "Accountant"),
+         ("Oscar", "Ochieng", "Accountant"), ("Paula", "Nyambura", "Financial Analyst")]),
+    "Support": ("Helps customers",
+        ["Support Manager", "Support Agent", "Customer Success Rep", "Technical Support"],
+        [("Quincy", "Njiru", "Support Manager"), ("Rachel", "Wafula", "Support Agent"),
+         ("Steve", "Musyoka", "Support Agent"), ("Tina", "Kiplagat", "Customer Success Rep")]),
+}
+
+USER_TYPES = [
+    {"id": 1, "name": "Manager", "description": "Oversees department"},
+    {"id": 2, "name": "Employee", "description": "General staff"},
+    {"id": 3, "name": "HR", "description": "Manages human resources"},
+]
+MANAGER, EMPLOYEE, HR = 1, 2, 3
+
+GENERATED_DEPARTMENTS = [
+    "Operations", "Sales", "Legal", "Research", "Procurement", "Logistics", "Security",
+    "Facilities", "IT", "Compliance", "Design", "Data", "Partnerships", "Training", "Quality",
+]
+GENERATED_ROLES = ["Manager", "Associate", "Specialist", "Analyst", "Coordinator"]
+
+REVIEW_NOTES = [
+    "Performance review for {year}. Doing well overall.",
+    "Performance review for {year}. Consistently exceeds expectations.",
+    "Performance review for {year}. Meets expectations, room to grow.",
+    "Performance review for {year}. Needs improvement on delivery.",
+]
+RATING_WEIGHTS = [3, 10, 35, 37, 15]  # ratings 1..5
+
+
+SEEDED = (UserType, JobTitle, Department, Employee, PerformanceReview, Attendance)
+
+
+def make_email(*parts):
+    local = ".".join(str(p) for p in parts).lower()
+    return "".join(c for c in local if c.isalnum() or c == ".") + "@company.com"
+
+
+def clear():
+    # Core deletes: no per-row ORM hooks, children before parents
+    for model in (EmployeeSearchTerm, ReviewProjection, PerformanceReview, AttendanceMonth, AttendanceDepartmentDay,
+                  Attendance, Employee, JobTitle, Department, UserType):
+        db.session.execute(delete(model.__table__))
+
+
+def insert_rows(model, rows, batch_size):
+    batch, count = [], 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            db.session.execute(insert(model.__table__), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(model.__table__), batch)
+        count += len(batch)
+    return count
+
+
+def plan_departments(total):
+    """[(name, description, job titles)] for the named departments plus generated ones."""
+    departments = [(name, description, titles) for name, (description, titles, _) in STAFF.items()]
+    for n in range(max(total - len(departments), 0)):
+        base = GENERATED_DEPARTMENTS[n % len(GENERATED_DEPARTMENTS)]
+        name = base if n < len(GENERATED_DEPARTMENTS) else f"{base} {n // len(GENERATED_DEPARTMENTS) + 1}"
+        departments.append((name, f"{name} department", [f"{name} {role}" for role in GENERATED_ROLES]))
+    return departments
+
+
+def generate(departments, employees, reviews_per_employee, attendance_days, seed, until, batch_size):
+    from faker import Faker  # ~150 ms to import; only needed when generating
+
+    rng = random.Random(seed)
+    fake = Faker("en_KE")
+    fake.seed_instance(seed)
+    first_names = sorted({fake.first_name() for _ in range(2000)})
+    last_names = sorted({fake.last_name() for _ in range(2000)})
+
+    password_hash = hash_password(PASSWORD, current_app.config["BCRYPT_LOG_ROUNDS"])
+    phone_counter = 700000000 - 1  # + employee id
+
+    # --- Reference data ---
+    plan = plan_departments(departments)
+    department_rows, title_rows = [], []
+    title_ids = {}
+    for department_id, (name, description, titles) in enumerate(plan, start=1):
+        department_rows.append({"id": department_id, "name": name, "description": description})
+        for title in titles:
+            title_ids[title] = len(title_ids) + 1
+            title_rows.append({"id": title_ids[title], "title": title})
+
+    insert_rows(UserType, USER_TYPES, batch_size)
+    insert_rows(JobTitle, title_rows, batch_size)
+    insert_rows(Department, department_rows, batch_size)
+
+    # --- Employees ---
+    # Reviews and attendance need each employee's department/manager/role; keep
+    # just that, not the rows
+    department_of = [None]  # employee id -> department id (index 0 unused)
+    user_type_of = [None]
+    manager_name = {}  # department id -> "First Last"
+
+    def employee_rows():
+        for department_id, (name, _, titles) in enumerate(plan, start=1):
+            if name in STAFF:
+                people = STAFF[name][2]
+            else:
+                people = [(rng.choice(first_names), rng.choice(last_names), titles[0])]
+            for position, (first, last, title) in enumerate(people):
+                user_type = (HR if name == "HR" else MANAGER) if position == 0 else EMPLOYEE
+                if position == 0:
+                    manager_name[department_id] = f"{first} {last}"
+                employee_id = len(department_of)
+                department_of.append(department_id)
+                user_type_of.append(user_type)
+                yield {
+                    "id": employee_id, "first_name": first, "last_name": last,
+                    "email": make_email(first, last) if name in STAFF else make_email(first, last, employee_id),
+                    "phone": f"07{phone_counter + employee_id:08d}", "hire_date": datetime(until.year - 1, 1, 1),
+                    "password_hash": password_hash, "department_id": department_id,
+                    "user_type_id": user_type, "job_title_id": title_ids[title],
+                }
+
+        for employee_id in range(len(department_of), employees + 1):
+            department_id = rng.randint(1, len(plan))
+            titles = plan[department_id - 1][2]
+            first, last = rng.choice(first_names), rng.choice(last_names)
+            department_of.append(department_id)
+            user_type_of.append(EMPLOYEE)
+            yield {
+                "id": employee_id, "first_name": first, "last_name": last,
+                "email": make_email(first, last, employee_id), "phone": f"07{phone_counter + employee_id:08d}",
+                "hire_date": datetime(until.year - rng.randint(1, 10), rng.randint(1, 12), rng.randint(1, 28)),
+                "password_hash": password_hash, "department_id": department_id,
+                "user_type_id": EMPLOYEE, "job_title_id": title_ids[rng.choice(titles[1:])],
+            }
+
+    yield "employees", insert_rows(Employee, employee_rows(), batch_size)
+
+    refresh_employee_search(db.session.connection())
+    yield "employee_search_terms", db.session.query(EmployeeSearchTerm).count()
+
+    # --- Performance reviews: one per year, written by the department's manager ---
+    years = range(until.year - reviews_per_employee, until.year)
+
+    def review_rows():
+        for employee_id in range(1, len(department_of)):
+            if user_type_of[employee_id] != EMPLOYEE:
+                continue
+            reviewer = manager_name[department_of[employee_id]]
+            for year in years:
+                yield {
+                    "employee_id": employee_id, "reviewer": reviewer,
+                    "notes": rng.choice(REVIEW_NOTES).format(year=year),
+                    "rating": rng.choices(range(1, 6), RATING_WEIGHTS)[0],
+                    "review_date": datetime(year, 5, 20),
+                }
+
+    yield "performance_reviews", insert_rows(PerformanceReview, review_rows(), batch_size)
+
+    connection = db.session.connection()
+    refresh_review_projection(connection)
+    yield "review_projections", db.session.query(ReviewProjection).count()
+
+    # --- Attendance: the last N weekdays, ~5% absences ---
+    days, day = [], until
+    while len(days) < attendance_days:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= timedelta(days=1)
+    days.reverse()
+
+    def attendance_rows():
+        for employee_id in range(1, len(department_of)):
+            for day in days:
+                if rng.random() < 0.05:
+                    continue
+                check_in = 7 * 60 + 30 + rng.randint(0, 120)
+                check_out = check_in + 8 * 60 + rng.randint(0, 90)
+                yield {
+                    "employee_id": employee_id, "date": day,
+                    "check_in_time": clock(check_in // 60, check_in % 60),
+                    "check_out_time": clock(check_out // 60, check_out % 60),
+                }
+
+    yield "attendances", insert_rows(Attendance, attendance_rows(), batch_size)
+
+    rebuild_attendance_rollups(connection)
+    yield "attendance_months", db.session.query(AttendanceMonth).count()
+
+    # Core inserts skip the ORM flush hooks; invalidate every cached view explicitly
+    bump_table_versions(connection, [model.__tablename__ for model in SEEDED])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--departments", type=int, default=len(STAFF))
+    parser.add_argument("--employees", type=int, default=sum(len(people) for _, _, people in STAFF.values()))
+    parser.add_argument("--reviews-per-employee", type=int, default=3)
+    parser.add_argument("--attendance-days", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--until", type=date.fromisoformat, default=date.today(),
+                        help="last review year + 1 and last attendance day (default: today)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with create_app().app_context():
+        start = time.perf_counter()
+        print("Seeding...")
+        clear()
+        for table, count in generate(args.departments, args.employees, args.reviews_per_employee,
+                                 args.attendance_days, args.seed, args.until, args.batch_size):
+            print(f"  {table:<20}{count:>10}  ({time.perf_counter() - start:.1f}s)")
         db.session.commit()
-        phone_counter += 1 # Increment phone counter for the next employee
-
-        # Employee creation + Reviews
-        job_title_index = 0 # Used to cycle through the job titles for employees within a department
-        for emp_data in team["employees"]:
-            # Get specific job title for employee, cycling through the list of job_title_keys
-            emp_job_title_key = emp_data["job_title_keys"][job_title_index % len(emp_data["job_title_keys"])]
-            emp_job_title = titles[emp_job_title_key]
-
-            emp = Employee(
-                first_name=emp_data["first"],
-                last_name=emp_data["last"],
-                email=emp_data["email"],
-                phone=f"07{phone_counter:08d}", # Assign unique phone number
-                department=dept,
-                user_type=employee_type, # All non-managers are 'Employee' user type by default
-                job_title=emp_job_title,
-            )
-            emp.set_password("password123")
-            db.session.add(emp)
-            db.session.commit()
-            phone_counter += 1 # Increment phone counter for the next employee
-            job_title_index += 1 # Move to the next job title for cycling
-
-            # Add 3 performance reviews for each employee
-            for y in [2022, 2023, 2024]:
-                review = PerformanceReview(
-                    employee=emp,
-                    reviewer=f"{m_data['first']} {m_data['last']}", # Reviewer is the manager of their department
-                    notes=f"Performance review for {y}. Doing well overall.",
-                    rating=4 if y != 2023 else 5, # Example: higher rating in 2023
-                    review_date=datetime(y, 5, 20),
-                )
-                db.session.add(review)
-
-    db.session.commit()
-    print("✅ Manual seed complete.")
+        print(f"✅ Seed complete in {time.perf_counter() - start:.1f}s.")
+
 
+if __name__ == "__main__":
+    main()
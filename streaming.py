@@ -0,0 +1,41 @@
+from flask import Response, current_app, request, stream_with_context
+
+from pagination import keyset
+
+# ===========================
+# NDJSON streaming
+# ===========================
+# Opt-in with "Accept: application/x-ndjson". Rows are read in batches with
+# yield_per (a server-side cursor on backends that support it) and written out
+# one JSON object per line as they are serialized, so memory stays flat and the
+# client gets the first rows before the query has finished.
+NDJSON = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500
+
+
+def wants_stream():
+    return request.accept_mimetypes.best_match(["application/json", NDJSON]) == NDJSON
+
+
+def stream(query, key, serialize, batch_size=STREAM_BATCH_SIZE):
+    """Stream query rows as NDJSON, ordered by key.
+
+    ?cursor= and ?limit= still narrow the window (start after / at most N rows),
+    but a stream is not paged: there is no next-cursor header.
+    """
+    query, limit = keyset(query, key)
+    if limit is not None:
+        query = query.limit(limit)
+    dumps = current_app.json.dumps
+
+    def generate():
+        lines = []
+        for row in query.yield_per(batch_size):
+            lines.append(dumps(serialize(row)))
+            if len(lines) >= batch_size:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON)
@@ -0,0 +1,65 @@
+import os
+import sys
+
+os.environ.setdefault("JWT_SECRET", "test-secret-key-that-is-long-enough-for-hs256")
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from app import create_app  # noqa: E402
+from models import db, Department, Employee, JobTitle, PerformanceReview, UserType  # noqa: E402
+
+PASSWORD = "password123"
+
+
+def make_app(path, **config):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}", "TESTING": True, **config})
+    with app.app_context():
+        db.create_all(bind_key=None)  # the primary only; a replica bind is a copy of it
+        for id, name in ((1, "Manager"), (2, "Employee"), (3, "HR")):
+            db.session.add(UserType(id=id, name=name))
+        db.session.add(Department(id=1, name="Human Resources"))
+        db.session.add(JobTitle(id=1, title="HR Officer"))
+        db.session.flush()
+        add_employee("hr@company.com", user_type_id=3, department_id=1, job_title_id=1)
+        db.session.commit()
+    return app
+
+
+def add_employee(email, user_type_id=2, department_id=1, job_title_id=1, password=PASSWORD):
+    """Add an employee to the current session (inside an app context)."""
+    first, _, last = email.partition("@")[0].partition(".")
+    employee = Employee(first_name=first.title(), last_name=(last or "Test").title(), email=email,
+                        user_type_id=user_type_id, department_id=department_id, job_title_id=job_title_id)
+    employee.set_password(password)
+    db.session.add(employee)
+    return employee
+
+
+def add_review(employee_id, rating, review_date, reviewer="Test Manager", notes=None):
+    review = PerformanceReview(employee_id=employee_id, rating=rating, review_date=review_date,
+                               reviewer=reviewer, notes=notes)
+    db.session.add(review)
+    return review
+
+
+def login(client, email="hr@company.com", password=PASSWORD):
+    response = client.post("/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200, response.json
+    return {"Authorization": f"Bearer {response.json['access_token']}"}
+
+
+@pytest.fixture
+def app(tmp_path):
+    return make_app(tmp_path / "app.db")
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def hr(client):
+    return login(client)
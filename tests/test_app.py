@@ -0,0 +1,27 @@
+from conftest import login, make_app
+from models import db, JobTitle
+
+
+def test_apps_do_not_share_caches_or_metrics(tmp_path):
+    # Same writes in the same order: both databases end up with equal table versions
+    apps = {}
+    for title in ("Payroll Clerk", "Recruiter"):
+        app = apps[title] = make_app(tmp_path / f"{title}.db")
+        with app.app_context():
+            db.session.add(JobTitle(title=title))
+            db.session.commit()
+
+    for title, app in apps.items():
+        client = app.test_client()
+        response = client.get("/job-titles", headers=login(client))
+        assert response.status_code == 200
+        assert sorted(item["title"] for item in response.json) == ["HR Officer", title]
+
+    first, second = apps.values()
+    assert first.extensions["refcache"] is not second.extensions["refcache"]
+    assert first.extensions["compressed_bodies"] is not second.extensions["compressed_bodies"]
+
+    first.test_client().get("/metrics")
+    metrics = second.test_client().get("/metrics").get_data(as_text=True)
+    assert 'route="/job-titles"' in metrics
+    assert 'route="/metrics"' not in metrics
@@ -0,0 +1,24 @@
+from datetime import date, time
+
+from conftest import add_employee
+from models import db, Attendance, AttendanceMonth, Department
+
+
+def test_month_rollup_follows_the_employee_to_a_new_department(app):
+    with app.app_context():
+        db.session.add(Department(id=2, name="Audit"))
+        employee = add_employee("mover.one@company.com", department_id=1)
+        db.session.flush()
+        db.session.add(Attendance(employee_id=employee.id, date=date(2025, 3, 3),
+                                  check_in_time=time(8), check_out_time=time(17)))
+        db.session.commit()
+
+        employee.department_id = 2
+        db.session.add(Attendance(employee_id=employee.id, date=date(2025, 3, 4),
+                                  check_in_time=time(8), check_out_time=time(16)))
+        db.session.commit()
+
+        month = db.session.get(AttendanceMonth, (employee.id, date(2025, 3, 1)))
+        assert month.department_id == 2
+        assert month.days_present == 2
+        assert month.minutes == 17 * 60
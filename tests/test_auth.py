@@ -0,0 +1,89 @@
+from flask_jwt_extended import create_access_token, decode_token
+from sqlalchemy import event
+
+from conftest import PASSWORD, add_employee, login, make_app
+from hashing import hash_password
+from models import db, Employee, TableVersion
+
+
+def test_login_rehash_keeps_table_versions(tmp_path):
+    app = make_app(tmp_path / "app.db", BCRYPT_LOG_ROUNDS=5)
+    with app.app_context():
+        employee = add_employee("old.hash@company.com")
+        employee.password_hash = hash_password(PASSWORD, 4)
+        db.session.commit()
+        old_hash = employee.password_hash
+        versions = dict(db.session.query(TableVersion.name, TableVersion.version))
+
+    client = app.test_client()
+    login(client, "old.hash@company.com")
+
+    with app.app_context():
+        employee = db.session.get(Employee, employee.id)
+        assert employee.password_hash != old_hash
+        assert employee.password_hash.startswith("$2b$05$")
+        assert dict(db.session.query(TableVersion.name, TableVersion.version)) == versions
+
+
+def test_token_errors_get_their_handlers_without_propagating_exceptions(tmp_path):
+    app = make_app(tmp_path / "app.db", TESTING=False)
+    client = app.test_client()
+
+    response = client.get("/employees")
+    assert response.status_code == 401
+    assert response.json["message"] == "Authorization required"
+    response = client.get("/employees", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 422
+    assert response.json["message"] == "Invalid token"
+    assert client.get("/employees", headers=login(client)).status_code == 200
+
+
+def test_token_carries_role_and_department(app, client):
+    with app.app_context():
+        add_employee("staff.one@company.com", user_type_id=2, department_id=1)
+        db.session.commit()
+    headers = login(client, "staff.one@company.com")
+    with app.app_context():
+        claims = decode_token(headers["Authorization"].split()[1])
+    assert (claims["role"], claims["department_id"]) == ("Employee", 1)
+
+
+def test_role_checks_do_not_load_the_user(app, client):
+    with app.app_context():
+        add_employee("staff.one@company.com")
+        db.session.commit()
+        engine = db.engine
+    headers = login(client, "staff.one@company.com")
+    assert client.get("/employees", headers=headers).status_code == 403  # claims checked once
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert client.get("/employees", headers=headers).status_code == 403
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert not [sql for sql in statements if "FROM employees" in sql]
+
+
+def test_role_change_invalidates_old_tokens(app, client, hr):
+    with app.app_context():
+        employee = add_employee("staff.one@company.com")
+        db.session.commit()
+        employee_id = employee.id
+    headers = login(client, "staff.one@company.com")
+    assert client.get("/employees", headers=headers).status_code == 403
+
+    with app.app_context():
+        db.session.get(Employee, employee_id).user_type_id = 3
+        db.session.commit()
+    response = client.get("/employees", headers=headers)
+    assert response.status_code == 401
+    assert response.json["message"] == "Token claims are out of date, please log in again"
+    assert client.get("/employees", headers=login(client, "staff.one@company.com")).status_code == 200
+
+
+def test_tokens_without_claims_fall_back_to_the_database(app, client):
+    with app.app_context():
+        token = create_access_token(identity=1)  # the HR user, issued before claims existed
+    assert client.get("/employees", headers={"Authorization": f"Bearer {token}"}).status_code == 200
@@ -0,0 +1,89 @@
+import gzip
+import json
+import zlib
+
+import pytest
+
+import compression
+from conftest import add_employee
+from models import db
+
+
+@pytest.fixture
+def staff(app):
+    """Enough employees for /employees to pass COMPRESS_MIN_BYTES."""
+    with app.app_context():
+        for i in range(30):
+            add_employee(f"staff.{i}@company.com")
+        db.session.commit()
+
+
+def get(client, headers, path="/employees", encoding=None, **extra):
+    if encoding:
+        extra["Accept-Encoding"] = encoding
+    return client.get(path, headers={**headers, **extra})
+
+
+def vary(response):
+    return {value.strip() for value in response.headers.get("Vary", "").split(",")}
+
+
+def test_gzip_body_and_etag(client, hr, staff):
+    plain = get(client, hr)
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in vary(plain)
+    assert len(plain.get_data()) >= compression.COMPRESS_MIN_BYTES
+
+    compressed = get(client, hr, encoding="gzip")
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+    # Served from the compressed body cache the second time, byte for byte
+    assert get(client, hr, encoding="gzip").get_data() == compressed.get_data()
+
+
+def test_brotli_is_preferred_unless_weighted_down(client, hr, staff):
+    brotli = pytest.importorskip("brotli")
+    plain = get(client, hr)
+    compressed = get(client, hr, encoding="gzip, deflate, br")
+    assert compressed.headers["Content-Encoding"] == "br"
+    assert compressed.headers["ETag"].endswith('-br"')
+    assert brotli.decompress(compressed.get_data()) == plain.get_data()
+    assert get(client, hr, encoding="br;q=0.5, gzip").headers["Content-Encoding"] == "gzip"
+
+
+def test_unknown_encodings_and_small_bodies_go_out_as_they_are(client, hr, staff):
+    assert "Content-Encoding" not in get(client, hr, encoding="compress").headers
+    small = get(client, hr, path="/departments", encoding="gzip")
+    assert len(small.get_data()) < compression.COMPRESS_MIN_BYTES
+    assert "Content-Encoding" not in small.headers
+    assert "Accept-Encoding" in vary(small)
+
+
+def test_revalidating_a_compressed_copy(client, hr, staff):
+    etag = get(client, hr, encoding="gzip").headers["ETag"]
+    response = get(client, hr, encoding="gzip", **{"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert "Accept-Encoding" in vary(response)
+
+    # The identity copy still matches when the client asks for it plainly
+    identity = get(client, hr, **{"If-None-Match": etag})
+    assert identity.status_code == 304
+    assert not identity.headers["ETag"].endswith('-gzip"')
+
+
+def test_ndjson_streams_are_compressed_chunk_by_chunk(client, hr, staff):
+    response = client.get("/employees", buffered=False,
+                          headers={**hr, "Accept": "application/x-ndjson", "Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+
+    decompressor = zlib.decompressobj(31)
+    chunks = iter(response.response)
+    # Each chunk is flushed, so the first rows decode before the stream ends
+    first = decompressor.decompress(next(chunks))
+    assert first.endswith(b"\n") and json.loads(first.splitlines()[0])["id"] == 1
+    rest = b"".join(decompressor.decompress(chunk) for chunk in chunks) + decompressor.flush()
+    response.close()
+    assert len((first + rest).splitlines()) == 31
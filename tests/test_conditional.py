@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from werkzeug.http import http_date, parse_date
+
+from conftest import create_app, login, make_app
+from models import db, JobTitle, TableVersion
+
+
+# user types embed their employees' job title names
+@pytest.mark.parametrize("path", ["/job-titles", "/job-titles/1", "/user-types"])
+def test_etag_and_cached_body_come_from_the_same_versions(tmp_path, path):
+    db_path = tmp_path / "app.db"
+    worker = make_app(db_path)
+    other = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}", "TESTING": True})
+    client = worker.test_client()
+    headers = login(client)
+    before = client.get(path, headers=headers)
+
+    # Another worker changes the tables within the reference cache's TTL
+    with other.app_context():
+        JobTitle.query.filter_by(id=1).update({"title": "Head of HR"})
+        db.session.commit()
+    after = client.get(path, headers={**headers, "If-None-Match": before.headers["ETag"]})
+
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert "Head of HR" in after.get_data(as_text=True)
+
+
+def test_json_and_ndjson_have_their_own_etags(client, hr):
+    json = client.get("/employees", headers=hr)
+    ndjson = client.get("/employees", headers={**hr, "Accept": "application/x-ndjson",
+                                               "If-None-Match": json.headers["ETag"]})
+    assert ndjson.status_code == 200
+    assert ndjson.mimetype == "application/x-ndjson"
+    assert ndjson.headers["ETag"] != json.headers["ETag"]
+    assert {"Accept", "Authorization"} <= {value.strip() for value in json.headers["Vary"].split(",")}
+
+
+def set_versions_updated_at(app, updated_at):
+    with app.app_context():
+        TableVersion.query.update({"updated_at": updated_at})
+        db.session.commit()
+
+
+def test_last_modified_waits_for_the_newest_writes_second_to_end(app, client, hr):
+    # A write in the current second: another may still land under the same date
+    now = datetime.now()
+    set_versions_updated_at(app, now)
+    response = client.get("/job-titles", headers=hr)
+    assert response.status_code == 200
+    assert "Last-Modified" not in response.headers
+    later = http_date(datetime.now(timezone.utc) + timedelta(seconds=5))
+    revalidated = client.get("/job-titles", headers={**hr, "If-Modified-Since": later})
+    assert revalidated.status_code == 200
+
+    earlier = now - timedelta(seconds=10, microseconds=1)
+    set_versions_updated_at(app, earlier)
+    response = client.get("/job-titles", headers=hr)
+    last_modified = response.headers["Last-Modified"]
+    assert parse_date(last_modified) == earlier.astimezone(timezone.utc).replace(microsecond=0)
+    revalidated = client.get("/job-titles", headers={**hr, "If-Modified-Since": last_modified})
+    assert revalidated.status_code == 304
@@ -0,0 +1,49 @@
+import shutil
+
+from conftest import create_app, login, make_app
+from database import route_reads
+from models import db, Department
+
+
+def replica_app(tmp_path):
+    """An app whose replica is a copy of the primary taken before "Primary Only" was added."""
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    with make_app(primary).app_context():
+        db.engine.dispose()  # checkpoint the WAL into the file being copied
+    shutil.copy(primary, replica)
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{primary}", "TESTING": True,
+                      "SQLALCHEMY_BINDS": {"replica": f"sqlite:///{replica}"}})
+    with app.app_context():
+        db.session.add(Department(id=2, name="Primary Only"))
+        db.session.commit()
+    return app
+
+
+def names(response):
+    return sorted(item["name"] for item in response.json)
+
+
+def test_reads_go_to_the_replica_and_writes_to_the_primary(tmp_path):
+    app = replica_app(tmp_path)
+    client = app.test_client()
+    headers = login(client)
+
+    assert names(client.get("/departments", headers=headers)) == ["Human Resources"]
+    response = client.post("/departments", headers=headers, json={"name": "Audit"})
+    assert response.status_code == 201
+    with app.app_context():
+        assert sorted(name for (name,) in db.session.query(Department.name)) == \
+            ["Audit", "Human Resources", "Primary Only"]
+
+
+def test_reads_after_a_write_in_the_same_request_use_the_primary(tmp_path):
+    app = replica_app(tmp_path)
+    with app.test_request_context("/departments", method="GET"):
+        route_reads()
+        assert Department.query.filter_by(name="Primary Only").first() is None  # replica
+
+        db.session.add(Department(name="Audit"))
+        db.session.flush()
+        assert Department.query.filter_by(name="Audit").one().id
+        assert Department.query.filter_by(name="Primary Only").one().id == 2
+        db.session.rollback()
@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import event
+
+from conftest import create_app, login, make_app
+from models import db, Department, Employee, JobTitle
+from refcache import warm_reference_data
+
+
+def new_employee(email, **fields):
+    return {"first_name": "New", "last_name": "Hire", "email": email, "password": "password123",
+            "user_type_name": "Employee", "job_title_name": "Auditor", "department_id": 2, **fields}
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_create_sees_reference_rows_added_by_another_worker(tmp_path, bulk):
+    path = tmp_path / "app.db"
+    worker = make_app(path)
+    other = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}", "TESTING": True})
+    client = worker.test_client()
+    headers = login(client)
+    with worker.app_context():
+        warm_reference_data()
+
+    with other.app_context():
+        db.session.add(Department(id=2, name="Audit"))
+        db.session.add(JobTitle(title="Auditor"))
+        db.session.commit()
+
+    if bulk:
+        response = client.post("/employees/bulk", headers=headers, json=[new_employee("new.hire@company.com")])
+        assert response.status_code == 201, response.json
+        response = client.get(f"/employees/{response.json['results'][0]['id']}", headers=headers)
+    else:
+        response = client.post("/employees", headers=headers, json=new_employee("new.hire@company.com"))
+        assert response.status_code == 201, response.json
+    assert response.json["department_name"] == "Audit"
+    assert response.json["job_title_name"] == "Auditor"
+    with worker.app_context():
+        assert JobTitle.query.filter_by(title="Auditor").count() == 1
+
+
+def test_bulk_import_reports_bad_rows_and_returns_ids(app, client, hr):
+    with app.app_context():
+        db.session.add(Department(id=2, name="Audit"))
+        db.session.commit()
+    rows = [
+        new_employee("first.hire@company.com"),
+        new_employee(12345),
+        new_employee("null.title@company.com", job_title_name=None),
+        new_employee("list.title@company.com", job_title_name=["Auditor"]),
+        new_employee("bad.department@company.com", department_id={"id": 2}),
+        new_employee("second.hire@company.com", phone="0700000002"),
+    ]
+    response = client.post("/employees/bulk", headers=hr, json=rows)
+    assert response.status_code == 201, response.json
+    results = response.json["results"]
+    assert [r["status"] for r in results] == ["created", "error", "error", "error", "error", "created"]
+    assert results[1]["error"] == "Expected text for: email"
+    assert results[2]["error"] == "Missing fields: job_title_name"
+    assert results[3]["error"] == "Expected text for: job_title_name"
+    assert results[4]["error"] == "Invalid Department ID"
+    for result in (results[0], results[5]):
+        detail = client.get(f"/employees/{result['id']}", headers=hr)
+        assert detail.json["department_name"] == "Audit"
+
+
+def test_bulk_import_hashes_before_it_writes(app, client, hr, monkeypatch):
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    hash_passwords = Employee.hash_passwords
+    writes_before_hashing = []
+    def hash_and_note(raw_passwords):
+        writes_before_hashing.extend(s for s in statements if not s.lstrip().upper().startswith("SELECT"))
+        return hash_passwords(raw_passwords)
+    monkeypatch.setattr(Employee, "hash_passwords", staticmethod(hash_and_note))
+
+    with app.app_context():
+        db.session.add(Department(id=2, name="Audit"))
+        db.session.commit()
+        event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.post("/employees/bulk", headers=hr,
+                               json=[new_employee("first.hire@company.com", job_title_name="New Title")])
+    finally:
+        with app.app_context():
+            event.remove(db.engine, "before_cursor_execute", record)
+    assert response.status_code == 201, response.json
+    assert writes_before_hashing == []
+    assert any(s.startswith("INSERT INTO job_titles") for s in statements)
@@ -0,0 +1,32 @@
+import pytest
+
+
+@pytest.mark.parametrize("path, fields", [
+    ("/employees", ["id", "email"]),
+    ("/employees/1", ["id", "department_name"]),
+    ("/departments", ["id", "manager_name"]),
+    ("/departments/1", ["name"]),
+    ("/user-types", ["id", "name"]),
+    ("/user-types?limit=2", ["name", "employees"]),
+    ("/user-types?limit=2", ["id"]),
+    ("/user-types/3", ["description"]),
+    ("/job-titles", ["title"]),
+    ("/job-titles?limit=2", ["id", "title"]),
+    ("/job-titles/1", ["id", "employees"]),
+])
+def test_fields_selects_fields(client, hr, path, fields):
+    separator = "&" if "?" in path else "?"
+    response = client.get(f"{path}{separator}fields={','.join(fields)}", headers=hr)
+    assert response.status_code == 200, response.json
+    items = response.json if isinstance(response.json, list) else [response.json]
+    assert items and all(sorted(item) == sorted(fields) for item in items)
+
+
+@pytest.mark.parametrize("path", ["/employees", "/employees/1", "/reviews", "/attendance", "/departments",
+                                  "/departments/1", "/user-types", "/user-types/1", "/job-titles",
+                                  "/job-titles?limit=2", "/job-titles/1"])
+def test_unknown_fields_are_rejected(client, hr, path):
+    separator = "&" if "?" in path else "?"
+    response = client.get(f"{path}{separator}fields=id,salary", headers=hr)
+    assert response.status_code == 400
+    assert "salary" in response.json["error"]
@@ -0,0 +1,82 @@
+import json
+import logging
+
+import pytest
+
+import metrics
+from conftest import PASSWORD
+
+
+def scrape(client, **headers):
+    response = client.get("/metrics", headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    samples = {}
+    for line in response.get_data(as_text=True).splitlines():
+        if line and not line.startswith("#"):
+            series, _, value = line.rpartition(" ")
+            samples[series] = float(value)
+    return samples
+
+
+DETAIL = 'method="GET",route="/employees/<int:id>"'
+
+
+def test_requests_are_labelled_by_route_and_status(client, hr):
+    for id in (1, 1, 999):
+        client.get(f"/employees/{id}", headers=hr)
+    samples = scrape(client)
+
+    assert samples[f'http_requests_total{{{DETAIL},status="200"}}'] == 2
+    assert samples[f'http_requests_total{{{DETAIL},status="404"}}'] == 1
+    assert not any("/employees/1" in series for series in samples)
+    assert samples[f"http_request_duration_seconds_count{{{DETAIL}}}"] == 3
+    assert samples[f'http_request_duration_seconds_bucket{{{DETAIL},le="+Inf"}}'] == 3
+    # Every detail request looks up the caller and the employee
+    assert samples[f"http_request_db_statements_sum{{{DETAIL}}}"] >= 6
+    assert samples[f'http_request_db_statements_bucket{{{DETAIL},le="0"}}'] == 0
+    buckets = [value for series, value in samples.items()
+               if series.startswith(f"http_request_duration_seconds_bucket{{{DETAIL}")]
+    assert buckets == sorted(buckets)
+
+
+def test_streamed_bodies_are_counted_as_sent(client, hr):
+    response = client.get("/employees", headers={**hr, "Accept": "application/x-ndjson"})
+    assert response.is_streamed
+    size = len(response.get_data())
+    samples = scrape(client)
+    assert samples['http_response_size_bytes_sum{method="GET",route="/employees"}'] == size
+
+
+def test_slow_queries_are_counted_and_logged_without_parameters(client, monkeypatch, caplog):
+    monkeypatch.setattr(metrics, "SLOW_QUERY_SECONDS", 0)
+    with caplog.at_level(logging.WARNING, logger="metrics"):
+        response = client.post("/auth/login", json={"email": "hr@company.com", "password": PASSWORD})
+    assert response.status_code == 200
+    samples = scrape(client)
+    assert samples['db_slow_queries_total{method="POST",route="/auth/<string:action>"}'] >= 1
+    slow = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Slow query")]
+    assert slow and not any("hr@company.com" in message for message in slow)
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong", "s3cret"])
+def test_token_is_required_when_set(client, monkeypatch, authorization):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "s3cret")
+    headers = {"Authorization": authorization} if authorization else {}
+    assert client.get("/metrics", headers=headers).status_code == 401
+    samples = scrape(client, Authorization="Bearer s3cret")
+    assert samples['http_requests_total{method="GET",route="/metrics",status="401"}'] == 1
+
+
+def test_snapshots_of_other_workers_are_added_up(app, client, monkeypatch, tmp_path):
+    monkeypatch.setattr(metrics, "METRICS_DIR", str(tmp_path))
+    series = ["GET", "/employees", "200"]
+    (tmp_path / "1-a.json").write_text(json.dumps([["http_requests_total", series, 3]]))
+    (tmp_path / "2-b.json").write_text(json.dumps([["http_requests_total", series, 4],
+                                                   ["dropped_metric", [], 1]]))
+    registry = metrics.Registry()
+    registry.inc("http_requests_total", tuple(series))
+
+    values = metrics.collect(registry)
+    assert values == {("http_requests_total", tuple(series)): 8}
+    assert len(list(tmp_path.glob("*.json"))) == 3  # this process's snapshot was written too
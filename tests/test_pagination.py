@@ -0,0 +1,81 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from conftest import add_employee, add_review
+from models import db, Department
+
+
+def cursor_for(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("path", ["/employees", "/reviews", "/attendance", "/employees/search?q=hr"])
+@pytest.mark.parametrize("cursor", [
+    "not-base64!", cursor_for([1]), cursor_for("k"), cursor_for({"x": 1}),
+    cursor_for({"k": {}}), cursor_for({"k": [1]}), cursor_for({"k": None}), cursor_for({"k": True}),
+    cursor_for({"k": "abc"}),
+])
+def test_tampered_cursors_are_rejected(client, hr, path, cursor):
+    separator = "&" if "?" in path else "?"
+    response = client.get(f"{path}{separator}cursor={cursor}", headers=hr)
+    assert response.status_code == 400
+    assert response.json["error"] == "Invalid cursor"
+
+
+def test_cursor_with_the_key_type_is_accepted(client, hr):
+    response = client.get(f"/employees?cursor={cursor_for({'k': 0})}", headers=hr)
+    assert response.status_code == 200
+    assert [e["id"] for e in response.json] == [1]
+
+
+@pytest.fixture
+def staff(app):
+    """Nine more employees over two departments, each with one review."""
+    with app.app_context():
+        db.session.add(Department(id=2, name="Audit"))
+        db.session.flush()
+        for i in range(2, 11):
+            employee = add_employee(f"staff.{i}@company.com", department_id=1 + i % 2)
+            db.session.flush()
+            add_review(employee.id, 1 + i % 5, datetime(2025, 1, i))
+        db.session.commit()
+
+
+def follow(client, headers, path):
+    pages, links = [], []
+    while path:
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200, response.json
+        pages.append([item["id"] for item in response.json])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor:
+            assert f"cursor={cursor}" in response.headers["Link"]
+            links.append(response.headers["Link"])
+        path = f"{path.split('?')[0]}?limit=4&cursor={cursor}" if cursor else None
+    return pages, links
+
+
+def test_pages_follow_the_cursor_without_gaps_or_repeats(client, hr, staff):
+    pages, links = follow(client, hr, "/employees?limit=4")
+    assert pages == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]]
+    assert len(links) == 2 and all(link.endswith('>; rel="next"') for link in links)
+    assert len(client.get("/employees", headers=hr).json) == 10  # unpaged without ?limit=
+
+
+def test_filters_narrow_the_list(client, hr, staff):
+    employees = client.get("/employees?department_id=2", headers=hr).json
+    assert sorted(e["id"] for e in employees) == [3, 5, 7, 9]
+    reviews = client.get("/reviews?min_rating=2&max_rating=3&from_date=2025-01-02&to_date=2025-01-06",
+                         headers=hr).json
+    assert sorted((r["rating"], r["review_date"][:10]) for r in reviews) == [(2, "2025-01-06"), (3, "2025-01-02")]
+
+
+@pytest.mark.parametrize("query", ["limit=0", "limit=ten", "department_id=x", "from_date=2025-13-01"])
+def test_bad_arguments_are_a_400(client, hr, query):
+    path = "/reviews" if "date" in query else "/employees"
+    response = client.get(f"{path}?{query}", headers=hr)
+    assert response.status_code == 400
+    assert response.json["error"]
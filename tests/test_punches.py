@@ -0,0 +1,95 @@
+import threading
+from datetime import date, datetime, time
+
+from conftest import add_employee, login, make_app
+from models import db, Attendance, AttendanceDepartmentDay, AttendanceMonth, rebuild_attendance_rollups
+from punches import _Job
+
+
+def punch(client, headers, employee_id, punch_type, timestamp):
+    return client.post("/attendance/punches", headers=headers,
+                       json={"employee_id": employee_id, "type": punch_type, "timestamp": timestamp})
+
+
+def rollups():
+    return (sorted((m.employee_id, m.month, m.days_present, m.minutes) for m in AttendanceMonth.query),
+            sorted((d.department_id, d.date, d.present, d.minutes) for d in AttendanceDepartmentDay.query))
+
+
+def test_upsert_keeps_earliest_in_and_latest_out(app, client, hr):
+    with app.app_context():
+        employee = add_employee("punch.one@company.com")
+        db.session.commit()
+        employee_id = employee.id
+
+    for punch_type, timestamp in [("in", "2025-03-03T08:30:00"), ("in", "2025-03-03T08:00:00"),
+                                  ("out", "2025-03-03T17:00:00"), ("out", "2025-03-03T16:00:00"),
+                                  ("in", "2025-03-03T08:00:00")]:
+        assert punch(client, hr, employee_id, punch_type, timestamp).status_code == 200
+
+    with app.app_context():
+        record = Attendance.query.filter_by(employee_id=employee_id).one()
+        assert (record.check_in_time, record.check_out_time) == (time(8), time(17))
+        month = db.session.get(AttendanceMonth, (employee_id, date(2025, 3, 1)))
+        assert (month.days_present, month.minutes) == (1, 9 * 60)
+
+
+def test_concurrent_punches_all_land_and_roll_up(app, hr):
+    with app.app_context():
+        employees = [add_employee(f"punch.{i}@company.com") for i in range(8)]
+        db.session.commit()
+        employee_ids = [employee.id for employee in employees]
+
+    errors = []
+    def worker(employee_id):
+        client = app.test_client()
+        for day in (3, 4):
+            for punch_type, hour in (("in", 8), ("out", 16)):
+                response = punch(client, hr, employee_id, punch_type, f"2025-03-0{day}T{hour:02}:00:00")
+                if response.status_code != 200:
+                    errors.append(response.get_json())
+
+    threads = [threading.Thread(target=worker, args=(employee_id,)) for employee_id in employee_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+    with app.app_context():
+        assert Attendance.query.filter(Attendance.check_out_time == time(16)).count() == 16
+        incremental = rollups()
+        rebuild_attendance_rollups(db.session.connection())
+        db.session.commit()
+        assert rollups() == incremental
+
+
+def test_a_bad_job_does_not_fail_the_rest_of_its_group(app):
+    with app.app_context():
+        employees = [add_employee(f"punch.{name}@company.com") for name in ("first", "second")]
+        db.session.commit()
+        first, second = (employee.id for employee in employees)
+        writer = app.extensions["punch_writer"]
+        good = _Job([(first, "in", datetime(2025, 3, 3, 8))])
+        bad = _Job([(first, "out", "17:00")])  # not a datetime: fails while writing
+        # Queued behind a running write, so the next writer takes all three at once
+        writer._pending.extend([good, bad])
+        writer.write([(second, "in", datetime(2025, 3, 3, 9))])
+
+        assert good.done and good.error is None
+        assert bad.done and isinstance(bad.error, AttributeError)
+        assert sorted((a.employee_id, a.check_in_time, a.check_out_time) for a in Attendance.query) == [
+            (first, time(8), None), (second, time(9), None)]
+
+
+def test_each_app_has_its_own_writer(app, client, hr, tmp_path):
+    other = make_app(tmp_path / "other.db")
+    assert other.extensions["punch_writer"] is not app.extensions["punch_writer"]
+
+    other_client = other.test_client()
+    response = punch(other_client, login(other_client), 1, "in", "2025-03-03T08:00:00")
+    assert response.status_code == 200
+    with other.app_context():
+        assert Attendance.query.count() == 1
+    with app.app_context():
+        assert Attendance.query.count() == 0
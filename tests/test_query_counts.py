@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import event
+
+from conftest import add_employee, login, make_app
+from models import db, Department, JobTitle
+
+PATHS = ["/employees", "/employees?limit=100", "/job-titles?limit=100", "/user-types?limit=100",
+         "/departments"]
+
+
+def statements_per_path(tmp_path, employees):
+    """SQL statements each path runs with `employees` employees, each with their own
+    department and job title, so lazy loads would show up as one query per row."""
+    app = make_app(tmp_path / f"{employees}.db")
+    with app.app_context():
+        for i in range(2, employees + 1):
+            db.session.add(Department(id=i, name=f"Department {i}"))
+            db.session.add(JobTitle(id=i, title=f"Title {i}"))
+            db.session.flush()
+            add_employee(f"staff.{i}@company.com", department_id=i, job_title_id=i)
+        db.session.commit()
+
+    client = app.test_client()
+    headers = login(client)
+    with app.app_context():
+        engine = db.engine
+    counts, statements = {}, []
+    count = lambda *args: statements.append(args[2])  # noqa: E731
+    for path in PATHS:
+        assert client.get(path, headers=headers).status_code == 200  # warm caches
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            response = client.get(path, headers=headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        assert response.status_code == 200
+        counts[path] = len(statements)
+        statements.clear()
+    return counts
+
+
+@pytest.fixture(scope="module")
+def counts(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("counts")
+    return statements_per_path(tmp_path, 1), statements_per_path(tmp_path, 50)
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_statement_count_does_not_grow_with_rows(counts, path):
+    one, fifty = counts
+    assert fifty[path] == one[path], (one, fifty)
@@ -0,0 +1,74 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from conftest import add_employee, add_review
+from models import db, Department
+
+
+@pytest.fixture
+def reviews(app):
+    with app.app_context():
+        db.session.add(Department(id=2, name="Audit"))
+        first = add_employee("first.reviewed@company.com", department_id=1)
+        second = add_employee("second.reviewed@company.com", department_id=2)
+        db.session.flush()
+        add_review(first.id, 4, date(2024, 2, 1))
+        add_review(first.id, 2, date(2025, 2, 1))
+        add_review(second.id, 5, date(2025, 3, 1))
+        db.session.commit()
+
+
+def summary(rows):
+    return [(row["key"], row["name"], row["count"], row["mean"]) for row in rows]
+
+
+def test_summary_groups(client, hr, reviews):
+    response = client.get("/reviews/analytics?group_by=department", headers=hr)
+    assert summary(response.json) == [(1, "Human Resources", 2, 3.0), (2, "Audit", 1, 5.0)]
+    assert response.json[0]["distribution"] == {"1": 0, "2": 1, "3": 0, "4": 1, "5": 0}
+
+    response = client.get("/reviews/analytics?group_by=year", headers=hr)
+    assert summary(response.json) == [(2024, 2024, 1, 4.0), (2025, 2025, 2, 3.5)]
+
+    response = client.get("/reviews/analytics?group_by=overall&min_rating=3", headers=hr)
+    assert summary(response.json) == [(None, "All reviews", 2, 4.5)]
+
+
+def test_overall_is_an_ungrouped_aggregate(app, client, hr, reviews):
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        summary_response = client.get("/reviews/analytics?group_by=overall", headers=hr)
+        trend_response = client.get("/reviews/analytics/trend?group_by=overall", headers=hr)
+    finally:
+        with app.app_context():
+            event.remove(db.engine, "before_cursor_execute", record)
+
+    assert summary(summary_response.json) == [(None, "All reviews", 3, 3.67)]
+    assert trend_response.json == [{"key": None, "name": "All reviews", "years": [
+        {"year": 2024, "count": 1, "mean": 4.0, "change": None},
+        {"year": 2025, "count": 2, "mean": 3.5, "change": -0.5},
+    ]}]
+    aggregates = [s for s in statements if "review_projection" in s and "count(" in s]
+    assert len(aggregates) == 2
+    assert "GROUP BY" not in aggregates[0]
+    assert "GROUP BY" in aggregates[1] and "?" not in aggregates[1].split("GROUP BY")[1]
+
+
+def test_unrelated_parameters_share_a_cache_entry(app, client, hr, reviews):
+    entries = app.extensions["refcache"]._entries
+    client.get("/reviews/analytics?group_by=department", headers=hr)
+    count = len(entries)
+    for buster in range(3):
+        response = client.get(f"/reviews/analytics?group_by=department&_={buster}", headers=hr)
+        assert response.status_code == 200
+    assert len(entries) == count
+
+    client.get("/reviews/analytics?group_by=department&min_rating=3", headers=hr)
+    assert len(entries) == count + 1
@@ -0,0 +1,35 @@
+from conftest import add_employee, login
+from models import db
+
+
+def test_batch_reviews_reject_malformed_items_per_item(app, client):
+    with app.app_context():
+        add_employee("manager.one@company.com", user_type_id=1)
+        report = add_employee("report.one@company.com")
+        db.session.commit()
+        report_id = report.id
+    headers = login(client, "manager.one@company.com")
+
+    items = [
+        {"employee_id": report_id, "rating": 4, "notes": "Solid quarter"},
+        {"employee_id": [report_id], "rating": 4},
+        {"employee_id": {"id": report_id}, "rating": 4},
+        {"employee_id": str(report_id), "rating": 4},
+        {"employee_id": True, "rating": 4},
+        {"rating": 4},
+        {"employee_id": report_id, "rating": "4"},
+        {"employee_id": report_id, "notes": {"text": "hi"}},
+    ]
+    response = client.post("/reviews/batch", headers=headers, json=items)
+    assert response.status_code == 201, response.json
+    assert [r.get("error") for r in response.json["results"]] == [
+        None,
+        "Employee ID must be an integer",
+        "Employee ID must be an integer",
+        "Employee ID must be an integer",
+        "Employee ID must be an integer",
+        "Employee ID is required",
+        "Rating must be an integer",
+        "Notes must be a string",
+    ]
+    assert response.json["created"] == 1
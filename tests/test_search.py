@@ -0,0 +1,62 @@
+import pytest
+
+from conftest import add_employee, login
+from models import db, Department
+
+
+@pytest.fixture
+def people(app):
+    """Employees matching "ali" in their first name, last name or department."""
+    with app.app_context():
+        db.session.add(Department(id=2, name="Alicorn Labs"))
+        add_employee("alicia.smith@company.com")
+        add_employee("alice.nguyen@company.com")
+        add_employee("bob.alice@company.com")
+        add_employee("carol.jones@company.com", department_id=2)
+        add_employee("manager.two@company.com", user_type_id=1, department_id=2)
+        db.session.commit()
+
+
+def search(client, headers, q, **args):
+    response = client.get("/employees/search", headers=headers, query_string={"q": q, **args})
+    assert response.status_code == 200, response.json
+    return [(e["email"].split("@")[0], e["score"]) for e in response.json]
+
+
+def test_exact_words_and_names_rank_first(client, hr, people):
+    # names weigh 3, departments 1; an exact word adds one; ties go by id
+    assert search(client, hr, "ali") == [
+        ("alicia.smith", 6), ("alice.nguyen", 6), ("bob.alice", 6), ("carol.jones", 2), ("manager.two", 2)]
+    assert search(client, hr, "alice") == [("alice.nguyen", 7), ("bob.alice", 7)]
+    assert search(client, hr, "Alice NGU") == [("alice.nguyen", 13)]
+    assert search(client, hr, "alice.nguyen@company.com") == [("alice.nguyen", 14)]
+
+
+def test_pages_follow_the_rank(client, hr, people):
+    first = client.get("/employees/search?q=ali&limit=2", headers=hr)
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(f"/employees/search?q=ali&limit=2&cursor={cursor}", headers=hr)
+    cursor = second.headers["X-Next-Cursor"]
+    third = client.get(f"/employees/search?q=ali&limit=2&cursor={cursor}", headers=hr)
+    assert "X-Next-Cursor" not in third.headers
+    emails = [e["email"].split("@")[0] for page in (first, second, third) for e in page.json]
+    assert emails == ["alicia.smith", "alice.nguyen", "bob.alice", "carol.jones", "manager.two"]
+
+
+def test_renames_are_searchable(app, client, hr, people):
+    with app.app_context():
+        db.session.get(Department, 2).name = "Treasury"
+        db.session.commit()
+    assert search(client, hr, "alicorn") == []
+    assert search(client, hr, "treas") == [("carol.jones", 2), ("manager.two", 2)]
+
+
+def test_managers_search_their_department(client, people):
+    headers = login(client, "manager.two@company.com")
+    assert search(client, headers, "ali") == [("carol.jones", 2), ("manager.two", 2)]
+
+
+@pytest.mark.parametrize("q", ["", "@company.com", "a b c d e f"])
+def test_bad_queries_are_a_400(client, hr, q):
+    response = client.get("/employees/search", headers=hr, query_string={"q": q})
+    assert response.status_code == 400
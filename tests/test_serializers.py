@@ -0,0 +1,51 @@
+from datetime import date, datetime, time
+
+import pytest
+
+from conftest import add_employee, add_review
+from models import (db, Attendance, AttendanceDepartmentDay, AttendanceMonth, Department, Employee,
+                    PerformanceReview, ReviewProjection)
+from serializers import serializer_for
+
+MODELS = [Department, Employee, Attendance, PerformanceReview, ReviewProjection, AttendanceMonth,
+          AttendanceDepartmentDay]
+
+
+@pytest.fixture
+def rows(app):
+    with app.app_context():
+        employee = add_employee("staff.one@company.com")
+        nameless = add_employee("staff.two@company.com", department_id=None, job_title_id=None)
+        nameless.phone = None
+        db.session.flush()
+        add_review(employee.id, 4, datetime(2025, 1, 2, 9, 30, 15), notes="Good")
+        add_review(nameless.id, None, datetime(2025, 1, 3))
+        db.session.add(Attendance(employee_id=employee.id, date=date(2025, 1, 2),
+                                  check_in_time=time(8, 5), check_out_time=None))
+        db.session.add(Attendance(employee_id=nameless.id, date=date(2025, 1, 3),
+                                  check_in_time=time(8), check_out_time=time(16, 45, 30)))
+        db.session.commit()
+    return app
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.__name__)
+def test_compiled_serializer_matches_to_dict(rows, model):
+    with rows.app_context():
+        instances = model.query.all()
+        assert instances
+        serialize = serializer_for(model)
+        for instance in instances:
+            assert serialize(instance) == instance.to_dict()
+
+
+def test_field_subsets_keep_their_order_and_are_compiled_once(rows):
+    fields = ("email", "id", "department_name")
+    with rows.app_context():
+        employee = Employee.query.filter_by(email="staff.one@company.com").one()
+        assert list(serializer_for(Employee, fields)(employee)) == list(fields)
+        assert serializer_for(Employee, fields) is serializer_for(Employee, list(fields))
+
+
+def test_relationships_are_refused():
+    with pytest.raises(ValueError):
+        serializer_for(Department, ("id", "employees"))
@@ -0,0 +1,64 @@
+import json
+from datetime import date, datetime, time
+
+from conftest import add_employee, add_review
+from models import db, Attendance, Employee
+from serializers import serializer_for
+from streaming import NDJSON, stream
+
+STREAM = {"Accept": NDJSON}
+
+
+def add_staff(app, count):
+    """count employees, each with a review and a day of attendance."""
+    with app.app_context():
+        for i in range(count):
+            employee = add_employee(f"staff.{i}@company.com")
+            db.session.flush()
+            add_review(employee.id, 3, datetime(2025, 1, 1 + i))
+            db.session.add(Attendance(employee_id=employee.id, date=date(2025, 1, 1 + i),
+                                      check_in_time=time(8), check_out_time=time(17)))
+        db.session.commit()
+
+
+def lines(response):
+    body = response.get_data(as_text=True)
+    assert body.endswith("\n") or body == ""  # no rows, no lines
+    return [json.loads(line) for line in body.splitlines()]
+
+
+def test_stream_has_the_same_rows_as_the_json_list(app, client, hr):
+    add_staff(app, 5)
+    for path in ("/employees", "/reviews", "/attendance"):
+        listed = client.get(path, headers=hr)
+        streamed = client.get(path, headers={**hr, **STREAM})
+        assert streamed.mimetype == NDJSON
+        assert len(listed.json) >= 5
+        assert lines(streamed) == listed.json
+
+
+def test_cursor_and_limit_narrow_the_stream_without_paging(app, client, hr):
+    add_staff(app, 5)
+    response = client.get("/employees?limit=2", headers={**hr, **STREAM})
+    assert [row["id"] for row in lines(response)] == [1, 2]
+    assert "X-Next-Cursor" not in response.headers
+    cursor = client.get("/employees?limit=2", headers=hr).headers["X-Next-Cursor"]
+    response = client.get(f"/employees?cursor={cursor}", headers={**hr, **STREAM})
+    assert [row["id"] for row in lines(response)] == [3, 4, 5, 6]
+
+
+def test_json_is_preferred_unless_ndjson_is_asked_for(client, hr):
+    assert client.get("/employees", headers={**hr, "Accept": "*/*"}).mimetype == "application/json"
+    both = client.get("/employees", headers={**hr, "Accept": f"application/json;q=0.5, {NDJSON}"})
+    assert both.mimetype == NDJSON
+
+
+def test_each_chunk_holds_whole_lines(app):
+    add_staff(app, 4)
+    with app.test_request_context("/employees"):
+        response = stream(Employee.query, Employee.id, serializer_for(Employee), batch_size=2)
+        chunks = list(response.response)
+    assert len(chunks) == 3  # 5 rows in batches of 2
+    for chunk in chunks:
+        assert chunk.endswith("\n")
+        assert all(json.loads(line)["id"] for line in chunk.splitlines())
@@ -0,0 +1,51 @@
+"""Production WSGI entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py preloads this module in the master, so the app, every
+resource module, the compiled serializers and the URL map are loaded once
+and shared copy-on-write by every forked worker. Database connections are
+not shared: the master closes its own before forking and each worker opens
+fresh ones and warms its caches (see warm_up) before it accepts requests.
+
+`python app.py` remains the single-process development server (debugger
+and reloader on); do not expose it.
+"""
+from sqlalchemy import text
+
+from app import app
+from models import db
+from refcache import cache, warm_reference_data
+from routes import load_resources
+from resources.job_title import job_title_payload
+from resources.user_type import user_type_payload
+
+
+def warm_up():
+    """Open a connection and fill this process's hot caches.
+
+    The job title and user type lists embed every employee and take about a
+    second each to build at 5000 employees; left cold, the first burst of
+    requests all build them at once.
+    """
+    with app.app_context():
+        db.session.execute(text("SELECT 1"))
+        cache.expire()
+        warm_reference_data()
+        job_title_payload()
+        user_type_payload()
+
+
+def dispose_connections(close=True):
+    """Drop pooled connections. After a fork, close=False abandons the
+    parent's connections without touching them, so the parent's sockets and
+    SQLite handles stay valid."""
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=close)
+
+
+# Import every resource and compile the URL map now rather than on the first
+# request of every worker
+load_resources(app)
+app.url_map.update()